@@ -0,0 +1,111 @@
+# benchmarks/filter_quality.py
+"""
+平滑滤波器的滞后与抖动测量
+
+用法:
+    python -m benchmarks.filter_quality [录制目录] [--point 5] [--filters ema,one_euro,...]
+
+对录制的关键点轨迹（默认食指根部 5，即光标定位点）逐帧运行各个滤波器：
+- 参考轨迹：原始轨迹的零相位平滑（中心滑动平均），近似真实的手部运动
+- lag: 输出相对参考轨迹的时间滞后 (ms)，取使误差最小的时间平移；负值表示领先
+- jitter: 静止片段中输出逐帧变化的 RMS (归一化坐标 x1000)
+- rmse: 运动片段中输出与参考轨迹的 RMS 误差 (归一化坐标 x1000)
+不指定录制目录时使用带噪声的合成轨迹（静止 + 往复运动）。
+"""
+import argparse
+
+import numpy as np
+from config import Settings
+from utils.smoothing import FILTERS, create_smoother
+
+STILL_SPEED = 0.05  # 参考轨迹速度低于该值 (归一化坐标/秒) 视为静止
+MAX_LAG = 0.3       # 搜索的最大滞后 (秒)
+
+
+def load_trace(path, point):
+    """从录制目录取第一只手的某个关键点轨迹，返回 (timestamps, (N, 2) 坐标)"""
+    from vision.landmark_recorder import LandmarkReplay
+    replay = LandmarkReplay(path)
+    mask = np.asarray(replay.num_hands) > 0
+    if mask.sum() < 10:
+        raise SystemExit("录制数据中检测到手的帧数太少")
+    return np.asarray(replay.timestamps)[mask], np.asarray(replay.landmarks[mask, 0, point, :2], dtype=np.float64)
+
+
+def synthetic_trace(seconds=20.0, noise=0.002, seed=0):
+    """交替的静止与不同速度的往复运动，叠加观测噪声"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(0, seconds, 1.0 / Settings.FPS)
+    segment = 2.5
+    phase = (t // segment).astype(int)
+    moving = phase % 2 == 1
+    # 每段运动都从原点出发、回到原点，各段速度不同
+    freq = (1 + phase % 3) / segment
+    angle = 2 * np.pi * freq * (t - phase * segment)
+    x = 0.5 + 0.25 * np.sin(angle) * moving
+    y = 0.5 + 0.15 * (1 - np.cos(angle)) * moving
+    xy = np.stack([x, y], axis=1) + rng.normal(0, noise, (len(t), 2))
+    return t, xy
+
+
+def reference(xy, window=5):
+    """零相位的中心滑动平均"""
+    kernel = np.ones(window) / window
+    pad = window // 2
+    padded = np.pad(xy, ((pad, pad), (0, 0)), mode="edge")
+    return np.stack([np.convolve(padded[:, k], kernel, mode="valid") for k in range(xy.shape[1])], axis=1)
+
+
+def run_filter(name, t, xy):
+    smoother = create_smoother(name)
+    out = np.empty_like(xy)
+    for i in range(len(t)):
+        out[i] = smoother.get_smoothed_coords(xy[i, 0], xy[i, 1], t[i])
+    return out
+
+
+def evaluate(out, ref, t):
+    dt = float(np.median(np.diff(t)))
+    speed = np.linalg.norm(np.gradient(ref, t, axis=0), axis=1)
+    still = speed < STILL_SPEED
+    moving = ~still
+
+    # 滞后：平移 s 帧后 out[i] 对齐 ref[i - s] 的误差最小
+    max_shift = max(1, int(MAX_LAG / dt))
+    best, best_err = 0, np.inf
+    for s in range(-max_shift // 2, max_shift + 1):
+        a = out[max(s, 0):len(out) + min(s, 0)]
+        b = ref[max(-s, 0):len(ref) - max(s, 0)]
+        m = moving[max(s, 0):len(out) + min(s, 0)]
+        if not m.any():
+            break
+        err = np.mean(np.sum((a[m] - b[m]) ** 2, axis=1))
+        if err < best_err:
+            best, best_err = s, err
+    steps = np.linalg.norm(np.diff(out, axis=0), axis=1)[still[1:]]
+    return {
+        "lag_ms": best * dt * 1000.0,
+        "jitter": float(np.sqrt(np.mean(steps ** 2))) * 1000.0 if len(steps) else float("nan"),
+        "rmse": float(np.sqrt(np.mean(np.sum((out[moving] - ref[moving]) ** 2, axis=1)))) * 1000.0
+        if moving.any() else float("nan"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="平滑滤波器滞后/抖动测量")
+    parser.add_argument("path", nargs="?", help="LandmarkRecorder 录制目录，默认使用合成轨迹")
+    parser.add_argument("--point", type=int, default=5, help="关键点编号")
+    parser.add_argument("--filters", default=",".join(FILTERS), help="逗号分隔的滤波器名")
+    args = parser.parse_args(argv)
+
+    t, xy = load_trace(args.path, args.point) if args.path else synthetic_trace()
+    ref = reference(xy)
+    print(f"{'filter':<12}{'lag(ms)':>10}{'jitter':>10}{'rmse':>10}")
+    for stats_name in ["raw"] + args.filters.split(","):
+        out = xy if stats_name == "raw" else run_filter(stats_name, t, xy)
+        stats = evaluate(out, ref, t)
+        print(f"{stats_name:<12}{stats['lag_ms']:>10.1f}{stats['jitter']:>10.3f}{stats['rmse']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/harness.py
+"""基准测试运行、统计与基线对比"""
+import json
+import platform
+import time
+
+import numpy as np
+
+
+class SkipBenchmark(Exception):
+    """场景所需的依赖或数据不可用时抛出，该场景会被跳过"""
+
+
+class BenchmarkResult:
+    def __init__(self, name, latencies, elapsed, items_per_call=1, note=""):
+        self.name = name
+        self.calls = len(latencies)
+        self.items = self.calls * items_per_call
+        self.elapsed = elapsed
+        p50, p95, p99 = np.percentile(latencies, (50, 95, 99)) * 1e6 if self.calls else (0.0, 0.0, 0.0)
+        self.p50_us, self.p95_us, self.p99_us = float(p50), float(p95), float(p99)
+        self.mean_us = float(np.mean(latencies) * 1e6) if self.calls else 0.0
+        self.throughput = self.items / elapsed if elapsed > 0 else 0.0
+        self.note = note
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "throughput": self.throughput,
+            "mean_us": self.mean_us,
+            "p50_us": self.p50_us,
+            "p95_us": self.p95_us,
+            "p99_us": self.p99_us,
+        }
+
+    def format(self):
+        return (f"{self.name:<28}{self.throughput:>14.1f}/s{self.p50_us:>11.1f}{self.p95_us:>11.1f}"
+                f"{self.p99_us:>11.1f}  {self.note}")
+
+
+HEADER = f"{'benchmark':<28}{'throughput':>16}{'p50(us)':>11}{'p95(us)':>11}{'p99(us)':>11}"
+
+
+def measure(name, func, calls, warmup=10, items_per_call=1, note=""):
+    """
+    反复调用 func()，逐次记录耗时
+
+    Args:
+        func: 无参可调用对象，返回 False 时提前结束（如视频读完）
+        calls: 最多调用次数
+        items_per_call: 每次调用处理的条目数（批量接口用于计算吞吐量）
+    """
+    for _ in range(warmup):
+        if func() is False:
+            break
+    latencies = np.empty(calls, dtype=np.float64)
+    n = 0
+    start = time.perf_counter()
+    for n in range(calls):
+        t0 = time.perf_counter()
+        if func() is False:
+            break
+        latencies[n] = time.perf_counter() - t0
+    else:
+        n = calls
+    elapsed = time.perf_counter() - start
+    return BenchmarkResult(name, latencies[:n], elapsed, items_per_call, note)
+
+
+def environment():
+    """记录基线时的运行环境，便于判断结果是否可比"""
+    info = {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+    try:
+        import cv2
+        info["opencv"] = cv2.__version__
+    except ImportError:
+        pass
+    info["numpy"] = np.__version__
+    return info
+
+
+def save_baseline(path, results):
+    data = {
+        "environment": environment(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": {r.name: r.to_dict() for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance):
+    """
+    与基线对比，p50 延迟变慢或吞吐量下降超过 tolerance（比例）视为回归
+
+    Returns:
+        [(名称, 说明)] 回归列表
+    """
+    regressions = []
+    base = baseline.get("results", {})
+    for r in results:
+        b = base.get(r.name)
+        if b is None:
+            continue
+        if b["p50_us"] > 0 and r.p50_us > b["p50_us"] * (1 + tolerance):
+            regressions.append((r.name, f"p50 {b['p50_us']:.1f}us -> {r.p50_us:.1f}us "
+                                        f"(+{(r.p50_us / b['p50_us'] - 1) * 100:.0f}%)"))
+        elif b["throughput"] > 0 and r.throughput < b["throughput"] * (1 - tolerance):
+            regressions.append((r.name, f"throughput {b['throughput']:.1f}/s -> {r.throughput:.1f}/s "
+                                        f"({(r.throughput / b['throughput'] - 1) * 100:.0f}%)"))
+    return regressions
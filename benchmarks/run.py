@@ -0,0 +1,66 @@
+# benchmarks/run.py
+"""
+视觉 -> 手势 -> 动作 流水线基准测试
+
+用法:
+    python -m benchmarks.run [--only camera,recognizer] [--video 录像.mp4] [--recording 录制目录]
+                             [--save baseline.json] [--baseline baseline.json] [--tolerance 0.15]
+
+--baseline 与保存的基线对比，p50 变慢或吞吐量下降超过 tolerance 时列出回归项并以非零状态退出，
+可直接用于 CI。缺少 mediapipe / PyQt5 的场景会被跳过。
+"""
+import argparse
+import sys
+import tempfile
+
+from .harness import HEADER, SkipBenchmark, compare, load_baseline, save_baseline
+from .scenarios import SCENARIOS, BenchmarkContext
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="流水线基准测试")
+    parser.add_argument("--only", help=f"逗号分隔的场景名，可选: {', '.join(SCENARIOS)}")
+    parser.add_argument("--video", help="录制的视频文件，默认生成合成视频")
+    parser.add_argument("--recording", help="LandmarkRecorder 录制目录，默认使用合成关键点")
+    parser.add_argument("--frames", type=int, default=300, help="每个场景的基本调用次数")
+    parser.add_argument("--save", help="把结果保存为基线 JSON")
+    parser.add_argument("--baseline", help="与基线 JSON 对比")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="允许的性能退化比例")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景: {', '.join(unknown)}")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        ctx = BenchmarkContext(workdir, args.video, args.recording, args.frames)
+        print(HEADER)
+        for name in names:
+            try:
+                scenario_results = SCENARIOS[name](ctx)
+            except SkipBenchmark as e:
+                print(f"{name:<28}skipped: {e}")
+                continue
+            for r in scenario_results:
+                print(r.format())
+            results.extend(scenario_results)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"基线已保存: {args.save}")
+
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+        if regressions:
+            print(f"性能回归 (容差 {args.tolerance:.0%}):")
+            for name, detail in regressions:
+                print(f"  {name:<28}{detail}")
+            return 1
+        print(f"与基线相比无回归 (容差 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
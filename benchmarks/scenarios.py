@@ -0,0 +1,373 @@
+# benchmarks/scenarios.py
+"""
+基准测试场景
+
+每个场景是一个接收 BenchmarkContext、返回 BenchmarkResult 列表的函数，
+依赖缺失（mediapipe / PyQt5）或数据不可用时抛出 SkipBenchmark。
+"""
+import os
+
+import numpy as np
+from config import Settings
+from .harness import BenchmarkResult, SkipBenchmark, measure
+
+
+class BenchmarkContext:
+    def __init__(self, workdir, video=None, recording=None, frames=300, seed=0):
+        self.workdir = workdir
+        self.video = video          # 录制的视频文件，None 时使用合成视频
+        self.recording = recording  # LandmarkRecorder 录制目录，None 时使用合成关键点
+        self.frames = frames        # 每个场景的调用次数
+        self.rng = np.random.default_rng(seed)
+        self._synthetic_video = None
+
+    def video_source(self):
+        """返回 (视频路径, 说明)，未指定视频时生成合成视频"""
+        if self.video:
+            return self.video, "recorded"
+        if self._synthetic_video is None:
+            import cv2
+            path = os.path.join(self.workdir, "synthetic.avi")
+            w, h = Settings.CAP_WIDTH, Settings.CAP_HEIGHT
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), Settings.FPS, (w, h))
+            if not writer.isOpened():
+                raise SkipBenchmark("无法写入合成视频")
+            for i in range(min(self.frames, 120)):
+                img = self.rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+                writer.write(img)
+            writer.release()
+            self._synthetic_video = path
+        return self._synthetic_video, "synthetic"
+
+    def landmarks(self):
+        """返回 ((N, 21, 3) 关键点数组, 说明)"""
+        if self.recording:
+            from vision.landmark_recorder import LandmarkReplay
+            replay = LandmarkReplay(self.recording)
+            mask = replay.num_hands > 0
+            if not mask.any():
+                raise SkipBenchmark("录制数据中没有手部")
+            return np.ascontiguousarray(replay.landmarks[mask, 0]), "recorded"
+        return self.rng.random((self.frames, 21, 3), dtype=np.float32), "synthetic"
+
+
+def _open_camera(ctx):
+    from vision.camera import Camera
+    path, note = ctx.video_source()
+    return Camera(path, threaded=False), note
+
+
+def bench_camera(ctx):
+    """视频源 -> Camera.read（解码 + 镜像）"""
+    camera, note = _open_camera(ctx)
+    try:
+        result = measure("camera.read", lambda: camera.read()[0], ctx.frames, note=note)
+    finally:
+        camera.release()
+    return [result]
+
+
+def bench_camera_detector(ctx):
+    """视频源 -> Camera + HandDetector.find_hands"""
+    from vision.hand_detector import HandDetector
+    try:
+        detector = HandDetector()  # mediapipe 在构造时导入
+    except ImportError as e:
+        raise SkipBenchmark(f"mediapipe 不可用: {e}")
+    camera, note = _open_camera(ctx)
+
+    def step():
+        success, frame = camera.read()
+        if not success:
+            return False
+        detector.find_hands(frame)
+        detector.get_landmarks()
+
+    try:
+        result = measure("camera+hand_detector", step, ctx.frames, warmup=5, note=note)
+    finally:
+        camera.release()
+        detector.close()
+    return [result]
+
+
+def bench_recognizer(ctx):
+    """关键点流 -> GestureRecognizer（逐帧与批量）"""
+    from gesture.gesture_recognizer import GestureRecognizer
+    from vision.landmark_utils import Landmark
+    landmarks, note = ctx.landmarks()
+    recognizer = GestureRecognizer()
+    n = len(landmarks)
+
+    # MediaPipe 输出的是逐点对象列表，这里用同样接口的对象模拟实时路径
+    objects = [[Landmark(*p) for p in frame.tolist()] for frame in landmarks[:min(n, 2000)]]
+    i = [0]
+
+    def step_objects():
+        lm = objects[i[0] % len(objects)]
+        i[0] += 1
+        recognizer.update_fingers_status(lm, Settings.CAP_HEIGHT)
+        recognizer.recognize(lm)
+
+    def step_array():
+        lm = landmarks[i[0] % n]
+        i[0] += 1
+        recognizer.update_fingers_status(lm, Settings.CAP_HEIGHT)
+        recognizer.recognize(lm)
+
+    # 学习引擎：用规则引擎的输出作为标签训练一个模型，只测推理耗时
+    from gesture.gesture_classifier import LearnedGestureRecognizer, train_model
+    from gesture.landmark_features import landmark_features
+    labels, _ = GestureRecognizer.classify_batch(landmarks)
+    learned = LearnedGestureRecognizer(train_model("softmax", landmark_features(landmarks), labels, epochs=50))
+
+    def step_learned():
+        lm = landmarks[i[0] % n]
+        i[0] += 1
+        learned.recognize(lm)
+
+    batch = np.ascontiguousarray(np.resize(landmarks, (max(n, 100000), 21, 3)))
+    results = [
+        measure("recognizer.landmark_objects", step_objects, ctx.frames * 10, note=note),
+        measure("recognizer.array", step_array, ctx.frames * 10, note=note),
+        measure("recognizer.learned", step_learned, ctx.frames * 10, note=note),
+        measure("recognizer.classify_batch", lambda: GestureRecognizer.classify_batch(batch), 10,
+                warmup=1, items_per_call=len(batch), note=f"{note}, batch={len(batch)}"),
+        measure("recognizer.learned_batch", lambda: learned.classify_batch(batch), 10,
+                warmup=1, items_per_call=len(batch), note=f"{note}, batch={len(batch)}"),
+    ]
+    return results
+
+
+def _gesture_stream(ctx, length):
+    """生成带连续位置变化的手势序列，覆盖移动/拖拽/点击/滚动/音量"""
+    from gesture.gesture_base import GestureType
+    from vision.landmark_utils import Landmark
+    pattern = ([GestureType.POINTING] * 30 + [GestureType.DRAGGING] * 20 + [GestureType.LEFT_CLICK] * 3
+               + [GestureType.NONE] * 5 + [GestureType.SCROLL_MODE] * 20 + [GestureType.RIGHT_CLICK] * 3
+               + [GestureType.VOLUME_MODE] * 15 + [GestureType.NONE] * 4)
+    walk = np.cumsum(ctx.rng.normal(0, 0.01, (length, 2)), axis=0) + 0.5
+    stream = []
+    for k in range(length):
+        gesture = pattern[k % len(pattern)]
+        x, y = np.clip(walk[k], 0.0, 1.0)
+        info = Landmark(x, y) if gesture not in (GestureType.LEFT_CLICK, GestureType.RIGHT_CLICK,
+                                                 GestureType.NONE) else None
+        stream.append((gesture, info))
+    return stream
+
+
+def bench_action_mapper(ctx):
+    """手势流 -> ActionMapper.execute（空执行后端，同步执行以测量映射本身的开销）"""
+    from control.actuator import Actuator, RecordingBackend
+    from pipeline.action_mapper import ActionMapper
+    stream = _gesture_stream(ctx, ctx.frames * 10)
+    backend = RecordingBackend(keep_events=False)
+    mapper = ActionMapper(Actuator(backend, threaded=False))
+    i = [0]
+
+    def step():
+        gesture, info = stream[i[0] % len(stream)]
+        i[0] += 1
+        mapper.execute(gesture, info)
+
+    result = measure("action_mapper.execute", step, len(stream), note=f"null backend")
+    mapper.close()
+    result.note += f", {backend.count} input events"
+    return [result]
+
+
+def bench_actuator(ctx):
+    """ActionMapper.execute 经执行线程入队（实时路径上视觉循环真正承担的开销）"""
+    from control.actuator import Actuator, RecordingBackend
+    from pipeline.action_mapper import ActionMapper
+    stream = _gesture_stream(ctx, ctx.frames * 10)
+    mapper = ActionMapper(Actuator(RecordingBackend(keep_events=False), threaded=True))
+    i = [0]
+
+    def step():
+        gesture, info = stream[i[0] % len(stream)]
+        i[0] += 1
+        mapper.execute(gesture, info)
+
+    result = measure("action_mapper.execute_async", step, len(stream), note="threaded null backend")
+    mapper.close()
+    stats = mapper.actuator.get_stats()
+    result.note += f", coalesced={stats['coalesced']}"
+    return [result]
+
+
+def bench_volume(ctx):
+    """音量模式：ActionMapper -> VolumeController -> 本地模拟混音器，按调节方式比较每帧开销与每秒的混音器操作数"""
+    from control.actuator import Actuator, RecordingBackend
+    from control.mixer import FakeMixer
+    from control.volume_controller import ABSOLUTE, RATE, VolumeController
+    from gesture.gesture_base import GestureType
+    from pipeline.action_mapper import ActionMapper
+    from vision.landmark_utils import Landmark
+    fps = Settings.FPS
+    calls = ctx.frames * 10
+    # 手在原点上下缓慢摆动，约一半时间超过触发阈值
+    ys = 0.5 + 0.15 * np.sin(np.arange(calls + 20) * (2 * np.pi / (4 * fps)))
+    results = []
+    for mode in (RATE, ABSOLUTE):
+        mixer = FakeMixer(history=0)
+        mapper = ActionMapper(Actuator(RecordingBackend(keep_events=False), threaded=False))
+        mapper.volume = VolumeController(mapper.actuator, mixer, mode=mode)
+        i = [0]
+
+        def step():
+            k = i[0]
+            i[0] += 1
+            mapper.execute(GestureType.VOLUME_MODE, Landmark(0.5, float(ys[k % len(ys)])), k / fps)
+
+        result = measure(f"volume.{mode}", step, calls, note="fake mixer")
+        seconds = i[0] / fps
+        result.note += f", {mixer.calls / seconds:.1f} mixer calls/s, {mixer.presses / seconds:.1f} steps/s"
+        mapper.close()
+        results.append(result)
+    return results
+
+
+def bench_hand_manager(ctx):
+    """多手：识别 + 动作映射，按手数比较开销（所有手一次性向量化识别）"""
+    from control.actuator import Actuator, RecordingBackend
+    from pipeline.hand_manager import HandManager
+    landmarks, note = ctx.landmarks()
+    results = []
+    for count in (1, 2):
+        manager = HandManager(Actuator(RecordingBackend(keep_events=False), threaded=False))
+        handedness = np.arange(count, dtype=np.int8)
+        # 各手位置错开，保证跟踪关联稳定
+        offsets = np.zeros((count, 1, 3), dtype=np.float32)
+        offsets[:, 0, 0] = np.arange(count) * 2.0
+        i = [0]
+
+        def step():
+            k = i[0] % (len(landmarks) - count + 1)
+            i[0] += 1
+            manager.process(landmarks[k:k + count] * 0.1 + offsets, handedness)
+
+        results.append(measure(f"hand_manager.{count}_hands", step, ctx.frames * 10, note=note))
+        manager.close()
+    return results
+
+
+def bench_frontend(ctx):
+    """main.py 窗口模式每帧的显示开销（关键点绘制 + 文字叠加 + imshow/waitKey），无窗口模式全部跳过"""
+    import cv2
+    from pipeline.stages import draw_overlay
+    from vision.landmark_utils import draw_landmark_array
+    landmarks, note = ctx.landmarks()
+    img = np.zeros((Settings.CAP_HEIGHT, Settings.CAP_WIDTH, 3), dtype=np.uint8)
+    state = type("State", (), {"caption": "Gesture: POINTING"})()
+    counter = [0]
+
+    def step_overlay():
+        i = counter[0] = (counter[0] + 1) % len(landmarks)
+        draw_landmark_array(img, landmarks[i])
+        draw_overlay(img, [state], 30)
+
+    results = [measure("frontend.overlay", step_overlay, ctx.frames, note=note)]
+    if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY") or os.name == "nt":
+        def step_window():
+            step_overlay()
+            cv2.imshow("benchmark", img)
+            cv2.waitKey(1)
+
+        try:
+            results.append(measure("frontend.window", step_window, ctx.frames, note=note))
+        finally:
+            cv2.destroyAllWindows()
+    return results
+
+
+def bench_pipeline(ctx):
+    """关键点流 -> 流水线引擎 -> HandManager，比较各执行位置的每帧端到端延迟（含队列交接与线程切换）"""
+    import time
+    from control.actuator import Actuator, RecordingBackend
+    from pipeline.engine import BLOCK, Pipeline, Stage
+    from pipeline.hand_manager import HandManager
+    from pipeline.stages import RecognizeStage, apply_placement
+    landmarks, note = ctx.landmarks()
+    handedness = np.zeros(1, dtype=np.int8)
+
+    class Source(Stage):
+        name = "source"
+
+        def process(self, fc):
+            k = (fc.seq - 1) % len(landmarks)
+            fc.landmarks, fc.handedness = landmarks[k:k + 1], handedness
+            fc.timestamp = fc.origin
+            return fc
+
+    class Sink(Stage):
+        name = "sink"
+
+        def __init__(self, latencies):
+            super().__init__()
+            self.latencies = latencies
+
+        def process(self, fc):
+            self.latencies.append(time.perf_counter() - fc.origin)
+            return fc
+
+    results = []
+    for placement in ("inline", "thread", "asyncio"):
+        manager = HandManager(Actuator(RecordingBackend(keep_events=False), threaded=False))
+        latencies = []
+        stages = [Source(), RecognizeStage(manager), Sink(latencies)]
+        apply_placement(stages, {"recognize": placement}, queue_size=2, policy=BLOCK)
+        start = time.perf_counter()
+        Pipeline(stages, name=f"bench.{placement}").run(ctx.frames * 10)
+        elapsed = time.perf_counter() - start
+        manager.close()
+        results.append(BenchmarkResult(f"pipeline.{placement}", np.asarray(latencies), elapsed, note=note))
+    return results
+
+
+def _qt_app():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError as e:
+        raise SkipBenchmark(f"PyQt5 不可用: {e}")
+    return QApplication.instance() or QApplication(["benchmarks"])
+
+
+def bench_qt_conversion(ctx):
+    """画面 -> QPixmap：原 cv2pixmap 路径与双缓冲预览路径"""
+    app = _qt_app()
+    from gui.qt_utils import CV2QtConverter, PreviewBuffer
+    h, w = Settings.CAP_HEIGHT, Settings.CAP_WIDTH
+    img = ctx.rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+    size = Settings.VIDEO_DISPLAY_SIZE
+
+    preview = PreviewBuffer(size, max_fps=1e9)
+    t = [0.0]
+
+    def step_preview():
+        t[0] += 1.0
+        preview.publish(img, now=t[0])
+        preview.to_pixmap()
+
+    results = [
+        measure("qt.cv2pixmap", lambda: CV2QtConverter.cv2pixmap(img, size), ctx.frames),
+        measure("qt.preview_buffer", step_preview, ctx.frames),
+    ]
+    del app
+    return results
+
+
+SCENARIOS = {
+    "camera": bench_camera,
+    "camera_detector": bench_camera_detector,
+    "recognizer": bench_recognizer,
+    "action_mapper": bench_action_mapper,
+    "actuator": bench_actuator,
+    "volume": bench_volume,
+    "hand_manager": bench_hand_manager,
+    "frontend": bench_frontend,
+    "pipeline": bench_pipeline,
+    "qt": bench_qt_conversion,
+}
@@ -1,7 +1,5 @@
 # configs.py
 
-import cv2
-
 class Settings:
     # 摄像头设置
     CAMERA_ID = 0
@@ -9,11 +7,100 @@ class Settings:
     CAP_HEIGHT = 480
     FPS = 30
 
+    # 采集线程配置
+    THREADED_CAPTURE = True      # 后台线程抓帧，只处理最新一帧
+    CAPTURE_BUFFER_SIZE = 2      # 环形缓冲区大小
+    STALE_FRAME_AGE = 0.1        # 帧交给处理时超过该时长(秒)视为过期帧
+
     # 手部检测配置
+    # 多手控制需要手动开启：设为 2 后才会同时跟踪两只手（CURSOR_HAND 控制光标，另一只手负责滚动/音量），
+    # 录制器的 max_hands 也随之变化。默认保持 1：只有一只手在画面中时 MediaPipe 会每帧重新运行手掌检测寻找第二只手，推理开销明显增加
     MAX_NUM_HANDS = 1
+    MODEL_COMPLEXITY = 1         # 手部关键点模型复杂度：0 轻量 / 1 完整
     MIN_DETECTION_CONFIDENCE = 0.7
     MIN_TRACKING_CONFIDENCE = 0.5
 
+    # 多手跟踪：按左右手与位置关联各帧检测结果，为每只手分配稳定的编号
+    HAND_TRACK_MAX_DISTANCE = 0.25   # 关联的最大手掌中心位移 (归一化坐标)
+    HAND_TRACK_LABEL_PENALTY = 0.1   # 左右手标签不一致时追加的关联代价
+    HAND_TRACK_MAX_MISSES = 5        # 连续未检测到超过该帧数后删除该手
+    CURSOR_HAND = "Right"            # 两只手同时出现时控制光标的手，另一只手负责滚动/音量模式
+
+    # ROI 跟踪：用上一帧手部包围盒裁剪画面，只在裁剪区域上推理（高分辨率时收益明显）
+    ROI_TRACKING = False
+    ROI_INPUT_SIZE = 256         # ROI 缩放后的推理尺寸 (像素)
+    ROI_EXPAND = 1.6             # 包围盒扩展倍数，留出手部移动余量
+    ROI_MIN_SIZE = 96            # ROI 最小边长 (像素)
+
+    # 自适应检测频率：手部静止时每 N 帧推理一次，中间帧用运动模型外推
+    ADAPTIVE_CADENCE = False
+    CADENCE_MAX_INTERVAL = 3     # 最大推理间隔 N
+    CADENCE_STILL_SPEED = 0.05   # 低于该速度(归一化坐标/秒)视为静止，使用最大间隔
+    CADENCE_FAST_SPEED = 0.5     # 高于该速度视为快速运动，逐帧推理
+
+    # 多进程检测：MediaPipe 推理在子进程中执行，画面经共享内存传递
+    DETECTOR_PROCESS = False
+    DETECTOR_PROCESS_SLOTS = 3           # 共享内存画面槽位数
+    DETECTOR_PROCESS_SYNC = False        # True: 等待当前帧结果; False: 流水线模式，使用最近完成的结果
+    DETECTOR_PROCESS_MAX_RESTARTS = 3    # 子进程异常退出后的最大重启次数
+
+    # 处理流水线 (pipeline.engine)：阶段的执行位置，如 "detect=thread,display=thread"，未列出的阶段为 inline
+    # 可选 inline（与上一阶段同一线程）/ thread（独立线程）/ asyncio（事件循环任务）
+    PIPELINE_PLACEMENT = ""
+    PIPELINE_QUEUE_SIZE = 2              # 非 inline 阶段的输入队列长度
+    PIPELINE_DROP_POLICY = "drop_oldest" # 队列满时："drop_oldest" 丢弃最旧帧 / "drop_newest" 丢弃新帧 / "block" 反压
+
+    # 自适应画质：按实测每帧处理耗时逐级调整采集分辨率、模型复杂度、检测/跟踪置信度与预览帧率，保持目标帧率
+    ADAPTIVE_QUALITY = False
+    QUALITY_TARGET_FPS = 30
+    # 画质档位，从高到低；分辨率都保持 4:3，关键点归一化坐标的宽高比不随档位变化
+    QUALITY_LEVELS = (
+        {"resolution": (960, 720), "model_complexity": 1, "min_detection_confidence": 0.7,
+         "min_tracking_confidence": 0.5, "preview_fps": 15},
+        {"resolution": (640, 480), "model_complexity": 1, "min_detection_confidence": 0.7,
+         "min_tracking_confidence": 0.5, "preview_fps": 15},
+        {"resolution": (640, 480), "model_complexity": 0, "min_detection_confidence": 0.6,
+         "min_tracking_confidence": 0.5, "preview_fps": 10},
+        {"resolution": (480, 360), "model_complexity": 0, "min_detection_confidence": 0.6,
+         "min_tracking_confidence": 0.4, "preview_fps": 10},
+        {"resolution": (320, 240), "model_complexity": 0, "min_detection_confidence": 0.5,
+         "min_tracking_confidence": 0.4, "preview_fps": 5},
+    )
+    QUALITY_START_LEVEL = 1      # 启动档位，应与上面的 CAP_WIDTH/CAP_HEIGHT、MODEL_COMPLEXITY 等默认值一致
+    QUALITY_WINDOW = 2.0         # 评估窗口 (秒)，每个窗口取一次处理耗时中位数
+    QUALITY_DOWN_RATIO = 0.95    # 中位耗时超过帧预算的该比例时降一档
+    QUALITY_UP_RATIO = 0.5       # 中位耗时低于帧预算的该比例时才考虑升档（升档后耗时通常成倍增加）
+    QUALITY_UP_WINDOWS = 3       # 连续多少个窗口满足升档条件才升档
+    QUALITY_BACKOFF = 10.0       # 升档后又被降回时，该档位的冷却时间 (秒)，连续失败时翻倍
+    QUALITY_MAX_BACKOFF = 160.0  # 冷却时间上限 (秒)
+
+    # 启动：构造 MediaPipe 图后用空白帧预热一次推理（后台线程中进行，与摄像头/界面初始化并行）
+    DETECTOR_WARM_UP = True
+
+    # 关键点录制目录（None 表示不录制），可用 tools/replay_session.py 高速回放
+    LANDMARK_RECORD_PATH = None
+
+    # 日志 (utils.logger)：记录由后台线程写出，处理循环不等待 stdout
+    LOG_LEVEL = "INFO"           # DEBUG / INFO / WARNING / ERROR
+    LOG_FORMAT = "text"          # "text" 或 "json"（每条记录一行 JSON，含时间、级别、线程与结构化字段）
+    LOG_FILE = None              # 同时写入的日志文件，None 表示只输出到 stdout
+    LOG_QUEUE_SIZE = 10000       # 待写出记录的上限，超过时丢弃新记录
+    LOG_RATE_LIMIT = 5.0         # 热路径中重复错误日志的最短间隔 (秒)
+
+    # 逐帧遥测 (utils.telemetry)：每帧一行 CSV，None 表示不记录
+    TELEMETRY_PATH = None
+    TELEMETRY_MAX_BYTES = 16 * 1024 * 1024  # 单个文件上限，超过时轮转
+    TELEMETRY_BACKUPS = 5                   # 保留的旧文件数
+    TELEMETRY_FLUSH_INTERVAL = 1.0          # 后台线程批量写出的间隔 (秒)
+    TELEMETRY_BUFFER_SIZE = 4096            # 待写出行数的上限，超过时丢弃
+
+    # 本地指标接口 (utils.metrics)：127.0.0.1 上的 Prometheus 文本格式 /metrics，None 表示不启动
+    METRICS_PORT = None
+
+    # 分阶段延迟统计
+    ENABLE_PROFILER = True
+    PROFILER_WINDOW = 1024       # 每个阶段保留的滚动样本数
+
     # 屏幕映射范围 (避免手必须伸到摄像头边缘才能碰到屏幕边缘)
     FRAME_MARGIN = 100  # 像素
 
@@ -22,17 +109,72 @@ class Settings:
     R_CLICK_THRESHOLD = 0.04     # 中指与大拇指距离阈值
     SCROLL_THRESHOLD = 0.05      # 滚轮触发阈值
     
+    # 手势识别引擎："rules" 手指伸直状态规则表 / "learned" 关键点几何特征 + 训练的 NumPy 模型（对手部旋转更稳健）
+    GESTURE_ENGINE = "rules"
+    GESTURE_MODEL_PATH = "models/gesture_model.npz"  # tools/train_gesture_model.py 训练输出
+    GESTURE_MIN_CONFIDENCE = 0.6     # 学习模型的最大类别概率低于该值时输出 NONE
+
+    # 手势稳定过滤：识别结果在识别器与动作映射之间经过时间状态机，抑制手势抖动
+    GESTURE_FILTER = True
+    FINGER_HYSTERESIS = 0.01         # 手指伸直/弯曲判定的迟滞余量 (归一化坐标)
+    GESTURE_ENTER_FRAMES = 2         # 新手势需连续出现的帧数才会生效
+    GESTURE_EXIT_FRAMES = 2          # 当前手势需连续消失的帧数才会退出
+    GESTURE_ENTER_FRAMES_OVERRIDE = {"LEFT_CLICK": 3, "RIGHT_CLICK": 3}  # 按手势覆盖进入帧数
+    GESTURE_MIN_DWELL = {"LEFT_CLICK": 0.1, "RIGHT_CLICK": 0.1, "DRAGGING": 0.15}  # 手势最短保持时间 (秒)
+
+    # 轨迹手势：手处于 TRAJECTORY_POSES 中的姿态（默认为无控制手势，如握拳/放松的手）时，
+    # 根据每只手的关键点历史识别快速挥动 (SWIPE_*) 与推拉缩放 (ZOOM_IN/ZOOM_OUT)；需开启 ENABLE_SWIPE / ENABLE_ZOOM
+    TRAJECTORY_HISTORY = 32          # 每只手保留的关键点历史帧数（固定内存）
+    TRAJECTORY_POSES = ("NONE",)     # 允许轨迹手势的姿态 (GestureType 名称)
+    TRAJECTORY_COOLDOWN = 0.6        # 触发后的冷却时间 (秒)，避免手收回时触发反向手势
+    SWIPE_WINDOW = 0.3               # 挥动检测窗口 (秒)
+    SWIPE_MIN_DISTANCE = 0.2         # 窗口内手掌中心的最小位移 (以画面高度为单位)
+    SWIPE_MIN_STRAIGHTNESS = 0.8     # 位移 / 路径长度的下限，排除来回晃动
+    SWIPE_KEYS = {                   # 挥动方向 -> 快捷键
+        "SWIPE_LEFT": ("alt", "left"),
+        "SWIPE_RIGHT": ("alt", "right"),
+        "SWIPE_UP": ("pageup",),
+        "SWIPE_DOWN": ("pagedown",),
+    }
+    ZOOM_WINDOW = 0.4                # 缩放检测窗口 (秒)
+    ZOOM_MIN_RATIO = 1.3             # 窗口内手掌大小的最小变化倍数
+    ZOOM_MAX_DRIFT = 0.5             # 缩放时手掌中心的最大位移 (手掌大小的倍数)，超过视为挥动而非推拉
+
+    # 输入注入执行器
+    ACTUATOR_BACKEND = "auto"        # "auto" 按平台选择 / "win32" / "pyautogui" 真实输入 / "recording" 仅记录(测试用)
+    ACTUATOR_THREADED = True         # 在独立线程中执行输入操作
+    ACTUATOR_QUEUE_SIZE = 64         # 命令队列上限（所有命令）
+
     # 鼠标灵敏度
     MOUSE_SENSITIVITY = 800
 
     # 平滑系数 (0.0 - 1.0, 越小越平滑但延迟越高)
     SMOOTHING_FACTOR = 0.2
+
+    # 滤波器："ema" 指数平滑 / "one_euro" One-Euro 自适应 / "double_exp" 双指数平滑 / "kalman" 卡尔曼滤波
+    # 可用 python -m benchmarks.filter_quality 对比各滤波器的滞后与抖动
+    # 默认与旧版本一致：光标用 SMOOTHING_FACTOR 的指数平滑，摇杆不滤波。
+    # 改为 "one_euro" 后 GUI 的平滑滑块调节的是静止时的截止频率 ONE_EURO_MIN_CUTOFF（按 FPS 换算，见 utils/smoothing.py）
+    POINTER_FILTER = "ema"            # 光标
+    JOYSTICK_FILTER = None            # 滚动/音量摇杆偏移，None 表示不滤波
+    ONE_EURO_MIN_CUTOFF = 1.0         # 静止时的截止频率 (Hz)，越小越平滑
+    ONE_EURO_BETA = 20.0              # 截止频率随速度 (归一化坐标/秒) 增长的系数，越大越跟手
+    ONE_EURO_D_CUTOFF = 1.0           # 速度估计的截止频率 (Hz)
+    DOUBLE_EXP_TREND = 0.05           # 双指数平滑的趋势系数
+    KALMAN_MODEL = "ca"               # "cv" 匀速 / "ca" 匀加速
+    KALMAN_PROCESS_NOISE = 1.0        # 过程噪声谱密度，越大越跟手
+    KALMAN_MEASUREMENT_NOISE = 4e-6   # 观测噪声方差 (归一化坐标²)，越大越平滑
+    KALMAN_PREDICT_LATENCY = True     # 按实测的采集->执行延迟向前预测光标位置
+    KALMAN_MAX_PREDICT = 0.1          # 最大预测时长 (秒)
+    LANDMARK_KALMAN = False           # 识别前对每只手的 21 个关键点做批量卡尔曼滤波
     
     # 功能开关
     ENABLE_MOUSE = True
     ENABLE_VOLUME = True
     ENABLE_SCROLL = True
-    ENABLE_ZOOM = True
+    # 轨迹手势（缩放/挥动）默认关闭：它们在放松的手 (NONE) 上触发，快速移动或手移出画面都可能向当前窗口发送快捷键
+    ENABLE_ZOOM = False
+    ENABLE_SWIPE = False
 
     
     # 鼠标加速算法阈值
@@ -47,10 +189,24 @@ class Settings:
     
     # 滚动速度系数
     SCROLL_SPEED = 10
+    # 速度式滚动 (control.scroll_engine)：滚动速度(格/秒) = (偏移 - 死区) x SCROLL_SPEED x SCROLL_VELOCITY_SCALE
+    SCROLL_VELOCITY_SCALE = 10.0
+    SCROLL_TICK_HZ = 120        # 滚轮事件输出频率，与摄像头帧率无关
+    SCROLL_MAX_STEP = 0.1       # 单次积分的最长时长 (秒)，线程被挂起或丢帧后不会一次滚动过多
     
     # 音量触发阈值（距离原点的偏移量）
     VOLUME_TRIGGER_THRESHOLD = 0.05
     
+    # 音量调节方式 (control.volume_controller)："rate" 偏移决定步进速率 / "absolute" 手的纵向位置决定绝对音量
+    VOLUME_CONTROL = "rate"
+    VOLUME_MIXER = "keys"           # "keys" 音量键 / "fake" 本地模拟（测试用，不发送按键）
+    VOLUME_KEY_STEP = 0.02          # 每次音量键调节的音量 (Windows 为 2%)
+    VOLUME_RATE_GAIN = 80.0         # 步进速率 (步/秒) = (偏移 - 阈值) x VOLUME_RATE_GAIN
+    VOLUME_MAX_RATE = 12.0          # 步进速率上限 (步/秒)
+    VOLUME_MAX_STEP = 0.1           # 单帧积分的最长时长 (秒)，丢帧后不会一次调节过多
+    VOLUME_ABSOLUTE_RANGE = (0.2, 0.8)  # 绝对模式：画面纵向 (归一化坐标) 的这一段从上到下对应音量 100% -> 0%
+    VOLUME_RESYNC_IDLE = 600.0      # 音量键闲置超过该时长 (秒) 后，下次进入音量模式时重新校准；None 表示只校准一次
+
     # 静音触发阈值（向左移动的大距离）
     MUTE_TRIGGER_THRESHOLD = 0.15
 
@@ -59,6 +215,7 @@ class Settings:
     GUI_WIDTH = 950  # GUI窗口宽度
     GUI_HEIGHT = 650 # GUI窗口高度
     VIDEO_DISPLAY_SIZE = (640, 480) # 摄像头画面显示尺寸
+    PREVIEW_FPS = 15                # 预览画面帧率上限（与处理帧率无关）
     # 可调节参数范围（供GUI滑块使用）
     PARAM_RANGES = {
         "mouse_sensitivity": (200, 1500, 10),    # 800默认值，范围200-1500
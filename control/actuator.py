@@ -0,0 +1,393 @@
+# control/actuator.py
+"""
+输入注入执行线程
+
+所有鼠标/键盘操作都以命令的形式放入有界队列，由独立线程调用后端执行，
+视觉循环只负责入队，不会因为系统输入注入（以及 pyautogui 的默认 0.1s 停顿）而阻塞。
+"""
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from config import Settings
+from utils.latency_profiler import LatencyProfiler
+from utils.logger import WARNING, log, log_limited
+
+# 命令类型
+MOVE = "move"          # 相对移动 (dx, dy)，连续的相对移动会被合并
+MOVE_TO = "move_to"    # 绝对移动 (x, y)
+DOWN = "down"          # 按下鼠标键 (button,)
+UP = "up"              # 松开鼠标键 (button,)
+CLICK = "click"        # 点击 (button,)
+PRESS = "press"        # 按键 (key,)
+HOTKEY = "hotkey"      # 组合键 (key1, key2, ...)
+WHEEL = "wheel"        # 滚轮 (dx, dy)，单位为格，连续的滚轮命令会被合并
+VOLUME = "volume"      # 音量键 (steps,)，正数为音量加，连续的音量命令合并为一次多次按键
+VOLUME_FLOOR = "volume_floor"  # 连按音量减 (steps,) 把音量按到 0（校准），不与音量命令合并
+
+# 在队尾与同类命令合并（参数逐项相加）的命令
+COALESCABLE = (MOVE, WHEEL, VOLUME)
+# 队列满时可丢弃的命令；其余命令（按下/松开/按键/音量）保持顺序
+DROPPABLE = (MOVE, WHEEL)
+# 改变按键状态的命令：永远不丢弃，队列满且没有可丢弃的命令时超出上限入队
+STATEFUL = (DOWN, UP)
+
+
+class PyAutoGuiBackend:
+    """基于 pyautogui 的真实输入后端"""
+    wheel_resolution = 1  # 每格滚轮的最小单位数：pyautogui 只能整格滚动
+
+    def __init__(self):
+        import pyautogui
+        # 禁用PyAutoGUI防故障与每次调用后的默认停顿
+        pyautogui.FAILSAFE = False
+        pyautogui.PAUSE = 0
+        self.pyautogui = pyautogui
+
+    def size(self):
+        return self.pyautogui.size()
+
+    def move(self, dx, dy):
+        self.pyautogui.moveRel(int(dx), int(dy), _pause=False)
+
+    def move_to(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def down(self, button):
+        self.pyautogui.mouseDown(button=button, _pause=False)
+
+    def up(self, button):
+        self.pyautogui.mouseUp(button=button, _pause=False)
+
+    def click(self, button):
+        self.pyautogui.click(button=button, _pause=False)
+
+    def press(self, key):
+        self.pyautogui.press(key, _pause=False)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys, _pause=False)
+
+    def wheel(self, dx, dy):
+        if dy:
+            self.pyautogui.scroll(int(dy), _pause=False)
+        if dx:
+            self.pyautogui.hscroll(int(dx), _pause=False)
+
+    def volume(self, steps):
+        if steps:
+            key = "volumeup" if steps > 0 else "volumedown"
+            self.pyautogui.press(key, presses=abs(int(steps)), _pause=False)
+
+    def volume_floor(self, steps):
+        self.volume(-abs(int(steps)))
+
+
+class Win32Backend(PyAutoGuiBackend):
+    """Windows 后端：滚轮通过 SendInput 发送（与物理滚轮/触控板的增量一致），其余操作同 pyautogui"""
+    def __init__(self):
+        super().__init__()
+        from control.win_input import WHEEL_DELTA, send_mouse_wheel
+        self.send_mouse_wheel = send_mouse_wheel
+        # SendInput 支持 1/WHEEL_DELTA 格的高精度滚动
+        self.wheel_resolution = WHEEL_DELTA
+
+    def wheel(self, dx, dy):
+        res = self.wheel_resolution
+        self.send_mouse_wheel(dx=int(round(dx * res)), dy=int(round(dy * res)), delta=1)
+
+
+class RecordingBackend:
+    """
+    只记录不执行的后端，用于无显示环境下的测试与基准测试
+
+    events 中每一项为 (命令类型, 参数元组)
+    """
+    def __init__(self, screen_size=(1920, 1080), keep_events=True, wheel_resolution=1):
+        self.screen_size = screen_size
+        self.keep_events = keep_events
+        self.wheel_resolution = wheel_resolution
+        self.events = []
+        self.count = 0
+
+    def _record(self, op, *args):
+        self.count += 1
+        if self.keep_events:
+            self.events.append((op, args))
+
+    def size(self):
+        return self.screen_size
+
+    def move(self, dx, dy):
+        self._record(MOVE, dx, dy)
+
+    def move_to(self, x, y):
+        self._record(MOVE_TO, x, y)
+
+    def down(self, button):
+        self._record(DOWN, button)
+
+    def up(self, button):
+        self._record(UP, button)
+
+    def click(self, button):
+        self._record(CLICK, button)
+
+    def press(self, key):
+        self._record(PRESS, key)
+
+    def hotkey(self, *keys):
+        self._record(HOTKEY, *keys)
+
+    def wheel(self, dx, dy):
+        self._record(WHEEL, dx, dy)
+
+    def volume(self, steps):
+        self._record(VOLUME, steps)
+
+    def volume_floor(self, steps):
+        self._record(VOLUME_FLOOR, steps)
+
+
+BACKENDS = {
+    "win32": Win32Backend,
+    "pyautogui": PyAutoGuiBackend,
+    "recording": RecordingBackend,
+}
+
+
+def default_backend_name():
+    """按运行平台选择后端：Windows 用 win32；没有图形会话的 Linux 只能记录"""
+    if sys.platform == "win32":
+        return "win32"
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        return "recording"
+    return "pyautogui"
+
+
+def create_backend(name=None):
+    """根据名称创建后端：'auto'、'win32'、'pyautogui' 或 'recording'"""
+    name = name or Settings.ACTUATOR_BACKEND
+    if name == "auto":
+        name = default_backend_name()
+        if name == "recording":
+            log("未检测到图形会话，输入操作只记录不执行", WARNING)
+    if name not in BACKENDS:
+        raise ValueError(f"未知的输入后端: {name}")
+    return BACKENDS[name]()
+
+
+class Actuator:
+    """
+    输入注入执行器
+
+    - 有界命令队列（上限对所有命令生效）：相对移动/滚轮/音量键在队尾与同类命令合并，队列满时丢弃相对移动与滚轮；
+      其他命令按提交顺序执行，队列满时先把队尾紧邻的按下/松开合并为点击、丢弃队列中最早的移动/滚轮；
+      仍然满时按下/松开超出上限入队（永不丢弃），点击/按键等被丢弃并返回 False。submit() 从不等待
+    - stop() 之后提交的命令被拒绝
+    - 统计每条命令的排队延迟(queue)与执行耗时(inject)
+    - threaded=False 时在调用线程上同步执行，便于测试
+    - 未传入 backend 时在执行线程中创建（导入 pyautogui 不阻塞启动），创建失败则退回记录后端
+    """
+    def __init__(self, backend=None, maxsize=None, threaded=None):
+        self.backend = backend
+        self.maxsize = maxsize or Settings.ACTUATOR_QUEUE_SIZE
+        self.threaded = Settings.ACTUATOR_THREADED if threaded is None else threaded
+
+        self.submitted = 0   # 提交的命令数
+        self.coalesced = 0   # 被合并的命令数
+        self.dropped = 0     # 队列满时丢弃的命令数
+        self.executed = 0    # 实际执行的命令数
+        self.errors = 0      # 执行出错的命令数
+        self.rejected = 0    # stop() 之后提交而被拒绝的命令数
+        self.profiler = LatencyProfiler(stages=("queue", "inject"), window=Settings.PROFILER_WINDOW)
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = self.threaded
+        self._stopped = False
+        self._thread = None
+        self._backend_ready = threading.Event()
+        if self.backend is not None or not self.threaded:
+            self._load_backend()
+        if self.threaded:
+            self._thread = threading.Thread(target=self._run, name="Actuator", daemon=True)
+            self._thread.start()
+
+    # ---------- 提交命令 ----------
+    def submit(self, op, *args):
+        """提交命令，返回是否入队（被合并也视为成功）；从不等待执行线程"""
+        now = time.perf_counter()
+        with self._cond:
+            if self._stopped:
+                self.rejected += 1
+                log_limited("actuator_stopped", "输入执行器已停止，命令被拒绝", WARNING, op=op)
+                return False
+            self.submitted += 1
+            if self.threaded:
+                return self._enqueue(op, args, now)
+        self._execute(op, args, now)
+        return True
+
+    def _enqueue(self, op, args, now):
+        """放入队列（调用时持有锁）"""
+        queue = self._queue
+        if op in COALESCABLE and queue and queue[-1][0] == op:
+            # 与队尾的同类命令合并：累加位移/步数，保留最早的入队时间
+            _, queued, t = queue[-1]
+            queue[-1] = (op, tuple(a + b for a, b in zip(queued, args)), t)
+            self.coalesced += 1
+            return True
+        if len(queue) >= self.maxsize:
+            if op in DROPPABLE:
+                self.dropped += 1
+                return False
+            if op == UP and queue[-1][0] == DOWN and queue[-1][1] == args:
+                # 尚未执行的按下 + 松开 -> 点击，不占用新的位置
+                queue[-1] = (CLICK, args, queue[-1][2])
+                self.coalesced += 1
+                return True
+            if not self._evict() and op not in STATEFUL:
+                self.dropped += 1
+                log_limited("actuator_full", "输入命令队列已满，命令被丢弃", WARNING, op=op, pending=len(queue))
+                return False
+            # 按下/松开改变按键状态，丢弃会让系统中的按键一直按着：没有可丢弃的命令时允许超出上限
+        queue.append((op, args, now))
+        self._cond.notify()
+        return True
+
+    def _evict(self):
+        """丢弃队列中最早的移动/滚轮（调用时持有锁），返回是否腾出了空位"""
+        queue = self._queue
+        for i, (queued_op, _, _) in enumerate(queue):
+            if queued_op in DROPPABLE:
+                del queue[i]
+                self.dropped += 1
+                return True
+        return False
+
+    def move(self, dx, dy):
+        return self.submit(MOVE, dx, dy)
+
+    def move_to(self, x, y):
+        return self.submit(MOVE_TO, x, y)
+
+    def down(self, button="left"):
+        return self.submit(DOWN, button)
+
+    def up(self, button="left"):
+        return self.submit(UP, button)
+
+    def click(self, button="left"):
+        return self.submit(CLICK, button)
+
+    def press(self, key):
+        return self.submit(PRESS, key)
+
+    def hotkey(self, *keys):
+        return self.submit(HOTKEY, *keys)
+
+    def wheel(self, dx=0, dy=0):
+        return self.submit(WHEEL, dx, dy)
+
+    def volume(self, steps):
+        return self.submit(VOLUME, steps)
+
+    def volume_floor(self, steps):
+        return self.submit(VOLUME_FLOOR, steps)
+
+    def _load_backend(self):
+        if self.backend is None:
+            try:
+                self.backend = create_backend()
+            except Exception as e:
+                log(f"输入后端加载失败 ({e!r})，输入操作只记录不执行", WARNING)
+                self.backend = RecordingBackend(keep_events=False)
+        self._backend_ready.set()
+
+    def screen_size(self, timeout=5.0):
+        """屏幕尺寸 (宽, 高)，后端尚在加载时等待其完成"""
+        if not self._backend_ready.wait(timeout):
+            return RecordingBackend().size()
+        return tuple(self.backend.size())
+
+    def wheel_resolution(self, timeout=5.0):
+        """后端每格滚轮的最小单位数（1 表示只能整格滚动），后端尚在加载时等待其完成"""
+        if not self._backend_ready.wait(timeout):
+            return 1
+        return getattr(self.backend, "wheel_resolution", 1)
+
+    # ---------- 执行 ----------
+    def _execute(self, op, args, enqueued):
+        start = time.perf_counter()
+        self.profiler.record("queue", start - enqueued)
+        try:
+            getattr(self.backend, op)(*args)
+        except Exception as e:
+            self.errors += 1
+            log_limited(f"actuator_{op}", f"输入命令执行失败: {e!r}", WARNING, op=op, errors=self.errors)
+        self.profiler.record("inject", time.perf_counter() - start)
+        self.executed += 1
+
+    def _run(self):
+        self._load_backend()
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._queue:
+                    break  # 已停止且队列为空
+                op, args, enqueued = self._queue.popleft()
+                self._busy = True
+            self._execute(op, args, enqueued)
+
+    def pending(self):
+        """队列中尚未执行的命令数"""
+        return len(self._queue)
+
+    def flush(self, timeout=1.0):
+        """等待队列中的命令全部执行完毕"""
+        if not self.threaded:
+            return True
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def stop(self, timeout=1.0):
+        """执行完剩余命令后停止线程，之后提交的命令被拒绝"""
+        self._stopped = True
+        if self._thread is None:
+            return
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self):
+        """统计信息，延迟为 (p50, p95, p99) 毫秒"""
+        return {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "executed": self.executed,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "pending": self.pending(),
+            "queue_ms": self.profiler.percentiles("queue"),
+            "inject_ms": self.profiler.percentiles("inject"),
+        }
+
+
+_default_actuator = None
+
+
+def get_default_actuator():
+    """进程内共享的默认执行器（首次调用时创建）"""
+    global _default_actuator
+    if _default_actuator is None:
+        _default_actuator = Actuator()
+    return _default_actuator
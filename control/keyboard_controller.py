@@ -1,8 +1,19 @@
-import pyautogui
+from config import Settings
+from .actuator import get_default_actuator
 
 class KeyboardController:
+    def __init__(self, actuator=None):
+        self.actuator = actuator if actuator is not None else get_default_actuator()
+        self.swipe_keys = dict(Settings.SWIPE_KEYS)  # 挥动方向 (GestureType 名称) -> 快捷键
+
     def zoom_in(self):
-        pyautogui.hotkey('ctrl', '+')
+        self.actuator.hotkey('ctrl', '+')
     
     def zoom_out(self):
-        pyautogui.hotkey('ctrl', '-')
\ No newline at end of file
+        self.actuator.hotkey('ctrl', '-')
+
+    def swipe(self, direction):
+        """按挥动方向发送对应快捷键，未配置的方向不操作"""
+        keys = self.swipe_keys.get(direction)
+        if keys:
+            self.actuator.hotkey(*keys)
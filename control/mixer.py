@@ -0,0 +1,129 @@
+# control/mixer.py
+"""
+音量混音器接口
+
+VolumeController 只决定“调多少”，具体怎么改音量由混音器完成：
+
+- KeyMixer   通过输入执行器发送音量键（control.actuator 的 VOLUME 命令，连续的步数在队列中合并为一次多次按键）。
+             系统不报告当前音量，绝对音量通过“先按到 0 再按上去”校准后按估计值相对调整；
+             估计值跨多次进入音量模式保留，只有音量键闲置超过 VOLUME_RESYNC_IDLE 后才重新校准
+- FakeMixer  只在本地记录音量与操作次数，不发送任何按键，用于无显示环境下的测试与吞吐量测量
+
+接口：step(n) 调整 n 步（正数为增大）；set_level(level) 设置绝对音量 (0.0 - 1.0)；
+toggle_mute() 切换静音；sync() 在进入音量模式时调用，估计可能过期时丢弃它；level 为当前音量，未知时为 None。
+"""
+import time
+from collections import deque
+
+from config import Settings
+
+
+class KeyMixer:
+    """用音量键调节系统音量，每步为 Settings.VOLUME_KEY_STEP（Windows 为 2%）"""
+    def __init__(self, actuator, step=None):
+        self.actuator = actuator
+        self.step_size = step or Settings.VOLUME_KEY_STEP
+        self.steps_total = round(1.0 / self.step_size)  # 0% -> 100% 的步数
+        self._steps = None  # 估计的当前音量 (步)，None 表示未知
+        self._last_used = None  # 上次发送音量键的时间
+        self.resync_idle = Settings.VOLUME_RESYNC_IDLE
+        self.presses = 0    # 发送的音量键次数
+        self.calibrations = 0
+
+    @property
+    def level(self):
+        return None if self._steps is None else self._steps / self.steps_total
+
+    def sync(self):
+        # 闲置很久后用户可能用物理按键或系统界面改过音量，下次设置绝对音量时重新校准；
+        # 短时间内反复进入音量模式沿用估计值，否则每次进入都会先把音量按到 0
+        if self._steps is None or self.resync_idle is None:
+            return
+        if self._last_used is None or time.monotonic() - self._last_used > self.resync_idle:
+            self._steps = None
+
+    def step(self, n):
+        n = int(n)
+        if n == 0:
+            return
+        if self._steps is not None:
+            n = min(max(self._steps + n, 0), self.steps_total) - self._steps
+            if n == 0:
+                return
+            self._steps += n
+        self.actuator.volume(n)
+        self.presses += abs(n)
+        self._last_used = time.monotonic()
+
+    def set_level(self, level):
+        target = round(min(max(level, 0.0), 1.0) * self.steps_total)
+        if self._steps is None:
+            # 当前音量未知：先按到 0（多按的音量减没有效果），再按到目标
+            self.actuator.volume_floor(self.steps_total)
+            self.presses += self.steps_total
+            self.calibrations += 1
+            self._steps = 0
+            self._last_used = time.monotonic()
+        self.step(target - self._steps)
+
+    def toggle_mute(self):
+        self.actuator.press("volumemute")
+
+    def get_stats(self):
+        return {"presses": self.presses, "calibrations": self.calibrations, "level": self.level}
+
+
+class FakeMixer:
+    """本地模拟的混音器：保存音量与静音状态，统计操作次数"""
+    def __init__(self, actuator=None, step=None, level=0.5, history=256):
+        self.step_size = step or Settings.VOLUME_KEY_STEP
+        self.steps_total = round(1.0 / self.step_size)
+        self._steps = round(level * self.steps_total)
+        self.muted = False
+        self.calls = 0     # step/set_level/toggle_mute 调用次数
+        self.presses = 0   # 等效的音量键次数
+        # 最近 history 次调用后的音量（长时间吞吐量测量时内存不增长），0 表示不记录
+        self.history = deque(maxlen=history)
+
+    @property
+    def level(self):
+        return self._steps / self.steps_total
+
+    def sync(self):
+        pass
+
+    def _set_steps(self, steps):
+        steps = min(max(steps, 0), self.steps_total)
+        self.calls += 1
+        self.presses += abs(steps - self._steps)
+        self._steps = steps
+        self.history.append(self.level)
+
+    def step(self, n):
+        if n:
+            self._set_steps(self._steps + int(n))
+
+    def set_level(self, level):
+        self._set_steps(round(min(max(level, 0.0), 1.0) * self.steps_total))
+
+    def toggle_mute(self):
+        self.calls += 1
+        self.muted = not self.muted
+
+    def get_stats(self):
+        return {"calls": self.calls, "presses": self.presses, "level": self.level, "muted": self.muted}
+
+
+MIXERS = {
+    "keys": KeyMixer,
+    "fake": FakeMixer,
+}
+
+
+def create_mixer(actuator, name=None):
+    """根据名称创建混音器：'keys' 或 'fake'"""
+    name = name or Settings.VOLUME_MIXER
+    if name not in MIXERS:
+        raise ValueError(f"未知的音量混音器: {name}")
+    return MIXERS[name](actuator)
+
@@ -0,0 +1,135 @@
+# control/scroll_engine.py
+"""
+速度式滚动引擎
+
+原来滚动模式每帧把 int(偏移 * SCROLL_SPEED) 交给 MouseController.scroll_vertical，再乘 0.1 取整：
+小偏移被截断为 0，滚动速度还随摄像头帧率变化。ScrollEngine 把摇杆偏移视为滚动速度（格/秒）：
+
+- 按实际经过的时间积分速度，不足一个滚轮单位的部分保留到下一次，慢速滚动也不会丢失
+- 独立的定时线程以 Settings.SCROLL_TICK_HZ 频率输出滚轮事件，与视觉循环的帧率无关；
+  速度为 0 时线程退出，不占用 CPU
+- 滚轮事件交给输出对象 (sink) 的 wheel(dx, dy)，默认为输入执行器 (control.actuator.Actuator)，
+  单位为格，可以是 1 / wheel_resolution 的倍数（Windows 后端支持 1/120 格的高精度滚动）；
+  使用 RecordingBackend 的执行器即可在 Linux 上测试
+- threaded=False 时不启动线程，每次 set_velocity(..., now) 按传入的时间戳积分（回放与测试）
+"""
+import threading
+import time
+
+from config import Settings
+
+
+class ScrollEngine:
+    def __init__(self, sink, rate=None, threaded=True, max_step=None):
+        """
+        Args:
+            sink: 提供 wheel(dx, dy) 的输出对象，可选 wheel_resolution（属性或方法）为每格的最小单位数
+            rate: 输出频率 (Hz)，默认 Settings.SCROLL_TICK_HZ
+            threaded: 是否由定时线程输出
+            max_step: 单次积分的最长时长 (秒)，避免线程或帧被阻塞后一次滚动过多，默认 Settings.SCROLL_MAX_STEP
+        """
+        self.sink = sink
+        self.interval = 1.0 / (rate or Settings.SCROLL_TICK_HZ)
+        self.threaded = threaded
+        self.max_step = max_step or Settings.SCROLL_MAX_STEP
+        self._resolution = None
+
+        self._vx = 0.0
+        self._vy = 0.0
+        self._remain_x = 0.0   # 尚未输出的滚动量 (格)
+        self._remain_y = 0.0
+        self._last = None      # 上次积分的时间
+        self._cond = threading.Condition()
+        self._thread = None
+
+        self.events = 0        # 输出的滚轮事件数
+        self.total_x = 0.0     # 累计输出的滚动量 (格)
+        self.total_y = 0.0
+
+    @property
+    def resolution(self):
+        """每格的最小输出单位数，首次输出时向 sink 查询（执行器在后端加载完成后才能确定）"""
+        if self._resolution is None:
+            res = getattr(self.sink, "wheel_resolution", 1)
+            self._resolution = max(1, int(res() if callable(res) else res))
+        return self._resolution
+
+    @property
+    def active(self):
+        return self._vx != 0.0 or self._vy != 0.0
+
+    def set_velocity(self, vx, vy, now=None):
+        """
+        设置滚动速度（格/秒，vy 为正时页面向上滚动）
+
+        速度变为 0 时丢弃未输出的余量，下次滚动从零开始。
+        """
+        # 定时线程按 perf_counter 积分，传入的时间戳只在同步模式下使用
+        now = time.perf_counter() if now is None or self.threaded else now
+        with self._cond:
+            if not self.threaded and self._last is not None:
+                # 同步模式：先按旧速度积分到当前时间
+                self._integrate(now)
+            self._vx, self._vy = float(vx), float(vy)
+            if not self.active:
+                self._remain_x = self._remain_y = 0.0
+                self._last = None
+                self._cond.notify_all()
+                return
+            if self._last is None:
+                self._last = now
+            if self.threaded and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ScrollEngine", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """速度归零并等待定时线程退出"""
+        self.set_velocity(0.0, 0.0)
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _integrate(self, now):
+        """按经过的时间累积滚动量，输出其中的整数单位部分，调用方持有锁"""
+        elapsed = min(now - self._last, self.max_step)
+        self._last = now
+        if elapsed <= 0:
+            return
+        res = self.resolution
+        self._remain_x += self._vx * elapsed * res
+        self._remain_y += self._vy * elapsed * res
+        # 向零取整，余量保留到下一次
+        ux, uy = int(self._remain_x), int(self._remain_y)
+        if ux == 0 and uy == 0:
+            return
+        self._remain_x -= ux
+        self._remain_y -= uy
+        dx, dy = ux / res, uy / res
+        self.sink.wheel(dx=dx, dy=dy)
+        self.events += 1
+        self.total_x += dx
+        self.total_y += dy
+
+    def _run(self):
+        next_tick = time.perf_counter() + self.interval
+        while True:
+            with self._cond:
+                if not self.active:
+                    self._thread = None
+                    return
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    # 速度归零时被提前唤醒
+                    self._cond.wait(delay)
+                    if not self.active:
+                        self._thread = None
+                        return
+                now = time.perf_counter()
+                self._integrate(now)
+            next_tick += self.interval
+            if next_tick < now:
+                # 落后超过一个周期（线程被挂起）：从当前时间重新对齐，不补发
+                next_tick = now + self.interval
+
+    def get_stats(self):
+        return {"events": self.events, "total_x": round(self.total_x, 2), "total_y": round(self.total_y, 2)}
@@ -1,14 +1,102 @@
 # control/volume_controller.py
-import pyautogui
+"""
+音量控制
+
+原来手超过 VOLUME_TRIGGER_THRESHOLD 后每帧按一次音量键（30 FPS 时每秒 30 次），音量跳变且随帧率变化。
+现在由手的偏移决定调节方式，实际操作交给混音器 (control.mixer)：
+
+- "rate"     超过阈值的偏移换算为步进速率（步/秒，不超过 VOLUME_MAX_RATE），按帧时间戳积分，
+             不足一步的部分保留到下一帧，每帧至多一次 step(n)，与帧率无关
+- "absolute" 手的纵向位置映射为绝对音量：画面中 VOLUME_ABSOLUTE_RANGE 范围从上到下对应 100% -> 0%，
+             偏移第一次超过阈值后才开始跟随，进入音量模式时音量不会跳变；音量只在跨过一步时才设置
+"""
+import time
+
+from config import Settings
+from .actuator import get_default_actuator
+from .mixer import create_mixer
+
+RATE = "rate"
+ABSOLUTE = "absolute"
+
 
 class VolumeController:
+    def __init__(self, actuator=None, mixer=None, mode=None):
+        self.actuator = actuator if actuator is not None else get_default_actuator()
+        self.mixer = mixer if mixer is not None else create_mixer(self.actuator)
+        self.mode = mode or Settings.VOLUME_CONTROL
+        if self.mode not in (RATE, ABSOLUTE):
+            raise ValueError(f"未知的音量调节方式: {self.mode}")
+        self.rate_gain = Settings.VOLUME_RATE_GAIN
+        self.max_rate = Settings.VOLUME_MAX_RATE
+        self.top, self.bottom = Settings.VOLUME_ABSOLUTE_RANGE
+        self._remain = 0.0     # 尚未执行的步数
+        self._last = None      # 上一帧的时间戳
+        self._engaged = False  # 绝对模式：偏移已超过阈值，开始跟随手的位置
+        self._target = None    # 绝对模式：上次设置的步数
+
+    def begin(self):
+        """进入音量模式"""
+        self.reset()
+        self.mixer.sync()
+
+    def reset(self):
+        """离开音量模式：丢弃未执行的余量"""
+        self._remain = 0.0
+        self._last = None
+        self._engaged = False
+        self._target = None
+
+    def update(self, offset, y, threshold, timestamp=None):
+        """
+        每帧调用一次
+
+        Args:
+            offset: 手相对进入模式时原点的纵向偏移（向上为负）
+            y: 手的纵向位置（归一化坐标）
+            threshold: 触发阈值，偏移不超过该值时不调节
+            timestamp: 帧时间戳
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        if self.mode == ABSOLUTE:
+            self._update_absolute(offset, y, threshold)
+            return
+        elapsed = 0.0 if self._last is None else min(now - self._last, Settings.VOLUME_MAX_STEP)
+        self._last = now
+        excess = abs(offset) - threshold
+        if excess <= 0:
+            # 回到阈值内：停止调节，余量不累积到下一次
+            self._remain = 0.0
+            return
+        rate = min(excess * self.rate_gain, self.max_rate)
+        # 手向上(offset 为负) -> 音量增加
+        self._remain += (rate if offset < 0 else -rate) * max(elapsed, 0.0)
+        steps = int(self._remain)
+        if steps:
+            self._remain -= steps
+            self.mixer.step(steps)
+
+    def _update_absolute(self, offset, y, threshold):
+        if not self._engaged:
+            if abs(offset) <= threshold:
+                return
+            self._engaged = True
+        level = (self.bottom - y) / (self.bottom - self.top)
+        level = min(max(level, 0.0), 1.0)
+        target = round(level * self.mixer.steps_total)
+        if target != self._target:
+            self._target = target
+            self.mixer.set_level(target / self.mixer.steps_total)
+
     def increase_volume(self):
-        # 每次按一下音量加
-        pyautogui.press('volumeup')
-        
+        # 按一下音量加
+        self.mixer.step(1)
+
     def decrease_volume(self):
-        pyautogui.press('volumedown')
-        
+        self.mixer.step(-1)
+
     def toggle_mute(self):
-        pyautogui.press('volumemute')
-        
+        self.mixer.toggle_mute()
+
+    def get_stats(self):
+        return self.mixer.get_stats()
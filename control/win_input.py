@@ -0,0 +1,76 @@
+# control/win_input.py
+"""
+Windows 原生输入注入（SendInput），仅在 Windows 上由 Win32Backend 按需导入
+"""
+import ctypes
+from ctypes import wintypes
+
+from utils.logger import ERROR, log_limited
+
+# 调用Windows User32.dll，发送鼠标滚动消息
+user32 = ctypes.WinDLL('user32', use_last_error=True)
+
+ULONG_PTR = ctypes.c_ulonglong
+
+# 定义Windows API的结构体和常量
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR)  # 修复：替换为自定义的ULONG_PTR
+    ]
+
+class INPUT(ctypes.Structure):
+    _fields_ = [
+        ("type", wintypes.DWORD),
+        ("mi", MOUSEINPUT)
+    ]
+
+# 鼠标消息常量：MOUSEEVENTF_WHEEL（垂直滚动）、MOUSEEVENTF_HWHEEL（水平滚动）
+MOUSEEVENTF_WHEEL = 0x0800
+MOUSEEVENTF_HWHEEL = 0x1000
+INPUT_MOUSE = 0
+# 滚动增量单位：Windows默认每滚轮格=120（和物理滚轮、触控板一致）
+WHEEL_DELTA = 120
+
+def send_mouse_wheel(dx=0, dy=0, delta=WHEEL_DELTA):
+    """
+    调用Windows原生API发送鼠标滚动消息（模拟触控板/物理滚轮）
+
+    dx/dy 乘以 delta 后作为滚动增量：默认单位为格，delta=1 时为 1/120 格的高精度增量
+    """
+    inputs = INPUT * 2
+    inp = inputs()
+    count = 0
+
+    # 处理垂直滚动
+    if dy != 0:
+        inp[count].type = INPUT_MOUSE
+        inp[count].mi.dx = 0
+        inp[count].mi.dy = 0
+        inp[count].mi.mouseData = dy * delta  # 映射为Windows标准增量
+        inp[count].mi.dwFlags = MOUSEEVENTF_WHEEL
+        inp[count].mi.time = 0
+        inp[count].mi.dwExtraInfo = 0  # 额外信息设为0即可
+        count += 1
+
+    # 处理水平滚动
+    if dx != 0:
+        inp[count].type = INPUT_MOUSE
+        inp[count].mi.dx = 0
+        inp[count].mi.dy = 0
+        inp[count].mi.mouseData = dx * delta  # 映射为Windows标准增量
+        inp[count].mi.dwFlags = MOUSEEVENTF_HWHEEL
+        inp[count].mi.time = 0
+        inp[count].mi.dwExtraInfo = 0  # 额外信息设为0
+        count += 1
+
+    # 发送滚动消息到系统 + 错误检查
+    if count > 0:
+        res = user32.SendInput(count, ctypes.byref(inp), ctypes.sizeof(INPUT))
+        if res == 0:
+            # 在输入执行线程中调用，持续失败时限频记录
+            log_limited("send_mouse_wheel", "滚动消息发送失败", ERROR, error=ctypes.get_last_error())
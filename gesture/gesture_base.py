@@ -11,5 +11,10 @@ class GestureType(Enum):
     SCROLL_MODE = auto()   # 滚轮模式
     VOLUME_MODE = auto()   # 音量模式
 
-    ZOOM_IN = 7
-    ZOOM_OUT = 8
\ No newline at end of file
+    # 轨迹手势（单帧事件，由 gesture.trajectory_recognizer 根据关键点历史产生）
+    ZOOM_IN = auto()       # 放大：手掌推向摄像头
+    ZOOM_OUT = auto()      # 缩小：手掌远离摄像头
+    SWIPE_LEFT = auto()    # 快速挥动
+    SWIPE_RIGHT = auto()
+    SWIPE_UP = auto()
+    SWIPE_DOWN = auto()
@@ -0,0 +1,284 @@
+# gesture/gesture_classifier.py
+"""
+学习式手势分类引擎
+
+规则引擎 (GestureRecognizer) 只看手指的二值伸直状态，拇指用 x 比较、其余手指用 y 比较，手一旋转就会误判。
+这里改为从 21 个关键点计算与旋转/尺度无关的特征 (gesture.landmark_features)，
+用纯 NumPy 的小模型分类（多类逻辑回归或最近质心），多只手/整段录制都可以一次批量推理。
+
+模型由 tools/train_gesture_model.py 从标注过的录制数据训练，保存为 .npz；
+Settings.GESTURE_ENGINE = "learned" 时 create_recognizer() 返回 LearnedGestureRecognizer，
+接口与 GestureRecognizer 相同，可直接替换。
+
+特征是向量长度对数的线性组合，单帧识别时把特征的线性组合并入模型权重：
+关键点 -> 长度对数（五次 NumPy 调用）-> 一次矩阵乘法打分 -> 纯 Python 取最大类别，
+不比规则引擎的逐帧路径慢（python -m benchmarks.run --only recognizer）。
+"""
+import math
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+from config import Settings
+from utils.logger import WARNING, log
+from .gesture_base import GestureType
+from .gesture_recognizer import GESTURE_POINT_BY_TYPE, GestureRecognizer, gesture_point
+from .landmark_features import FEATURE_MIX, FEATURE_VERSION, NUM_FEATURES, landmark_features, log_lengths
+
+GESTURE_BY_VALUE = {g.value: g for g in GestureType}
+# GestureType.value -> 定位点ID，-1 表示无定位点
+POINT_ID_BY_VALUE = np.full(max(g.value for g in GestureType) + 1, -1, dtype=np.int16)
+for _gesture, _point_id in GESTURE_POINT_BY_TYPE.items():
+    POINT_ID_BY_VALUE[_gesture.value] = _point_id
+
+
+class _LinearModelBase:
+    """
+    特征标准化 + 线性打分的模型基类
+
+    子类在标准化特征空间中给出线性打分 (weights, bias)，构造时把标准化并入权重，
+    推理只需一次矩阵乘法。
+    """
+    kind = None
+
+    def __init__(self, classes, mean, std):
+        self.classes = np.asarray(classes, dtype=np.int16)  # 各输出对应的 GestureType.value
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.inv_std = (1.0 / np.maximum(np.asarray(std, dtype=np.float32), 1e-6)).astype(np.float32)
+        self.none_value = np.int16(GestureType.NONE.value)
+        self._w = None
+        self._b = None
+
+    def _standardize(self, features):
+        return (features - self.mean) * self.inv_std
+
+    def _fold(self, weights, bias):
+        """把标准化并入线性层：((x - mean) * inv_std) @ W + b = x @ W' + b'"""
+        weights = np.asarray(weights, dtype=np.float32)
+        self._w = (weights * self.inv_std[:, None]).astype(np.float32)
+        self._b = (np.asarray(bias, dtype=np.float32) - (self.mean * self.inv_std) @ weights).astype(np.float32)
+        # 单帧路径用纯 Python 列表，类别只有几个，比 NumPy 调用快
+        self._bias_list = self._b.tolist()
+        self._class_list = self.classes.tolist()
+
+    def scores(self, features: np.ndarray) -> np.ndarray:
+        return features @ self._w + self._b
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """(N, F) 特征 -> (N, C) 各类别概率"""
+        scores = self.scores(features)
+        scores -= scores.max(axis=-1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=-1, keepdims=True)
+        return scores
+
+    def predict(self, features: np.ndarray, min_confidence: float = 0.0) -> np.ndarray:
+        """(N, F) 特征 -> (N,) GestureType.value，最大概率低于 min_confidence 时为 NONE"""
+        scores = self.scores(features)
+        best = scores.argmax(axis=-1)
+        values = self.classes[best]
+        if min_confidence > 0:
+            # 最大类别的 softmax 概率 = 1 / sum(exp(s - s_max))
+            scores -= np.take_along_axis(scores, best[..., None], axis=-1)
+            confidence = 1.0 / np.exp(scores).sum(axis=-1)
+            values = np.where(confidence >= min_confidence, values, self.none_value)
+        return values
+
+    def predict_one(self, features: np.ndarray, min_confidence: float = 0.0) -> int:
+        """单帧 (F,) 特征 -> GestureType.value"""
+        return self.decide(np.dot(features, self._w).tolist(), min_confidence)
+
+    def input_weights(self, mix: np.ndarray) -> np.ndarray:
+        """特征由输入线性组合得到 (features = x @ mix) 时，直接从 x 打分的权重：x @ (mix @ W') + b'"""
+        return np.dot(np.asarray(mix, dtype=np.float32), self._w)
+
+    def decide(self, scores: List[float], min_confidence: float = 0.0) -> int:
+        """
+        单帧不含偏置的打分 -> GestureType.value，最大概率低于 min_confidence 时为 NONE
+
+        Args:
+            scores: features @ W' 或 x @ input_weights(mix) 的结果（Python 列表）
+        """
+        scores = [s + b for s, b in zip(scores, self._bias_list)]
+        top = max(scores)
+        # 最大类别的 softmax 概率 = 1 / sum(exp(s - s_max))
+        if min_confidence > 0 and sum([math.exp(s - top) for s in scores]) * min_confidence > 1.0:
+            return int(self.none_value)
+        return self._class_list[scores.index(top)]
+
+    def _params(self):
+        return {}
+
+    def save(self, path):
+        """保存为 .npz"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, kind=self.kind, classes=self.classes, mean=self.mean, std=1.0 / self.inv_std,
+                 num_features=NUM_FEATURES, feature_version=FEATURE_VERSION, **self._params())
+
+
+class SoftmaxClassifier(_LinearModelBase):
+    """多类逻辑回归"""
+    kind = "softmax"
+
+    def __init__(self, classes, mean, std, weights, bias):
+        super().__init__(classes, mean, std)
+        self.weights = np.asarray(weights, dtype=np.float32)  # (F, C)，标准化特征空间
+        self.bias = np.asarray(bias, dtype=np.float32)        # (C,)
+        self._fold(self.weights, self.bias)
+
+    def _params(self):
+        return {"weights": self.weights, "bias": self.bias}
+
+    @classmethod
+    def fit(cls, features, labels, epochs=500, learning_rate=0.5, l2=1e-3):
+        """
+        全批量梯度下降训练，各类别按样本数反比加权，避免 NONE 等大类淹没少数类
+
+        Args:
+            features: (N, F) 特征
+            labels: (N,) GestureType.value
+        """
+        classes, y = np.unique(labels, return_inverse=True)
+        mean, std = features.mean(axis=0), features.std(axis=0)
+        weights = np.zeros((features.shape[1], len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        model = cls(classes, mean, std, weights, bias)
+        x = model._standardize(features.astype(np.float32))
+        onehot = np.eye(len(classes), dtype=np.float32)[y]
+        sample_weight = (len(y) / (len(classes) * np.bincount(y)))[y].astype(np.float32)[:, None]
+        sample_weight /= sample_weight.sum()
+        for _ in range(epochs):
+            scores = x @ weights + bias
+            scores -= scores.max(axis=1, keepdims=True)
+            proba = np.exp(scores)
+            proba /= proba.sum(axis=1, keepdims=True)
+            grad = (proba - onehot) * sample_weight
+            weights -= learning_rate * (x.T @ grad + l2 * weights)
+            bias -= learning_rate * grad.sum(axis=0)
+        return cls(classes, mean, std, weights, bias)
+
+
+class NearestCentroidClassifier(_LinearModelBase):
+    """最近质心：标准化特征空间中到各类质心的距离，按类内平均距离换算为概率"""
+    kind = "centroid"
+
+    def __init__(self, classes, mean, std, centroids, temperature):
+        super().__init__(classes, mean, std)
+        self.centroids = np.asarray(centroids, dtype=np.float32)  # (C, F)，标准化特征空间
+        self.temperature = float(temperature)
+        # 打分 -|x - c|² / (2T)；|x - c|² = |x|² - 2 x·c + |c|²，|x|² 对所有类别相同，
+        # 不影响 argmax 与 softmax，因此等价于一个线性层
+        scale = 1.0 / (2.0 * self.temperature)
+        self._fold(2.0 * scale * self.centroids.T, -scale * np.sum(self.centroids ** 2, axis=1))
+
+    def _params(self):
+        return {"centroids": self.centroids, "temperature": self.temperature}
+
+    @classmethod
+    def fit(cls, features, labels):
+        classes, y = np.unique(labels, return_inverse=True)
+        mean, std = features.mean(axis=0), features.std(axis=0)
+        model = cls(classes, mean, std, np.zeros((len(classes), features.shape[1])), 1.0)
+        x = model._standardize(features.astype(np.float32))
+        centroids = np.stack([x[y == k].mean(axis=0) for k in range(len(classes))])
+        spread = np.mean(np.sum((x - centroids[y]) ** 2, axis=1))
+        return cls(classes, mean, std, centroids, max(float(spread), 1e-3))
+
+
+MODEL_KINDS = {
+    SoftmaxClassifier.kind: SoftmaxClassifier,
+    NearestCentroidClassifier.kind: NearestCentroidClassifier,
+}
+
+
+def train_model(kind, features, labels, **kwargs):
+    """按名称训练模型：'softmax' 或 'centroid'"""
+    if kind not in MODEL_KINDS:
+        raise ValueError(f"未知的分类模型: {kind}")
+    return MODEL_KINDS[kind].fit(features, labels, **kwargs)
+
+
+def load_model(path):
+    """读取 save() 保存的模型"""
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data["kind"])
+        if kind not in MODEL_KINDS:
+            raise ValueError(f"未知的分类模型: {kind}")
+        if int(data["num_features"]) != NUM_FEATURES:
+            raise ValueError(f"模型特征维数 {int(data['num_features'])} 与当前特征 {NUM_FEATURES} 不一致，需要重新训练")
+        version = int(data["feature_version"]) if "feature_version" in data.files else 1
+        if version != FEATURE_VERSION:
+            raise ValueError(f"模型特征版本 {version} 与当前特征版本 {FEATURE_VERSION} 不一致，需要重新训练")
+        params = {k: data[k] for k in data.files if k not in ("kind", "num_features", "feature_version")}
+    return MODEL_KINDS[kind](**params)
+
+
+_default_model = None
+
+
+def get_default_model():
+    """读取 Settings.GESTURE_MODEL_PATH 的模型（进程内只读取一次），失败时返回 None"""
+    global _default_model
+    if _default_model is None:
+        try:
+            _default_model = load_model(Settings.GESTURE_MODEL_PATH)
+        except (OSError, ValueError, KeyError) as e:
+            log(f"手势模型加载失败 ({e})，使用规则引擎", WARNING)
+            _default_model = False
+    return _default_model or None
+
+
+class LearnedGestureRecognizer(GestureRecognizer):
+    """与 GestureRecognizer 接口一致、由训练模型分类的识别器"""
+    def __init__(self, model, min_confidence: Optional[float] = None) -> None:
+        super().__init__()
+        self.model = model
+        self.min_confidence = Settings.GESTURE_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        # 特征的线性组合并入模型权重：长度对数 -> 打分只需一次矩阵乘法
+        self._weights = model.input_weights(FEATURE_MIX)
+
+    def recognize(self, lm) -> Tuple[GestureType, Optional[object]]:
+        if lm is None:
+            return GestureType.NONE, None
+        arr = self._to_array(lm)
+        scores = np.dot(log_lengths(arr), self._weights).tolist()
+        gesture = GESTURE_BY_VALUE[self.model.decide(scores, self.min_confidence)]
+        return gesture, gesture_point(gesture, arr)
+
+    @classmethod
+    def recognize_hands(cls, recognizers: List["LearnedGestureRecognizer"],
+                        landmarks: np.ndarray) -> List[Tuple[GestureType, Optional[object]]]:
+        """多只手一次批量推理"""
+        if not recognizers:
+            return []
+        head = recognizers[0]
+        values = head.model.predict(landmark_features(landmarks), head.min_confidence).tolist()
+        results = []
+        for recognizer, arr, value in zip(recognizers, landmarks, values):
+            recognizer.landmarks = arr
+            recognizer._source = arr
+            gesture = GESTURE_BY_VALUE[value]
+            results.append((gesture, gesture_point(gesture, arr)))
+        return results
+
+    def classify_batch(self, landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量识别，返回值与 GestureRecognizer.classify_batch 相同"""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        gestures = self.model.predict(landmark_features(landmarks), self.min_confidence)
+        point_ids = POINT_ID_BY_VALUE[gestures]
+        points = landmarks[np.arange(len(landmarks)), np.maximum(point_ids, 0)]
+        points[point_ids < 0] = np.nan
+        return gestures, points
+
+
+def create_recognizer(engine=None):
+    """根据名称创建识别器：'rules' 或 'learned'（模型不可用时退回规则引擎）"""
+    engine = engine or Settings.GESTURE_ENGINE
+    if engine == "rules":
+        return GestureRecognizer()
+    if engine == "learned":
+        model = get_default_model()
+        return LearnedGestureRecognizer(model) if model is not None else GestureRecognizer()
+    raise ValueError(f"未知的手势识别引擎: {engine}")
@@ -0,0 +1,104 @@
+# gesture/gesture_filter.py
+"""
+手势稳定过滤器
+
+识别器逐帧独立判断手势，手指在关节附近徘徊时结果会在 POINTING / DRAGGING / NONE 之间来回跳变，
+每次跳变都会让 ActionMapper 按下/松开鼠标或重置平滑器与摇杆原点。
+过滤器位于识别器与动作映射之间，只有满足下列条件时才切换输出的手势：
+- 新手势连续出现 enter_frames 帧（可按手势覆盖）
+- 当前手势连续消失 exit_frames 帧
+- 当前手势已保持至少 min_dwell 秒（可按手势设置）
+"""
+import time
+from typing import Optional, Tuple
+
+from config import Settings
+from .gesture_base import GestureType
+from .gesture_recognizer import gesture_point
+
+
+class GestureFilter:
+    def __init__(self, enter_frames=None, exit_frames=None, enter_overrides=None, min_dwell=None):
+        self.enter_frames = Settings.GESTURE_ENTER_FRAMES if enter_frames is None else enter_frames
+        self.exit_frames = Settings.GESTURE_EXIT_FRAMES if exit_frames is None else exit_frames
+        overrides = Settings.GESTURE_ENTER_FRAMES_OVERRIDE if enter_overrides is None else enter_overrides
+        dwell = Settings.GESTURE_MIN_DWELL if min_dwell is None else min_dwell
+        # 配置以手势名称为键，这里转换为 GestureType
+        self._enter = {GestureType[k]: v for k, v in overrides.items()}
+        self._dwell = {GestureType[k]: v for k, v in dwell.items()}
+
+        self.gesture = GestureType.NONE  # 当前输出的稳定手势
+        self.since = None                # 当前手势生效的时间
+        self._candidate = None           # 正在等待生效的候选手势
+        self._candidate_frames = 0
+        self._absent_frames = 0          # 当前手势连续未出现的帧数
+        self._last_raw = None
+
+        self.raw_transitions = 0         # 识别结果的跳变次数
+        self.transitions = 0             # 输出手势的切换次数
+
+    def update(self, gesture: GestureType, info, landmarks=None,
+               timestamp: Optional[float] = None) -> Tuple[GestureType, Optional[object]]:
+        """
+        输入一帧识别结果，返回稳定后的 (手势, 定位点)
+
+        Args:
+            gesture, info: 识别器的输出
+            landmarks: 该帧 (21, 3) 关键点，保持旧手势时用于计算旧手势的定位点
+            timestamp: 采集时间戳，默认取当前时间
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        if self._last_raw is not None and gesture != self._last_raw:
+            self.raw_transitions += 1
+        self._last_raw = gesture
+        if self.since is None:
+            self.since = now
+
+        if gesture == self.gesture:
+            self._absent_frames = 0
+            self._candidate = None
+            self._candidate_frames = 0
+            return gesture, info
+
+        self._absent_frames += 1
+        if gesture == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate = gesture
+            self._candidate_frames = 1
+
+        if (self._candidate_frames >= self._enter.get(gesture, self.enter_frames)
+                and self._absent_frames >= self.exit_frames
+                and now - self.since >= self._dwell.get(self.gesture, 0.0)):
+            self.gesture = gesture
+            self.since = now
+            self.transitions += 1
+            self._absent_frames = 0
+            self._candidate = None
+            self._candidate_frames = 0
+            return gesture, info
+
+        # 保持原手势，定位点取本帧关键点上原手势对应的点
+        held_info = gesture_point(self.gesture, landmarks) if landmarks is not None else None
+        return self.gesture, held_info
+
+    def reset(self):
+        """手丢失后重置为 NONE"""
+        self.gesture = GestureType.NONE
+        self.since = None
+        self._candidate = None
+        self._candidate_frames = 0
+        self._absent_frames = 0
+        self._last_raw = None
+
+    @property
+    def suppressed(self):
+        """被过滤掉的跳变次数"""
+        return max(self.raw_transitions - self.transitions, 0)
+
+    def get_stats(self):
+        return {
+            "raw_transitions": self.raw_transitions,
+            "transitions": self.transitions,
+            "suppressed": self.suppressed,
+        }
@@ -1,74 +1,207 @@
 # gesture/gesture_recognizer.py
 
-import math
 from typing import List, Tuple, Optional
+
+import numpy as np
+from config import Settings
 # from mediapipe.framework.formats.landmark_pb2 import NormalizedLandmarkList
+from vision.landmark_utils import Landmark, landmarks_to_array
 from .gesture_base import GestureType
 
+# 指尖ID: 拇指4, 食指8, 中指12, 无名指16, 小指20
+TIP_IDS = np.array([4, 8, 12, 16, 20])
+# 关节ID: 拇指IP 3, 其他手指PIP [6, 10, 14, 18]
+PIP_IDS = np.array([6, 10, 14, 18])
+# 手势对应的定位点：滚动/音量用手掌中心(中指根9)，鼠标用食指根部(5)
+HAND_CENTER_ID = 9
+CURSOR_ID = 5
+# 手指状态编码为5位整数时各手指的权重 [拇指, 食指, 中指, 无名指, 小指]
+FINGER_BITS = 1 << np.arange(5)
+
+
+def _classify_fingers(thumb, index, middle, ring, pinky) -> GestureType:
+    """手势规则树（单组手指状态），用于生成查找表"""
+    # 1. 滚动状态: 大拇指展开(1) 且 四指弯曲(0)：[1, 0, 0, 0, 0]
+    if thumb == 1 and index == 0 and middle == 0 and ring == 0 and pinky == 0:
+        return GestureType.SCROLL_MODE
+
+    # 2. 音量控制状态: 大拇指展开(1) 且 四指展开(1) -> 五指全开
+    if thumb == 1 and index == 1 and middle == 1 and ring == 1 and pinky == 1:
+        return GestureType.VOLUME_MODE
+
+    # 3. 鼠标控制
+
+    # 鼠标移动：小指伸直，且不是全开(音量模式)
+    if pinky == 1 and not (index == 1 and middle == 1 and thumb == 1):
+        if index == 1:
+            return GestureType.DRAGGING
+        return GestureType.POINTING
+
+    # 左键/右键 (原地操作，小指弯曲)
+    if pinky == 0:
+        if index == 1 and middle == 0 and ring == 0:
+            return GestureType.LEFT_CLICK
+        if index == 0 and middle == 1 and ring == 0:
+            return GestureType.RIGHT_CLICK
+
+    # 默认状态：不做操
+    return GestureType.NONE
+
+
+# 32 种手指状态组合 -> 手势的查找表，识别时只需一次数组索引
+GESTURE_TABLE: List[GestureType] = [
+    _classify_fingers(*((code >> i) & 1 for i in range(5))) for code in range(32)
+]
+GESTURE_CODES = np.array([g.value for g in GESTURE_TABLE], dtype=np.int16)
+# 每种手势使用的定位点ID，-1 表示无定位点
+GESTURE_POINT_IDS = np.array([
+    HAND_CENTER_ID if g in (GestureType.SCROLL_MODE, GestureType.VOLUME_MODE)
+    else CURSOR_ID if g in (GestureType.POINTING, GestureType.DRAGGING)
+    else -1
+    for g in GESTURE_TABLE
+], dtype=np.int16)
+# 手势 -> 定位点ID
+GESTURE_POINT_BY_TYPE = {g: int(i) for g, i in zip(GESTURE_TABLE, GESTURE_POINT_IDS)}
+
+
+def gesture_point(gesture: GestureType, landmarks: np.ndarray) -> Optional[Landmark]:
+    """返回手势在 (21, 3) 关键点上对应的定位点，无定位点的手势返回 None"""
+    point_id = GESTURE_POINT_BY_TYPE.get(gesture, -1)
+    if point_id < 0:
+        return None
+    x, y, z = landmarks[point_id].tolist()
+    return Landmark(x, y, z)
+
+
+def compute_fingers(landmarks: np.ndarray, previous: Optional[np.ndarray] = None,
+                    margin: float = 0.0) -> np.ndarray:
+    """
+    批量计算手指状态 (1:伸直, 0:弯曲)
+
+    Args:
+        landmarks: (..., 21, 3) 关键点数组
+        previous: (..., 5) 上一帧的手指状态，提供时按迟滞比较
+        margin: 迟滞余量，弯曲的手指需超过 +margin 才判为伸直，伸直的手指需低于 -margin 才判为弯曲；
+                也可以是 (..., 1) 数组，为每只手给出各自的余量（没有上一帧状态的手为 0）
+    Returns:
+        (..., 5) uint8 数组 [拇指, 食指, 中指, 无名指, 小指]
+    """
+    x = landmarks[..., 0]
+    y = landmarks[..., 1]
+    # 伸展程度，> 0 表示伸直
+    extension = np.empty(landmarks.shape[:-2] + (5,), dtype=np.float32)
+    # 拇指：指尖(4)相对中指根(9)的水平距离比IP关节(3)更远，视为伸展
+    extension[..., 0] = np.abs(x[..., 4] - x[..., 9]) - np.abs(x[..., 3] - x[..., 9])
+    # 其余四指：指尖y < 关节y (屏幕坐标系向下为正，指尖在上数值小)
+    extension[..., 1:] = y[..., PIP_IDS] - y[..., TIP_IDS[1:]]
+    if previous is None or (np.isscalar(margin) and not margin):
+        return (extension > 0).astype(np.uint8)
+    threshold = np.where(previous, -margin, margin)
+    return (extension > threshold).astype(np.uint8)
+
+
+def fingers_to_codes(fingers: np.ndarray) -> np.ndarray:
+    """将 (..., 5) 手指状态编码为 0-31 的整数"""
+    return fingers @ FINGER_BITS
+
+
 class GestureRecognizer:
     def __init__(self) -> None:
         # 存储5根手指状态：0-拇指, 1-食指, 2-中指, 3-无名指, 4-小指0
-        self.fingers: List[int] = [] 
+        self.fingers: List[int] = []
+        # 当前帧的 (21, 3) 关键点数组，每帧只从 protobuf 转换一次
+        self.landmarks: Optional[np.ndarray] = None
+        self._source = None
+        self._code = 0
+        # 手指伸直判定的迟滞余量，需要连续帧的状态，只用于实时识别
+        self.hysteresis = Settings.FINGER_HYSTERESIS
+
+    def _to_array(self, lm) -> np.ndarray:
+        """转换关键点为数组，同一帧的重复调用直接复用缓存"""
+        if lm is not self._source or self.landmarks is None:
+            self.landmarks = landmarks_to_array(lm)
+            self._source = lm
+        return self.landmarks
 
     def update_fingers_status(self, lm, height: int) -> List[int]:
-        """更新五根手指的状态 (1:伸直, 0:弯曲)"""
-        # 指尖ID: 拇指4, 食指8, 中指12, 无名指16, 小指20
-        # 关节ID: 拇指IP 3, 其他手指PIP [6, 10, 14, 18]
-        tip_ids = [4, 8, 12, 16, 20]
-        finger_status: List[int] = []
-
-        # 1. 判断大拇指 (Thumb)
-        # 逻辑：对于掌心朝向镜头，如果拇指指尖(4)的x坐标 在 小指指根(17) 的外侧（距离更远），视为伸展
-        if abs(lm[4].x - lm[9].x) > abs(lm[3].x - lm[9].x):
-            finger_status.append(1) # 拇指伸直
-        else:
-            finger_status.append(0) # 拇指弯曲
-
-        # 2. 判断其余四指 (Index, Middle, Ring, Pinky)
-        # 逻辑：指尖y < 关节y (屏幕坐标系向下为正，指尖在上数值小)
-        pip_ids = [6, 10, 14, 18]
-        for i in range(1, 5): # 对应 tip_ids[1] 到 tip_ids[4]
-            if lm[tip_ids[i]].y < lm[pip_ids[i-1]].y:
-                finger_status.append(1)
-            else:
-                finger_status.append(0)
-
-        self.fingers = finger_status
-        return finger_status
+        """
+        更新五根手指的状态 (1:伸直, 0:弯曲)
+
+        lm 可以是 NormalizedLandmarkList、其 .landmark 序列、LandmarkList 或 (21, 3) 数组
+        """
+        fingers = compute_fingers(self._to_array(lm), self._previous(), self.hysteresis)
+        self._code = int(fingers_to_codes(fingers))
+        self.fingers = fingers.tolist()
+        return self.fingers
+
+    def _previous(self) -> Optional[np.ndarray]:
+        return np.array(self.fingers, dtype=np.uint8) if self.fingers else None
+
+    def reset(self) -> None:
+        """清空手指状态（手丢失后重新出现时不再沿用旧状态做迟滞比较）"""
+        self.fingers = []
+        self.landmarks = None
+        self._source = None
+        self._code = 0
 
     def recognize(self, lm) -> Tuple[GestureType, Optional[object]]:
-        if not lm:
+        if lm is None:
             return GestureType.NONE, None
 
-        # 解包手指状态 [拇指, 食指, 中指, 无名指, 小指]
-        thumb, index, middle, ring, pinky = self.fingers
-        
-        # 获取手掌中心用于定位 (中指根9)
-        hand_center = lm[9] 
-
-        # 1. 滚动状态: 大拇指展开(1) 且 四指弯曲(0)：[1, 0, 0, 0, 0]
-        if thumb == 1 and index == 0 and middle == 0 and ring == 0 and pinky == 0:
-            return GestureType.SCROLL_MODE, hand_center
-
-        # 2. 音量控制状态: 大拇指展开(1) 且 四指展开(1) -> 五指全开
-        if all(f == 1 for f in self.fingers):
-            return GestureType.VOLUME_MODE, hand_center
-
-        # 3. 鼠标控制
-        
-        # 鼠标移动：小指伸直，且不是全开(音量模式)
-        if pinky == 1 and not (index == 1 and middle == 1 and thumb == 1):
-            cursor_point = lm[5] # 食指根部作为光标源
-            if index == 1:
-                return GestureType.DRAGGING, cursor_point
-            return GestureType.POINTING, cursor_point
-
-        # 左键/右键 (原地操作，小指弯曲)
-        if pinky == 0:
-            if index == 1 and middle == 0 and ring == 0:
-                return GestureType.LEFT_CLICK, None
-            if index == 0 and middle == 1 and ring == 0:
-                return GestureType.RIGHT_CLICK, None
-
-        # 默认状态：不做操
-        return GestureType.NONE, None
\ No newline at end of file
+        if lm is not self._source:
+            self.update_fingers_status(lm, 0)
+        arr = self.landmarks
+        gesture = GESTURE_TABLE[self._code]
+        point_id = GESTURE_POINT_IDS[self._code]
+        if point_id < 0:
+            return gesture, None
+        x, y, z = arr[point_id].tolist()
+        return gesture, Landmark(x, y, z)
+
+    @classmethod
+    def recognize_hands(cls, recognizers: List["GestureRecognizer"],
+                        landmarks: np.ndarray) -> List[Tuple[GestureType, Optional[object]]]:
+        """
+        多只手一次性识别：所有手的手指状态在一次向量化计算中得到，结果写回各自的识别器
+
+        Args:
+            recognizers: 与 landmarks 一一对应的识别器（每只手一个，保存各自的状态）
+            landmarks: (N, 21, 3) 关键点数组
+        Returns:
+            [(GestureType, 定位点)]，顺序与 landmarks 一致
+        """
+        previous = None
+        margin = 0.0
+        if any(r.fingers for r in recognizers):
+            # 每只手用自己的上一帧状态做迟滞比较，新出现（没有历史）的手余量为 0
+            previous = np.array([r.fingers or [0] * 5 for r in recognizers], dtype=np.uint8)
+            margin = np.array([[r.hysteresis if r.fingers else 0.0] for r in recognizers], dtype=np.float32)
+        fingers = compute_fingers(landmarks, previous, margin)
+        codes = fingers_to_codes(fingers).tolist()
+        results = []
+        for recognizer, arr, status, code in zip(recognizers, landmarks, fingers.tolist(), codes):
+            recognizer.landmarks = arr
+            recognizer._source = arr
+            recognizer._code = code
+            recognizer.fingers = status
+            results.append(recognizer.recognize(arr))
+        return results
+
+    @staticmethod
+    def classify_batch(landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量识别手势，用于离线处理录制数据
+
+        Args:
+            landmarks: (N, 21, 3) 关键点数组
+        Returns:
+            gestures: (N,) GestureType.value 数组
+            points: (N, 3) 每帧手势的定位点坐标，无定位点的手势为 NaN
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        codes = fingers_to_codes(compute_fingers(landmarks))
+        gestures = GESTURE_CODES[codes]
+        point_ids = GESTURE_POINT_IDS[codes]
+        points = landmarks[np.arange(len(landmarks)), np.maximum(point_ids, 0)]
+        points[point_ids < 0] = np.nan
+        return gestures, points
@@ -0,0 +1,129 @@
+# gesture/landmark_features.py
+"""
+关键点特征：与手的旋转、大小、左右手镜像无关的几何特征，供学习式手势分类器使用
+
+- 关节弯曲：每根手指相邻两节骨骼 a、b 的 log(|a+b| / |a-b|)（5 指 x 3 个关节），夹角越大值越小
+- 手指张开：相邻手指近节骨骼的同一量（4 个）
+- 归一化距离：手腕与五个指尖两两之间的距离、各指尖到本指根部的距离，除以手掌大小后取对数
+
+所有特征都是若干向量长度的对数的线性组合：features = log_lengths(landmarks) @ FEATURE_MIX。
+所有计算都是对 (..., 21, 3) 数组的批量运算，单帧与批量共用同一份代码。
+"""
+import numpy as np
+from config import Settings
+
+# 每根手指从手腕开始的关键点链 [拇指, 食指, 中指, 无名指, 小指]
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+_BONES = list(zip(FINGER_CHAINS[:, 1:].ravel().tolist(), FINGER_CHAINS[:, :-1].ravel().tolist()))  # (终点, 起点)
+# 夹角的骨骼对：同一手指相邻两节（关节弯曲），相邻手指的近节骨骼（手指张开）
+_ANGLES = [(4 * f + j, 4 * f + j + 1) for f in range(5) for j in range(3)] \
+    + [(4 * f + 1, 4 * f + 5) for f in range(4)]
+# 距离点对：手腕 + 五个指尖两两之间，各指尖到本指根部
+_KEY_POINTS = [0, 4, 8, 12, 16, 20]
+_PAIRS = [(b, a) for i, a in enumerate(_KEY_POINTS) for b in _KEY_POINTS[i + 1:]] \
+    + [(4, 2), (8, 5), (12, 9), (16, 13), (20, 17)]
+_PALM = [(5, 0), (17, 0), (17, 5)]  # 手掌三角形（手腕、食指根、小指根）三边，几何平均边长作为尺度
+
+FEATURE_NAMES = (
+    [f"bend_{f}_{j}" for f in ("thumb", "index", "middle", "ring", "pinky") for j in range(3)]
+    + [f"spread_{k}" for k in range(4)]
+    + [f"dist_{a}_{b}" for b, a in _PAIRS]
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+
+def _build_tables():
+    """
+    用到的向量都是关键点的线性组合，由差分矩阵 _VECTORS 一次矩阵乘法得到；
+    特征是这些向量长度平方的对数的线性组合 (FEATURE_MIX)：
+    - 弯曲/张开：0.5 * (log|a+b|² - log|a-b|²)
+    - 距离：0.5 * log|v|² - 手掌三边 log|e|² 的均值 / 2
+    特征对 log_lengths 是线性的，线性模型可以把 FEATURE_MIX 并入权重，单帧识别只需一次矩阵乘法打分
+    """
+    def bone(k):
+        row = np.zeros(21)
+        to, frm = _BONES[k]
+        row[to] += 1.0
+        row[frm] -= 1.0
+        return row
+
+    rows = []
+    mix = []  # (行号, 特征号, 系数)
+    for k, (a, b) in enumerate(_ANGLES):
+        mix += [(len(rows), k, 0.5), (len(rows) + 1, k, -0.5)]
+        rows += [bone(a) + bone(b), bone(a) - bone(b)]
+    palm_rows = []
+    for to, frm in _PALM:
+        palm_rows.append(len(rows))
+        row = np.zeros(21)
+        row[to], row[frm] = 1.0, -1.0
+        rows.append(row)
+    for k, (to, frm) in enumerate(_PAIRS, start=len(_ANGLES)):
+        mix.append((len(rows), k, 0.5))
+        mix += [(r, k, -0.5 / len(palm_rows)) for r in palm_rows]
+        row = np.zeros(21)
+        row[to], row[frm] = 1.0, -1.0
+        rows.append(row)
+
+    vectors = np.array(rows, dtype=np.float32)
+    feature_mix = np.zeros((len(rows), NUM_FEATURES), dtype=np.float32)
+    for r, k, c in mix:
+        feature_mix[r, k] += c
+    return vectors, feature_mix
+
+
+_VECTORS, FEATURE_MIX = _build_tables()
+# 特征定义变化时加一，旧版本特征训练的模型需要重新训练
+FEATURE_VERSION = 2
+
+
+_axis_weights = (None, None)  # (宽高比, 长度平方的各轴权重 [aspect², 1, aspect²])
+
+
+def _axis_scale():
+    global _axis_weights
+    aspect = Settings.CAP_WIDTH / Settings.CAP_HEIGHT
+    if _axis_weights[0] != aspect:
+        _axis_weights = (aspect, np.array([aspect * aspect, 1.0, aspect * aspect], dtype=np.float32))
+    return _axis_weights[1]
+
+
+def log_lengths(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Args:
+        landmarks: (..., 21, 3) 归一化关键点（x/y 为画面比例坐标，z 与 x 同尺度）
+    Returns:
+        (..., 向量数) float32，_VECTORS 各向量长度平方的对数
+    """
+    # x 与 z 换算到与 y 相同的像素比例，避免画面宽高比扭曲角度：缩放并入长度平方的各轴权重，不再单独缩放关键点
+    weights = _axis_scale()
+    points = np.asarray(landmarks, dtype=np.float32)
+    if points.ndim == 2:
+        # 单帧是实时路径，耗时几乎全是 NumPy 调用开销：np.dot 比 @ / einsum 少一层分派
+        vectors = np.dot(_VECTORS, points)
+        vectors *= vectors
+        sq = np.dot(vectors, weights)
+    else:
+        # 批量时合并为一次大矩阵乘法，比逐帧的小矩阵 matmul 快得多
+        vectors = np.tensordot(points, _VECTORS, axes=([-2], [1]))  # (..., 3, 向量数)
+        vectors *= vectors
+        sq = np.einsum("...ji,j->...i", vectors, weights)
+    # 重合的关键点长度为 0，加一个极小量避免 log(0)
+    sq += 1e-12
+    return np.log(sq, out=sq)
+
+
+def landmark_features(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Args:
+        landmarks: (..., 21, 3) 归一化关键点
+    Returns:
+        (..., NUM_FEATURES) float32 特征
+    """
+    return np.dot(log_lengths(landmarks), FEATURE_MIX)
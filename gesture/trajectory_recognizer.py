@@ -0,0 +1,116 @@
+# gesture/trajectory_recognizer.py
+"""
+轨迹手势识别
+
+GestureRecognizer 只看单帧姿态，ActionMapper 也只保留上一帧的位置，无法识别挥动、推拉等需要一段轨迹的手势。
+TrajectoryRecognizer 为每只手维护固定容量的关键点历史 (utils.landmark_history)，
+手处于 Settings.TRAJECTORY_POSES 中的姿态时在最近的时间窗口上计算：
+
+- 挥动 (SWIPE_*)：手掌中心在 SWIPE_WINDOW 内位移足够大且轨迹接近直线，按主方向输出
+- 缩放 (ZOOM_IN/ZOOM_OUT)：手掌大小在 ZOOM_WINDOW 内明显变大/变小（手推向/远离摄像头），且手掌中心基本不动
+  （位移不超过手掌大小的 ZOOM_MAX_DRIFT 倍）
+
+输出为单帧事件，触发后进入冷却；每帧只做常数次数组访问，与会话时长无关。
+"""
+import math
+import time
+from typing import Optional
+
+from config import Settings
+from utils.landmark_history import LandmarkHistory
+from .gesture_base import GestureType
+from .gesture_recognizer import HAND_CENTER_ID
+
+SWIPE_GESTURES = (GestureType.SWIPE_LEFT, GestureType.SWIPE_RIGHT, GestureType.SWIPE_UP, GestureType.SWIPE_DOWN)
+ZOOM_GESTURES = (GestureType.ZOOM_IN, GestureType.ZOOM_OUT)
+TRAJECTORY_GESTURES = frozenset(SWIPE_GESTURES + ZOOM_GESTURES)
+
+# 手掌三角形（手腕、食指根、小指根），平均边长作为手掌大小
+_PALM_POINTS = (0, 5, 17)
+
+
+class TrajectoryRecognizer:
+    def __init__(self, history=None):
+        self.history = history if history is not None else LandmarkHistory(Settings.TRAJECTORY_HISTORY)
+        self.poses = {GestureType[name] for name in Settings.TRAJECTORY_POSES}
+        self.enable_swipe = Settings.ENABLE_SWIPE
+        self.enable_zoom = Settings.ENABLE_ZOOM
+        # x 换算到与 y 相同的像素比例，水平与垂直方向的距离阈值一致
+        self.aspect = Settings.CAP_WIDTH / Settings.CAP_HEIGHT
+        self.events = 0              # 输出的轨迹手势数
+        self._pose_since = None      # 进入允许姿态的时间，窗口不早于该时间
+        self._cooldown_until = 0.0
+
+    def reset(self):
+        self.history.clear()
+        self._pose_since = None
+        self._cooldown_until = 0.0
+
+    def update(self, landmarks, gesture: GestureType, timestamp=None) -> Optional[GestureType]:
+        """
+        写入一帧并检测轨迹手势
+
+        Args:
+            landmarks: (21, 3) 当前帧关键点
+            gesture: 当前帧（经过稳定过滤的）姿态手势
+            timestamp: 采集时间戳
+        Returns:
+            触发的轨迹手势，没有时返回 None
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        self.history.append(landmarks, now)
+        if gesture not in self.poses:
+            self._pose_since = None
+            return None
+        if self._pose_since is None:
+            self._pose_since = now
+        if now < self._cooldown_until:
+            return None
+
+        event = None
+        if self.enable_swipe:
+            event = self._detect_swipe()
+        if event is None and self.enable_zoom:
+            event = self._detect_zoom()
+        if event is not None:
+            self.events += 1
+            self._cooldown_until = now + Settings.TRAJECTORY_COOLDOWN
+            self._pose_since = now  # 之后的窗口不再包含这次动作的轨迹
+        return event
+
+    def _detect_swipe(self):
+        delta, elapsed = self.history.displacement(HAND_CENTER_ID, Settings.SWIPE_WINDOW, self._pose_since)
+        if delta is None or elapsed <= 0:
+            return None
+        dx, dy = float(delta[0]) * self.aspect, float(delta[1])
+        if math.hypot(dx, dy) < Settings.SWIPE_MIN_DISTANCE:
+            return None
+        path = self.history.path_length(HAND_CENTER_ID, Settings.SWIPE_WINDOW, self._pose_since)
+        if path <= 0 or math.hypot(float(delta[0]), dy) / path < Settings.SWIPE_MIN_STRAIGHTNESS:
+            return None
+        if abs(dx) >= abs(dy):
+            return GestureType.SWIPE_RIGHT if dx > 0 else GestureType.SWIPE_LEFT
+        return GestureType.SWIPE_DOWN if dy > 0 else GestureType.SWIPE_UP
+
+    def _palm(self, arr):
+        """手掌三角形的 (中心 x, 中心 y, 平均边长)，x 已换算到画面高度比例"""
+        xs = [float(arr[i, 0]) * self.aspect for i in _PALM_POINTS]
+        ys = [float(arr[i, 1]) for i in _PALM_POINTS]
+        size = sum(math.hypot(xs[a] - xs[b], ys[a] - ys[b]) for a, b in ((0, 1), (0, 2), (1, 2))) / 3
+        return sum(xs) / 3, sum(ys) / 3, size
+
+    def _detect_zoom(self):
+        _, landmarks = self.history.window(Settings.ZOOM_WINDOW, self._pose_since)
+        if len(landmarks) < 3:
+            return None
+        x0, y0, first = self._palm(landmarks[0])
+        x1, y1, last = self._palm(landmarks[-1])
+        if first <= 0:
+            return None
+        ratio = last / first
+        if 1.0 / Settings.ZOOM_MIN_RATIO < ratio < Settings.ZOOM_MIN_RATIO:
+            return None
+        # 手掌中心的位移按手掌大小归一化：推拉时手掌中心基本不动，挥动时位移为手掌大小的数倍
+        if math.hypot(x1 - x0, y1 - y0) > Settings.ZOOM_MAX_DRIFT * max(first, last):
+            return None
+        return GestureType.ZOOM_IN if ratio > 1.0 else GestureType.ZOOM_OUT
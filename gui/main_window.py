@@ -5,6 +5,8 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, pyqtSlot
 from PyQt5.QtGui import QFont
 from config import Settings
+from utils.config_store import ConfigStore
+from utils.startup import preload_detector
 from .qt_utils import CV2QtConverter, WorkerThread
 import numpy as np
 
@@ -15,6 +17,8 @@ class GestureControlWindow(QMainWindow):
         self.setWindowTitle("手势控制系统 - GUI版")
         self.setFixedSize(Settings.GUI_WIDTH, Settings.GUI_HEIGHT)
         self.worker = None  # 手势识别线程
+        self.config_store = ConfigStore()  # 滑块参数快照，工作线程每帧检查版本号
+        self.detector_task = None  # 后台预加载的手部检测器 (BackgroundTask)
         self.init_ui()
         self.init_status_bar()
 
@@ -96,9 +100,11 @@ class GestureControlWindow(QMainWindow):
         self.status_labels = {
             "fps": QLabel("0"),
             "gesture": QLabel("NONE"),
-            "camera": QLabel(f"{Settings.CAP_WIDTH}x{Settings.CAP_HEIGHT}")
+            "camera": QLabel(f"{Settings.CAP_WIDTH}x{Settings.CAP_HEIGHT}"),
+            "latency": QLabel("-")
         }
-        status_items = [("当前FPS", "fps"), ("识别手势", "gesture"), ("摄像头分辨率", "camera")]
+        status_items = [("当前FPS", "fps"), ("识别手势", "gesture"), ("摄像头分辨率", "camera"),
+                        ("端到端延迟 p50/p95/p99", "latency")]
         for row, (name, key) in enumerate(status_items):
             status_layout.addWidget(QLabel(name), row, 0)
             status_layout.addWidget(self.status_labels[key], row, 1)
@@ -149,9 +155,23 @@ class GestureControlWindow(QMainWindow):
             real_val = value
         # 更新显示
         self.param_sliders[param]["label"].setText(f"{real_val}")
-        # 同步到工作线程
-        if self.worker and self.worker.isRunning():
-            self.worker.set_params({param: real_val})
+        # 发布新的参数快照，工作线程在下一帧应用
+        self.config_store.publish(**{param: real_val})
+
+    def preload(self):
+        """在后台构造并预热手部检测器，供下一次启动直接使用"""
+        if self.detector_task is None:
+            self.detector_task = preload_detector()
+
+    def release_preload(self, timeout=5.0):
+        """关闭尚未使用的预加载检测器（等待其加载完成，以便释放子进程与共享内存）"""
+        task, self.detector_task = self.detector_task, None
+        if task is None:
+            return
+        try:
+            task.result(timeout).close()
+        except Exception:
+            pass
 
     def start_system(self):
         """启动手势识别系统"""
@@ -159,11 +179,12 @@ class GestureControlWindow(QMainWindow):
             QMessageBox.information(self, "提示", "系统已在运行中！")
             return
         # 初始化工作线程
-        self.worker = WorkerThread()
-        self.worker.frame_signal.connect(self.update_video)
+        self.worker = WorkerThread(self.config_store, detector_task=self.detector_task)
+        self.detector_task = None
+        self.worker.preview_signal.connect(self.update_video)
         self.worker.status_signal.connect(self.update_status)
         self.worker.error_signal.connect(self.show_error)
-        # 传递初始参数
+        # 以滑块当前值发布初始参数快照
         init_params = {}
         for param in Settings.PARAM_RANGES:
             min_val = Settings.PARAM_RANGES[param][0]
@@ -171,7 +192,7 @@ class GestureControlWindow(QMainWindow):
                 init_params[param] = round(int(self.param_sliders[param]["slider"].value())/100, 2)
             else:
                 init_params[param] = self.param_sliders[param]["slider"].value()
-        self.worker.set_params(init_params)
+        self.config_store.publish(**init_params)
         # 启动线程
         self.worker.start()
         # 更新UI状态
@@ -191,16 +212,22 @@ class GestureControlWindow(QMainWindow):
             self.start_btn.setEnabled(True)
             self.stop_btn.setEnabled(False)
             self.status_bar.showMessage("系统已停止，点击「启动系统」重新开始", 0)
+            self.preload()
             # 重置状态显示
-            for label in self.status_labels.values():
-                if label.text() != f"{Settings.CAP_WIDTH}x{Settings.CAP_HEIGHT}":
+            for key, label in self.status_labels.items():
+                if key == "latency":
+                    label.setText("-")
+                elif label.text() != f"{Settings.CAP_WIDTH}x{Settings.CAP_HEIGHT}":
                     label.setText("0" if label.text().isdigit() else "NONE")
 
-    @pyqtSlot(np.ndarray)
-    def update_video(self, cv_img):
-        """更新实时画面"""
-        pixmap = CV2QtConverter.cv2pixmap(cv_img, Settings.VIDEO_DISPLAY_SIZE)
-        self.video_label.setPixmap(pixmap)
+    @pyqtSlot()
+    def update_video(self):
+        """更新实时画面（从工作线程的预览双缓冲区读取）"""
+        if self.worker is None:
+            return
+        pixmap = self.worker.preview.to_pixmap()
+        if pixmap is not None:
+            self.video_label.setPixmap(pixmap)
 
     @pyqtSlot(dict)
     def update_status(self, status):
@@ -222,8 +249,10 @@ class GestureControlWindow(QMainWindow):
                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
                 self.stop_system()
+                self.release_preload()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.release_preload()
             event.accept()
\ No newline at end of file
@@ -1,8 +1,12 @@
 # gui/qt_utils.py
-import cv2
+import threading
+import time
+
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 import numpy as np
+from config import Settings
+from pipeline.engine import Stage
 
 class CV2QtConverter:
     """OpenCV画面转PyQt5可用格式"""
@@ -15,6 +19,7 @@ class CV2QtConverter:
         """
         if cv_img is None or cv_img.size == 0:
             return QPixmap()
+        import cv2
         # BGR转RGB
         rgb_img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
         h, w, ch = rgb_img.shape
@@ -26,86 +31,229 @@ class CV2QtConverter:
             q_img = q_img.scaled(size[0], size[1], aspectRatioMode=1)
         return QPixmap.fromImage(q_img)
 
+    @staticmethod
+    def rgb2pixmap(rgb_img):
+        """
+        rgb_img: 已缩放到显示尺寸的RGB图像（连续内存）
+        return: QPixmap（fromImage 会复制数据，返回后可以复用 rgb_img）
+        """
+        h, w, ch = rgb_img.shape
+        q_img = QImage(rgb_img.data, w, h, ch * w, QImage.Format_RGB888)
+        return QPixmap.fromImage(q_img)
+
+
+class PreviewBuffer:
+    """
+    工作线程 -> GUI 的预览双缓冲区
+
+    - 两块预分配的RGB缓冲区：工作线程写后台缓冲区，GUI读前台缓冲区，每帧不分配新数组
+    - 缩放与BGR->RGB转换都通过 OpenCV 的 dst 参数写入预分配内存，先缩放再转换，只转换显示尺寸的像素
+    - 预览帧率独立于处理帧率；GUI还没取走上一帧时直接丢弃新帧，信号不会在GUI线程排队堆积
+    """
+    def __init__(self, display_size, max_fps=None):
+        self.display_size = display_size
+        self.interval = 1.0 / (max_fps or Settings.PREVIEW_FPS)
+        self._buffers = None
+        self._scaled = None
+        self._src_shape = None
+        self._front = 0
+        self._pending = False      # 前台缓冲区已发布、GUI尚未取走
+        self._last_publish = 0.0
+        self._lock = threading.Lock()
+        self.published = 0         # 发布给GUI的帧数
+        self.dropped = 0           # GUI处理不过来而丢弃的帧数
+
+    def set_max_fps(self, max_fps):
+        """修改预览帧率上限（工作线程调用）"""
+        self.interval = 1.0 / max_fps
+
+    def _allocate(self, shape):
+        """按源画面尺寸计算保持宽高比的显示尺寸，并分配缓冲区"""
+        src_h, src_w = shape[:2]
+        scale = min(self.display_size[0] / src_w, self.display_size[1] / src_h)
+        w, h = max(1, int(src_w * scale)), max(1, int(src_h * scale))
+        self._buffers = [np.empty((h, w, 3), dtype=np.uint8) for _ in range(2)]
+        self._scaled = None if (w, h) == (src_w, src_h) else np.empty((h, w, 3), dtype=np.uint8)
+        self._src_shape = shape
+
+    def publish(self, frame, now=None):
+        """
+        工作线程调用：按帧率上限把画面 (Frame 或 BGR 图像) 写入后台缓冲区并交换到前台
+
+        Returns:
+            True 表示有新帧可供GUI读取（应发送通知信号）
+        """
+        now = time.perf_counter() if now is None else now
+        if now - self._last_publish < self.interval:
+            return False
+        if self._pending:
+            self.dropped += 1
+            return False
+        import cv2
+        from vision.frame import Frame
+        bgr_img = frame.image if isinstance(frame, Frame) else frame
+        if self._src_shape != bgr_img.shape:
+            self._allocate(bgr_img.shape)
+
+        back = self._buffers[1 - self._front]
+        if self._scaled is None:
+            cv2.cvtColor(bgr_img, cv2.COLOR_BGR2RGB, dst=back)
+        else:
+            h, w = back.shape[:2]
+            cv2.resize(bgr_img, (w, h), dst=self._scaled, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._scaled, cv2.COLOR_BGR2RGB, dst=back)
+
+        with self._lock:
+            self._front = 1 - self._front
+            self._pending = True
+        self._last_publish = now
+        self.published += 1
+        return True
+
+    def to_pixmap(self):
+        """GUI线程调用：把前台缓冲区转换为QPixmap并释放缓冲区"""
+        with self._lock:
+            if not self._pending:
+                return None
+            front = self._buffers[self._front]
+        pixmap = CV2QtConverter.rgb2pixmap(front)
+        with self._lock:
+            self._pending = False
+        return pixmap
+
+class QtDisplayStage(Stage):
+    """GUI 的显示出口：按预览帧率发布画面并发送预览/状态信号（GUI 来不及处理时丢帧）"""
+    name = "display"
+
+    def __init__(self, worker, hands, profiler, started, **kwargs):
+        super().__init__(**kwargs)
+        self.worker = worker
+        self.hands = hands
+        self.profiler = profiler
+        self.started = started  # 点击启动的时间，用于首帧启动耗时报告
+
+    def process(self, ctx):
+        from utils.latency_profiler import E2E_ACTION
+        from utils.logger import log
+        from utils.startup import report
+        worker, profiler = self.worker, self.profiler
+        if report.first_frame(since=self.started):
+            log("启动耗时 (首帧从点击启动开始计时):\n" + report.format())
+        if ctx.frame is not None and worker.preview.publish(ctx.frame):
+            worker.preview_signal.emit()
+            img = ctx.frame.image
+            latency = profiler.percentiles(E2E_ACTION) if profiler.frame_count % Settings.FPS == 0 else None
+            status = {
+                "fps": int(profiler.fps()),
+                "gesture": self.hands.primary.gesture.name if self.hands.primary else "NONE",
+                "camera": f"{img.shape[1]}x{img.shape[0]}"
+            }
+            if latency is not None:
+                status["latency"] = f"{latency[0]:.1f} / {latency[1]:.1f} / {latency[2]:.1f} ms"
+            worker.status_signal.emit(status)
+        profiler.mark("display")
+        return ctx
+
+
 class WorkerThread(QThread):
-    """手势识别线程"""
-    frame_signal = pyqtSignal(np.ndarray)  # 画面信号
+    """手势识别线程：组装并运行 pipeline.engine.Pipeline，阶段的执行位置由 Settings.PIPELINE_PLACEMENT 配置"""
+    preview_signal = pyqtSignal()          # 预览画面就绪信号（画面在 self.preview 中）
     status_signal = pyqtSignal(dict)       # 状态信号（FPS、手势、参数）
     error_signal = pyqtSignal(str)         # 错误信号
 
-    def __init__(self, parent=None):
+    def __init__(self, config_store, parent=None, detector_task=None):
         super().__init__(parent)
+        self.config_store = config_store    # GUI 发布参数快照的 utils.config_store.ConfigStore
+        self.detector_task = detector_task  # 后台预加载的检测器 (utils.startup.BackgroundTask)，None 时在线程内加载
         self.running = False  # 线程运行标志
-        self.params = {}      # 从GUI传入的实时参数
-
-    def set_params(self, params):
-        """更新从GUI调节的参数"""
-        self.params.update(params)
+        self.pipeline = None
+        self.preview = PreviewBuffer(Settings.VIDEO_DISPLAY_SIZE)  # 预览双缓冲区
 
     def run(self):
         try:
+            started = time.perf_counter()
             from config import Settings
             from vision.camera import Camera
-            from vision.hand_detector import HandDetector
-            from gesture.gesture_recognizer import GestureRecognizer
-            from pipeline.action_mapper import ActionMapper
-            from utils.fps_counter import FpsCounter
+            from vision.landmark_recorder import LandmarkRecorder
+            from pipeline.engine import Pipeline, parse_placement
+            from pipeline.hand_manager import HandManager
+            from pipeline.quality_controller import QualityController
+            from pipeline.stages import (CaptureStage, DetectStage, RecognizeStage, OverlayStage, QualityStage,
+                                         TelemetryStage, apply_placement)
+            from utils.latency_profiler import LatencyProfiler
             from utils.logger import log
+            from utils.metrics import MetricsServer, collect_pipeline_metrics
+            from utils.startup import load_detector, report
 
             # 初始化核心模块
-            camera = Camera()
-            detector = HandDetector()
-            recognizer = GestureRecognizer()
-            mapper = ActionMapper()
-            fps_counter = FpsCounter()
+            with report.phase("camera_open"):
+                camera = Camera()
+            profiler = LatencyProfiler(window=Settings.PROFILER_WINDOW, enabled=Settings.ENABLE_PROFILER)
+            recorder = LandmarkRecorder(Settings.LANDMARK_RECORD_PATH) if Settings.LANDMARK_RECORD_PATH else None
+            with report.phase("detector_wait"):
+                if self.detector_task is not None:
+                    detector = self.detector_task.result()
+                    detector.recorder, detector.profiler = recorder, profiler
+                else:
+                    detector = load_detector(recorder, profiler)
+                self.detector_task = None
+            with report.phase("hand_manager"):
+                hands = HandManager(profiler=profiler, config=self.config_store.current)
+            quality = QualityController(camera, detector, self.preview) if Settings.ADAPTIVE_QUALITY else None
+
+            capture = CaptureStage(camera, profiler)
+            stages = [
+                capture,
+                DetectStage(detector),
+                # GUI 调节的参数：版本号变化时才应用新快照
+                RecognizeStage(hands, detector, profiler, config_store=self.config_store),
+                OverlayStage(profiler),
+                QtDisplayStage(self, hands, profiler, started),
+            ]
+            if quality is not None:
+                stages.append(QualityStage(quality))
+            if Settings.TELEMETRY_PATH:
+                stages.append(TelemetryStage(Settings.TELEMETRY_PATH, [s.name for s in stages], profiler, hands))
+            apply_placement(stages, parse_placement(Settings.PIPELINE_PLACEMENT),
+                            Settings.PIPELINE_QUEUE_SIZE, Settings.PIPELINE_DROP_POLICY)
+            self.pipeline = Pipeline(stages, profiler, name="gui")
+            metrics = None
+            if Settings.METRICS_PORT is not None:
+                metrics = MetricsServer(lambda: collect_pipeline_metrics(profiler, self.pipeline, camera, hands, quality),
+                                        Settings.METRICS_PORT)
             self.running = True
             log("GUI版手势控制系统启动")
 
-            while self.running:
-                # 读取画面
-                success, img = camera.read()
-                if not success:
+            try:
+                self.pipeline.run()
+            finally:
+                # stop() 先清除 running 再停止流水线，此时的读取失败不是错误
+                if capture.failed and self.running:
                     self.error_signal.emit("摄像头读取失败")
-                    break
-
-                # 动态更新配置（从GUI传入）
-                for k, v in self.params.items():
-                    if hasattr(Settings, k.upper()):
-                        setattr(Settings, k.upper(), v)
-                    # 同步更新动作映射器的平滑系数
-                    if k == "smoothing_factor" and hasattr(mapper, "smoother"):
-                        mapper.smoother.smoothing_factor = v
-                    if k == "accel_factor" and hasattr(Settings, "ACCEL_FACTOR"):
-                        Settings.ACCEL_FACTOR = v
-
-                # 手部检测与手势识别
-                img = detector.find_hands(img)
-                lm_list = detector.get_landmarks()
-                gesture_type = None
-                if lm_list:
-                    landmarks = lm_list.landmark
-                    recognizer.update_fingers_status(landmarks, Settings.CAP_HEIGHT)
-                    gesture_type, info = recognizer.recognize(landmarks)
-                    mapper.execute(gesture_type, info)
-                    # 绘制手势信息
-                    cv2.putText(img, f"Gesture: {gesture_type.name}", (10, 50),
-                                cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
-
-                # 计算FPS并绘制
-                fps = fps_counter.update()
-                cv2.putText(img, f"FPS: {fps}", (10, 20),
-                            cv2.FONT_HERSHEY_PLAIN, 1, (255, 0, 0), 1)
-
-                # 发送信号到UI
-                self.frame_signal.emit(img)
-                self.status_signal.emit({
-                    "fps": fps,
-                    "gesture": gesture_type.name if gesture_type else "NONE",
-                    "camera": f"{Settings.CAP_WIDTH}x{Settings.CAP_HEIGHT}"
-                })
-
-            # 释放资源
-            camera.release()
-            log("GUI版手势控制系统停止")
+                self.running = False
+                if metrics is not None:
+                    metrics.close()
+                # 释放资源
+                stats = camera.get_stats()
+                log(f"采集统计: 总帧数={stats['captured']} 丢弃={stats['dropped']} 过期={stats['stale']} "
+                    f"超时={stats['timeouts']}")
+                log("延迟统计:\n" + profiler.format_summary())
+                log("流水线统计:\n" + self.pipeline.format_stats())
+                log(f"检测统计: {detector.get_stats()}")
+                if quality is not None:
+                    log(f"画质统计: {quality.get_stats()}")
+                log(f"预览统计: 发布={self.preview.published} 丢弃={self.preview.dropped}")
+                log(f"多手统计: {hands.get_stats()}")
+                hands.close()
+                log(f"输入执行统计: {hands.actuator.get_stats()}")
+                camera.release()
+                detector.close()
+                telemetry = next((s.writer for s in stages if isinstance(s, TelemetryStage)), None)
+                if telemetry is not None:
+                    log(f"遥测统计: {telemetry.get_stats()}")
+                if recorder is not None:
+                    log(f"关键点录制完成: {recorder.frame_count} 帧 -> {recorder.save()}")
+                log("GUI版手势控制系统停止")
         except Exception as e:
             self.error_signal.emit(f"程序运行错误: {str(e)}")
             self.running = False
@@ -113,4 +261,6 @@ class WorkerThread(QThread):
     def stop(self):
         """停止线程"""
         self.running = False
-        self.wait()
\ No newline at end of file
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        self.wait()
@@ -1,16 +1,19 @@
 # gui_main.py
 
-import mediapipe as mp
-import cv2
+from utils.startup import report  # 最先导入：启动计时从这里开始
 
 import sys
 from PyQt5.QtWidgets import QApplication
 from gui.main_window import GestureControlWindow
 
 if __name__ == "__main__":
+    report.mark("imports")
 
     QApplication.setStyle("Fusion")
     app = QApplication(sys.argv)
     window = GestureControlWindow()
     window.show()
+    report.mark("window")
+    # 界面显示后在后台加载并预热手部检测模型，点击启动时通常已经就绪
+    window.preload()
     sys.exit(app.exec_())
\ No newline at end of file
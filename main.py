@@ -1,66 +1,330 @@
 # hand_gesture_control/main.py
+"""
+命令行入口
 
-import cv2
+    python main.py                                  # 摄像头 + 预览窗口
+    python main.py --headless                       # 无窗口：不绘制、不调用 imshow/waitKey，定期输出统计
+    python main.py --headless --preview-dir out     # 无窗口，每秒把一帧带标注的画面写到 out/preview.jpg
+    python main.py --headless --source video.avi    # 视频文件作为输入（逐帧处理，不按原始帧率限速）
+    python main.py --headless --replay rec_dir      # 回放 LandmarkRecorder 录制的关键点，不需要摄像头和 MediaPipe
+    python main.py --adaptive-quality               # 按实测耗时自动调整分辨率/模型复杂度/预览帧率，保持目标帧率
+    python main.py --placement detect=thread        # 检测在独立线程中执行，与采集/识别重叠（见 pipeline.engine）
+    python main.py --headless --telemetry run.csv --metrics-port 9108
+                                                    # 逐帧遥测写入 run.csv（轮转），http://127.0.0.1:9108/metrics 提供指标
+
+Ctrl+C / SIGTERM 时处理完当前帧后正常退出并输出统计。
+同一视频分别用窗口模式和 --headless 运行，对比退出时的吞吐量与 overlay/display 阶段耗时即可得到无窗口模式的收益。
+"""
+from utils.startup import BackgroundTask, load_detector, report  # 最先导入：启动计时从这里开始
+import argparse
+import os
+import signal
+import threading
 import time
+
+import cv2
+import numpy as np
 from config import Settings
 from vision.camera import Camera
-from vision.hand_detector import HandDetector
-from gesture.gesture_recognizer import GestureRecognizer
-from pipeline.action_mapper import ActionMapper
-from utils.fps_counter import FpsCounter
-from utils.logger import log
+from vision.landmark_recorder import LandmarkRecorder, ReplayHandDetector
+from vision.landmark_utils import draw_landmark_array
+from pipeline.engine import BLOCK, EndOfStream, Pipeline, Stage, parse_placement
+from pipeline.hand_manager import HandManager
+from pipeline.quality_controller import QualityController
+from pipeline.stages import (CaptureStage, DetectStage, OverlayStage, QualityStage, RecognizeStage, TelemetryStage,
+                             apply_placement, draw_overlay)
+from utils.latency_profiler import E2E_ACTION, LatencyProfiler
+from utils.logger import log, setup_logging
+from utils.metrics import MetricsServer, collect_pipeline_metrics
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="手势控制系统")
+    parser.add_argument("--headless", action="store_true", help="无窗口模式：不绘制关键点与文字，不创建 HighGUI 窗口")
+    parser.add_argument("--source", help="摄像头编号或视频文件路径，默认 Settings.CAMERA_ID")
+    parser.add_argument("--realtime", action="store_true", help="视频文件按原始帧率播放（默认逐帧尽快处理）")
+    parser.add_argument("--replay", metavar="DIR", help="回放 LandmarkRecorder 录制目录，代替摄像头与检测器")
+    parser.add_argument("--backend", choices=("auto", "win32", "pyautogui", "recording"),
+                        help="输入后端，默认 Settings.ACTUATOR_BACKEND（回放时默认 recording，不操作真实鼠标键盘）")
+    parser.add_argument("--preview-dir", metavar="DIR", help="无窗口模式下定期写入 preview.jpg 的目录")
+    parser.add_argument("--preview-interval", type=float, default=1.0, help="预览图写入间隔 (秒)")
+    parser.add_argument("--stats-interval", type=float, help="统计输出间隔 (秒)，0 表示不输出；无窗口模式默认 5")
+    parser.add_argument("--adaptive-quality", action="store_true", default=None,
+                        help="启用自适应画质，默认 Settings.ADAPTIVE_QUALITY")
+    parser.add_argument("--placement", default=Settings.PIPELINE_PLACEMENT,
+                        help="流水线阶段的执行位置，如 detect=thread,display=thread（inline/thread/asyncio）")
+    parser.add_argument("--max-frames", type=int, default=0, help="处理指定帧数后退出，0 表示不限")
+    parser.add_argument("--log-level", default=Settings.LOG_LEVEL, choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="日志级别，默认 Settings.LOG_LEVEL")
+    parser.add_argument("--log-format", default=Settings.LOG_FORMAT, choices=("text", "json"), help="日志格式")
+    parser.add_argument("--telemetry", metavar="CSV", default=Settings.TELEMETRY_PATH,
+                        help="逐帧遥测输出文件（按大小轮转），默认 Settings.TELEMETRY_PATH")
+    parser.add_argument("--metrics-port", type=int, default=Settings.METRICS_PORT,
+                        help="在 127.0.0.1 的该端口提供 Prometheus 格式的 /metrics，默认 Settings.METRICS_PORT")
+    args = parser.parse_args(argv)
+    if args.adaptive_quality is None:
+        args.adaptive_quality = Settings.ADAPTIVE_QUALITY
+    if args.stats_interval is None:
+        args.stats_interval = 5.0 if args.headless else 0.0
+    return args
+
+
+def install_signal_handlers(stop):
+    """SIGINT/SIGTERM 只调用 stop()，由流水线在帧边界退出"""
+    requested = []
+
+    def handler(signum, _frame):
+        if not requested:
+            log(f"收到信号 {signal.Signals(signum).name}，正在退出...")
+        requested.append(signum)
+        stop()
+
+    signal.signal(signal.SIGINT, handler)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, handler)
+
+
+class PreviewWriter:
+    """无窗口模式的低频预览：按间隔把带关键点与文字标注的画面写成 JPEG（先写临时文件再替换，读者不会读到半个文件）"""
+    def __init__(self, directory, interval):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "preview.jpg")
+        self._tmp = os.path.join(directory, ".preview.tmp.jpg")
+        self.interval = interval
+        self.next_time = 0.0
+        self.written = 0
+        self._canvas = None  # 回放模式没有画面，在空白画布上绘制
+
+    def due(self, now):
+        return now >= self.next_time
+
+    def write(self, img, landmarks, states, fps, now):
+        if img is None:
+            if self._canvas is None:
+                self._canvas = np.zeros((Settings.CAP_HEIGHT, Settings.CAP_WIDTH, 3), dtype=np.uint8)
+            img = self._canvas
+            img[...] = 0
+        for arr in landmarks:
+            draw_landmark_array(img, arr)
+        draw_overlay(img, states, fps)
+        if cv2.imwrite(self._tmp, img, [cv2.IMWRITE_JPEG_QUALITY, 80]):
+            os.replace(self._tmp, self.path)
+            self.written += 1
+        self.next_time = now + self.interval
+
+
+class DisplayRate:
+    """窗口模式的画面刷新帧率上限，由自适应画质控制（降档时减少 imshow 次数）"""
+    def __init__(self, max_fps=None):
+        self.interval = 1.0 / max_fps if max_fps else 0.0
+        self.next_time = 0.0
+
+    def set_max_fps(self, max_fps):
+        self.interval = 1.0 / max_fps
+
+    def due(self, now):
+        if now < self.next_time:
+            return False
+        self.next_time = now + self.interval
+        return True
+
+
+def format_stats(profiler, hands, frames, elapsed, quality=None):
+    """一行运行统计"""
+    line = f"frames={frames} fps={profiler.fps():.1f} avg_fps={frames / elapsed if elapsed > 0 else 0.0:.1f}"
+    e2e = profiler.percentiles(E2E_ACTION)
+    if e2e is not None:
+        line += f" e2e_p50={e2e[0]:.1f}ms e2e_p95={e2e[1]:.1f}ms"
+    line += f" hands={len(hands.visible)} gesture={hands.gesture.name}"
+    actuator = hands.actuator
+    line += f" actuator_pending={actuator.pending()} actuator_dropped={actuator.dropped}"
+    if quality is not None:
+        line += f" quality_level={quality.level}"
+    return line
+
+
+class WindowStage(Stage):
+    """窗口模式的显示出口：imshow + waitKey，ESC 结束流水线（HighGUI 窗口在该阶段所在的线程中创建和销毁）"""
+    name = "display"
+
+    def __init__(self, rate, profiler=None, **kwargs):
+        super().__init__(**kwargs)
+        self.rate = rate
+        self.profiler = profiler
+
+    def process(self, ctx):
+        if ctx.frame is not None and self.rate.due(time.perf_counter()):
+            cv2.imshow("Hand Control", ctx.frame.image)
+        key = cv2.waitKey(1) & 0xFF
+        if self.profiler is not None:
+            self.profiler.mark("display")
+        if key == 27:
+            raise EndOfStream("ESC")
+        return ctx
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class PreviewStage(Stage):
+    """无窗口模式的显示出口：按间隔写入预览图片"""
+    name = "display"
+
+    def __init__(self, writer, profiler=None, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = writer
+        self.profiler = profiler
+
+    def process(self, ctx):
+        now = time.perf_counter()
+        if self.writer.due(now):
+            fps = int(self.profiler.fps()) if self.profiler is not None else 0
+            img = ctx.frame.image if ctx.frame is not None else None
+            self.writer.write(img, ctx.landmarks, ctx.states, fps, now)
+        if self.profiler is not None:
+            self.profiler.mark("display")
+        return ctx
+
+
+class StatsStage(Stage):
+    """首帧输出启动耗时报告，之后按间隔输出一行运行统计"""
+    name = "stats"
+
+    def __init__(self, interval, profiler, hands, quality=None, **kwargs):
+        super().__init__(**kwargs)
+        self.interval = interval
+        self.profiler = profiler
+        self.hands = hands
+        self.quality = quality
+        self.frames = 0
+        self.start = time.perf_counter()
+        self.next_time = self.start + interval
+
+    def process(self, ctx):
+        self.frames += 1
+        if report.first_frame():
+            log("Startup report:\n" + report.format())
+        if self.interval:
+            now = time.perf_counter()
+            if now >= self.next_time:
+                log(format_stats(self.profiler, self.hands, self.frames, now - self.start, self.quality))
+                self.next_time = now + self.interval
+        return ctx
+
+
+def build_stages(args, camera, detector, hands, profiler, quality):
+    """按命令行参数组装流水线阶段"""
+    stages = []
+    if camera is not None:
+        stages.append(CaptureStage(camera, profiler))
+    # 窗口模式在 frame.image 上绘制手部关键点+骨骼连线与文字
+    draw = not args.headless
+    stages.append(DetectStage(detector, draw=draw))
+    stages.append(RecognizeStage(hands, detector, profiler))
+    if draw:
+        stages.append(OverlayStage(profiler))
+        stages.append(WindowStage(quality.preview if quality is not None else DisplayRate(), profiler))
+    elif args.preview_dir:
+        stages.append(PreviewStage(PreviewWriter(args.preview_dir, args.preview_interval), profiler))
+    stages.append(StatsStage(args.stats_interval, profiler, hands, quality))
+    if quality is not None:
+        stages.append(QualityStage(quality))
+    if args.telemetry:
+        stages.append(TelemetryStage(args.telemetry, [s.name for s in stages], profiler, hands))
+    # 视频文件逐帧处理时各阶段之间反压而不丢帧；摄像头与 --realtime 时只处理最新的帧
+    offline = camera is None or (camera.is_file and not args.realtime)
+    return apply_placement(stages, parse_placement(args.placement), Settings.PIPELINE_QUEUE_SIZE,
+                           BLOCK if offline else Settings.PIPELINE_DROP_POLICY)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.log_level, fmt=args.log_format)
+    report.mark("imports")
+    pipeline = None
+    stop_requested = threading.Event()
+
+    def stop():
+        stop_requested.set()
+        if pipeline is not None:
+            pipeline.stop()
+
+    install_signal_handlers(stop)
+
+    backend = args.backend or ("recording" if args.replay else None)
+    if backend:
+        Settings.ACTUATOR_BACKEND = backend
 
-def main():
     # 初始化模块
-    camera = Camera()           # 相机
-    detector = HandDetector()         # 手部检测器
-    recognizer = GestureRecognizer()  # 手势识别器
-    mapper = ActionMapper()           # 动作映射器
-    fps_counter = FpsCounter()        # FPS 计数器
+    profiler = LatencyProfiler(window=Settings.PROFILER_WINDOW, enabled=Settings.ENABLE_PROFILER)  # 分阶段延迟统计
+    recorder = LandmarkRecorder(Settings.LANDMARK_RECORD_PATH) if Settings.LANDMARK_RECORD_PATH else None
+    camera = None
+    if args.replay:
+        detector = ReplayHandDetector(args.replay)  # 回放录制的关键点
+    else:
+        # 手部检测器（MediaPipe 图构造 + 预热）在后台加载，同时打开摄像头
+        detector_task = BackgroundTask("DetectorLoader", lambda: load_detector(recorder, profiler))
+        source = args.source
+        if source is not None and source.isdigit():
+            source = int(source)
+        with report.phase("camera_open"):
+            if isinstance(source, str):
+                # 视频文件默认同步逐帧读取，处理速度即吞吐量
+                camera = Camera(source, threaded=args.realtime, realtime=True)
+            else:
+                camera = Camera(source)  # 相机
+    with report.phase("hand_manager"):
+        hands = HandManager(profiler=profiler)  # 多手识别与动作映射（每只手独立的识别器/映射器状态）
+    if not args.replay:
+        with report.phase("detector_wait"):
+            detector = detector_task.result()
+    quality = None
+    if args.adaptive_quality and not args.replay:
+        quality = QualityController(camera, detector, DisplayRate(Settings.PREVIEW_FPS) if not args.headless else None)
+    pipeline = Pipeline(build_stages(args, camera, detector, hands, profiler, quality), profiler)
+    if stop_requested.is_set():
+        pipeline.stop()
+    metrics = None
+    if args.metrics_port is not None:
+        metrics = MetricsServer(lambda: collect_pipeline_metrics(profiler, pipeline, camera, hands, quality),
+                                args.metrics_port)
 
     log("Hand Gesture Control System Started.")
-    log("Press 'q' to exit.")
-
-    while True:
-        # 1. 读取画面 
-        success, img = camera.read() # 
-        if not success:
-            break
-
-        # 2. 检测手部
-        img = detector.find_hands(img) # 绘制手部关键点+骨骼连线，返回带绘制的画面
-        lm_list = detector.get_landmarks() # 获取检测到的手部关键点列表
-
-        if lm_list:
-            landmarks = lm_list.landmark # 提取关键点的归一化坐标列表
-            
-            # 3. 更新手指状态
-            recognizer.update_fingers_status(landmarks, Settings.CAP_HEIGHT)
-            
-            # 4. 识别手势
-            gesture_type, info = recognizer.recognize(landmarks)
-            
-            # 5. 执行动作
-            mapper.execute(gesture_type, info)
-            
-            # UI 显示
-            cv2.putText(img, f"Gesture: {gesture_type.name}", (10, 50), 
-                        cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
-
-        # FPS 显示
-        fps = fps_counter.update()
-        cv2.putText(img, f"FPS: {fps}", (10, 20), 
-                    cv2.FONT_HERSHEY_PLAIN, 1, (255, 0, 0), 1)
-
-        # 显示画面
-        cv2.imshow("Hand Control", img)
-        
-        # 退出
-        if cv2.waitKey(1) & 0xFF == 27:
-            break
-
-    camera.release()
-    cv2.destroyAllWindows()
+    log("Press Ctrl+C to exit." if args.headless else "Press ESC to exit.")
+
+    start = time.perf_counter()
+    try:
+        pipeline.run(args.max_frames)
+    finally:
+        if metrics is not None:
+            metrics.close()
+        elapsed = time.perf_counter() - start
+        frames = pipeline.frames
+        log(f"Processed {frames} frames in {elapsed:.2f}s ({frames / elapsed if elapsed > 0 else 0.0:.1f} fps, "
+            f"{'headless' if args.headless else 'windowed'})")
+        if camera is not None:
+            stats = camera.get_stats()
+            log(f"Capture stats: captured={stats['captured']} dropped={stats['dropped']} stale={stats['stale']} "
+                f"timeouts={stats['timeouts']}")
+        log("Latency summary:\n" + profiler.format_summary())
+        log("Pipeline stages:\n" + pipeline.format_stats())
+        log(f"Detector stats: {detector.get_stats()}")
+        if quality is not None:
+            log(f"Quality stats: {quality.get_stats()}")
+        log(f"Hand stats: {hands.get_stats()}")
+        hands.close()
+        log(f"Actuator stats: {hands.actuator.get_stats()}")
+        preview = next((s.writer for s in pipeline.stages if isinstance(s, PreviewStage)), None)
+        if preview is not None:
+            log(f"Preview frames written: {preview.written} -> {preview.path}")
+        telemetry = next((s.writer for s in pipeline.stages if isinstance(s, TelemetryStage)), None)
+        if telemetry is not None:
+            log(f"Telemetry stats: {telemetry.get_stats()}")
+        if camera is not None:
+            camera.release()
+        detector.close()
+        if recorder is not None:
+            log(f"Landmarks recorded: {recorder.frame_count} frames -> {recorder.save()}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
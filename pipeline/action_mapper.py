@@ -1,24 +1,38 @@
 # pipeline/action_mapper.py
 
 from gesture.gesture_base import GestureType
+from gesture.trajectory_recognizer import SWIPE_GESTURES
+from control.actuator import Actuator
 from control.mouse_controller import MouseController
 from control.volume_controller import VolumeController
 from control.keyboard_controller import KeyboardController
-from utils.smoothing import Smoother
+from utils.smoothing import create_smoother
+from utils.config_store import ConfigSnapshot
+from utils.kalman_smoother import KalmanSmoother
+from vision.landmark_utils import Landmark
 from config import Settings
-import pyautogui
 import math
 import time
 
+# 以进入模式时的手掌位置为原点的摇杆模式
+JOYSTICK_MODES = (GestureType.SCROLL_MODE, GestureType.VOLUME_MODE)
+
+
 class ActionMapper:
-    def __init__(self):
-        self.mouse = MouseController()
-        self.volume = VolumeController()
-        self.smoother = Smoother(Settings.SMOOTHING_FACTOR)
+    def __init__(self, actuator=None, config=None):
+        # 输入注入执行器，所有鼠标/键盘操作在独立线程中执行
+        self.actuator = actuator if actuator is not None else Actuator()
+        self.mouse = MouseController(self.actuator)
+        self.volume = VolumeController(self.actuator)
+        self.keyboard = KeyboardController(self.actuator)
+        self.smoother = create_smoother(Settings.POINTER_FILTER)  # 光标滤波器
+        # 滚动/音量摇杆的手掌位置滤波器，None 表示不滤波
+        self.joystick_filter = create_smoother(Settings.JOYSTICK_FILTER) if Settings.JOYSTICK_FILTER else None
         
         # 状态追踪
         self.is_left_down = False
         self.is_right_down = False
+        self.prev_gesture = GestureType.NONE  # 上一帧执行的手势，用于识别离开模式的那一帧
         
         # 虚拟摇杆原点
         # 记录进入模式时的初始坐标 (x, y)
@@ -31,29 +45,63 @@ class ActionMapper:
         self.remain_x = 0.0
         self.remain_y = 0.0
 
+        # 运行时参数（来自 ConfigSnapshot，保存为字段，热路径不读取 Settings）
+        self.config = None
+        self.apply_config(config if config is not None else ConfigSnapshot.from_settings())
+
+    def apply_config(self, config):
+        """应用新的参数快照（版本变化时由调用方调用一次）"""
+        previous, self.config = self.config, config
+        self.sensitivity = config.mouse_sensitivity
+        self.accel_factor = config.accel_factor
+        self.accel_threshold = config.accel_threshold
+        self.move_threshold = config.move_threshold
+        self.deadzone = config.joystick_deadzone
+        self.scroll_speed = config.scroll_speed
+        self.scroll_scale = Settings.SCROLL_VELOCITY_SCALE
+        self.volume_threshold = config.volume_trigger_threshold
+        self.mute_threshold = config.mute_trigger_threshold
+        self.mouse.apply_config(config)
+        # 平滑系数仍为配置默认值时保留滤波器按自身配置项构造的参数
+        factor = previous.smoothing_factor if previous is not None else Settings.SMOOTHING_FACTOR
+        if config.smoothing_factor != factor:
+            self.smoother.update_smoothing_factor(config.smoothing_factor)
+
+    def set_latency(self, seconds):
+        """更新实测的采集->执行延迟，支持延迟补偿的滤波器据此向前预测光标位置"""
+        if isinstance(self.smoother, KalmanSmoother):
+            self.smoother.set_latency(seconds)
+
     def _apply_acceleration(self, dx, dy):
         magnitude = math.sqrt(dx**2 + dy**2)
-        if magnitude < Settings.MOVE_THRESHOLD:
+        if magnitude < self.move_threshold:
             return 0.0, 0.0
-        if magnitude > Settings.ACCEL_THRESHOLD:
-            gain = Settings.MOUSE_SENSITIVITY * (1 + (magnitude / Settings.ACCEL_THRESHOLD) * Settings.ACCEL_FACTOR)
+        if magnitude > self.accel_threshold:
+            gain = self.sensitivity * (1 + (magnitude / self.accel_threshold) * self.accel_factor)
         else:
-            gain = Settings.MOUSE_SENSITIVITY
-        max_gain = Settings.MOUSE_SENSITIVITY * 3
+            gain = self.sensitivity
+        max_gain = self.sensitivity * 3
         gain = min(gain, max_gain)
         return dx * gain, dy * gain
 
-    def execute(self, gesture, info):
-        # 如果当前手势不是滚动或音量，重置原点，方便下次重新锁定
-        if gesture not in [GestureType.SCROLL_MODE, GestureType.VOLUME_MODE]:
+    def execute(self, gesture, info, timestamp=None):
+        # 离开滚动/音量模式的那一帧停止滚动、丢弃音量余量，并重置原点，方便下次重新锁定
+        previous, self.prev_gesture = self.prev_gesture, gesture
+        if previous == GestureType.SCROLL_MODE and gesture != GestureType.SCROLL_MODE:
+            self.mouse.set_scroll_velocity(0.0, 0.0, timestamp)
+        if previous == GestureType.VOLUME_MODE and gesture != GestureType.VOLUME_MODE:
+            self.volume.reset()
+        if previous in JOYSTICK_MODES and gesture not in JOYSTICK_MODES:
             self.origin_pos = None
             self.mute_triggered = False
+            if self.joystick_filter is not None:
+                self.joystick_filter.reset()
 
         # ===========================
         # 1. 鼠标移动/点击逻辑
         # ===========================
         if gesture in [GestureType.POINTING, GestureType.DRAGGING] and info:
-            curr_x, curr_y = self.smoother.get_smoothed_coords(info.x, info.y)
+            curr_x, curr_y = self.smoother.get_smoothed_coords(info.x, info.y, timestamp)
             if self.prev_x is None:
                 self.prev_x, self.prev_y = curr_x, curr_y
             
@@ -74,22 +122,34 @@ class ActionMapper:
             self.prev_x = None
             self.smoother.reset()
 
-        # 左键/右键状态管理
+        # 左键/右键状态管理：命令未被执行器接收时保持原状态，下一帧重试
         should_left = (gesture == GestureType.DRAGGING or gesture == GestureType.LEFT_CLICK)
         if should_left and not self.is_left_down:
-            self.mouse.drag_start()
-            self.is_left_down = True
+            if self.mouse.drag_start():
+                self.is_left_down = True
         elif not should_left and self.is_left_down:
-            self.mouse.drag_end()
-            self.is_left_down = False
+            if self.mouse.drag_end():
+                self.is_left_down = False
 
         should_right = (gesture == GestureType.RIGHT_CLICK)
         if should_right and not self.is_right_down:
-            pyautogui.mouseDown(button='right')
-            self.is_right_down = True
+            if self.mouse.right_down():
+                self.is_right_down = True
         elif not should_right and self.is_right_down:
-            pyautogui.mouseUp(button='right')
-            self.is_right_down = False
+            if self.mouse.right_up():
+                self.is_right_down = False
+
+        # 轨迹手势为单帧事件，每次触发执行一次快捷键
+        if gesture == GestureType.ZOOM_IN:
+            self.keyboard.zoom_in()
+        elif gesture == GestureType.ZOOM_OUT:
+            self.keyboard.zoom_out()
+        elif gesture in SWIPE_GESTURES:
+            self.keyboard.swipe(gesture.name)
+
+        # 滚动/音量模式使用滤波后的手掌位置计算摇杆偏移
+        if gesture in [GestureType.SCROLL_MODE, GestureType.VOLUME_MODE] and info and self.joystick_filter is not None:
+            info = Landmark(*self.joystick_filter.get_smoothed_coords(info.x, info.y, timestamp))
 
         # ===========================
         # 2. 滚动模式逻辑
@@ -104,18 +164,15 @@ class ActionMapper:
             diff_x = info.x - self.origin_pos[0]
             diff_y = info.y - self.origin_pos[1]
 
-            # 死区判断 (Deadzone)，小幅度移动不触发
-            if abs(diff_y) > Settings.JOYSTICK_DEADZONE:
-                # 手向上(y变小) -> 偏移为负 -> 意图是页面向上滚动 -> scroll正值
-                # 手向下(y变大) -> 偏移为正 -> 意图是页面向下滚动 -> scroll负值
-                # 速度随距离增加
-                speed_y = int(diff_y * Settings.SCROLL_SPEED)
-                self.mouse.scroll_vertical(-speed_y) 
-
-            if abs(diff_x) > Settings.JOYSTICK_DEADZONE:
-                # 手向左(x变小) -> scroll 负/正取决于系统定义，通常左是负
-                speed_x = int(diff_x * Settings.SCROLL_SPEED)
-                self.mouse.scroll_horizontal(speed_x)
+            # 偏移视为滚动速度（格/秒），由滚动引擎按实际时间积分并以固定频率输出
+            # 死区判断 (Deadzone)，小幅度移动不触发；超出死区的部分决定速度，越过死区时速度从 0 连续增加
+            # 手向上(y变小) -> 偏移为负 -> 意图是页面向上滚动 -> scroll正值
+            # 手向下(y变大) -> 偏移为正 -> 意图是页面向下滚动 -> scroll负值
+            # 手向左(x变小) -> scroll 负/正取决于系统定义，通常左是负
+            gain = self.scroll_speed * self.scroll_scale
+            speed_y = -math.copysign(abs(diff_y) - self.deadzone, diff_y) * gain if abs(diff_y) > self.deadzone else 0.0
+            speed_x = math.copysign(abs(diff_x) - self.deadzone, diff_x) * gain if abs(diff_x) > self.deadzone else 0.0
+            self.mouse.set_scroll_velocity(speed_x, speed_y, timestamp)
 
         # ===========================
         # 3. 音量控制逻辑
@@ -123,26 +180,46 @@ class ActionMapper:
         if gesture == GestureType.VOLUME_MODE and info:
             if self.origin_pos is None:
                 self.origin_pos = (info.x, info.y)
+                self.volume.begin()
                 return
 
             diff_x = info.x - self.origin_pos[0]
             diff_y = info.y - self.origin_pos[1]
 
             # --- 音量增减 (垂直方向) ---
-            if abs(diff_y) > Settings.VOLUME_TRIGGER_THRESHOLD:
-                # 手向上(y变小, diff负) -> 音量增加
-                # 手向下(y变大, diff正) -> 音量降低
-                if diff_y < 0:
-                    self.volume.increase_volume()
-                else:
-                    self.volume.decrease_volume()
+            # 手向上(y变小, diff负) -> 音量增加；手向下(y变大, diff正) -> 音量降低
+            # 按偏移换算的速率（或手的位置对应的绝对音量）调节，不再每帧按一次音量键
+            self.volume.update(diff_y, info.y, self.volume_threshold, timestamp)
 
             # --- 静音切换 (水平向左大距离) ---
             # 向左移动 (x 变小，diff_x 为负值) 且超过大阈值
-            if diff_x < -Settings.MUTE_TRIGGER_THRESHOLD:
+            if diff_x < -self.mute_threshold:
                 if not self.mute_triggered:
                     self.volume.toggle_mute()
                     self.mute_triggered = True # 锁定，防止一直闪烁切换
-            elif diff_x > -Settings.MUTE_TRIGGER_THRESHOLD * 0.5:
+            elif diff_x > -self.mute_threshold * 0.5:
                 # 只有手回到原点附近(迟滞比较)，才重置锁
-                self.mute_triggered = False
\ No newline at end of file
+                self.mute_triggered = False
+
+    def release(self):
+        """松开仍处于按下状态的按键并清空状态（手丢失时调用）"""
+        if self.is_left_down:
+            self.mouse.drag_end()
+            self.is_left_down = False
+        if self.is_right_down:
+            self.mouse.right_up()
+            self.is_right_down = False
+        self.mouse.stop_scroll()
+        self.volume.reset()
+        self.prev_gesture = GestureType.NONE
+        self.origin_pos = None
+        self.mute_triggered = False
+        self.prev_x = None
+        self.smoother.reset()
+        if self.joystick_filter is not None:
+            self.joystick_filter.reset()
+
+    def close(self):
+        """松开仍处于按下状态的按键，并等待执行器处理完剩余命令后退出"""
+        self.release()
+        self.actuator.stop()
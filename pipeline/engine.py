@@ -0,0 +1,498 @@
+# pipeline/engine.py
+"""
+处理流水线引擎
+
+采集 -> 检测 -> 识别/执行 -> 叠加 -> 显示 这条循环原来在 main.py 与 gui.qt_utils.WorkerThread 中各写了一遍。
+这里把它建模为依次连接的阶段 (Stage)，命令行与 GUI 只负责组装阶段和提供各自的显示出口。
+
+- 每个阶段指定执行位置 (mode)：
+  "inline"  与上一个阶段在同一线程中顺序执行（第一个阶段在调用 run() 的线程中执行）
+  "thread"  在独立线程中执行
+  "asyncio" 作为协程任务在流水线共用的事件循环线程中执行
+- 非 inline 的阶段与上游之间有一个有界队列，队列满时按阶段的丢帧策略 (policy) 处理：
+  "block"        上游阻塞等待（反压），逐帧处理视频文件时不丢帧
+  "drop_oldest"  丢弃队列中最旧的一帧（latest-frame-wins，实时摄像头默认）
+  "drop_newest"  丢弃新到的一帧
+- 阶段抛出 EndOfStream 时整条流水线结束；抛出其他异常时流水线停止，run() 在清理后重新抛出
+
+每个阶段的调用次数、耗时、丢弃数单独统计，阶段可以单独替换并做基准测试。
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+from utils.logger import ERROR, log
+
+INLINE = "inline"
+THREAD = "thread"
+ASYNCIO = "asyncio"
+MODES = (INLINE, THREAD, ASYNCIO)
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class EndOfStream(Exception):
+    """阶段抛出该异常表示输入结束或用户要求退出，流水线正常结束"""
+
+
+class QueueClosed(Exception):
+    """下游已经退出，队列不再接收/提供数据"""
+
+
+_END = object()  # 流结束标记，沿队列传递给下游
+
+
+class FrameContext:
+    """在阶段之间传递的一帧数据"""
+    __slots__ = ("seq", "origin", "frame", "timestamp", "landmarks", "handedness", "states", "gesture", "busy",
+                 "timings", "data")
+
+    def __init__(self, seq):
+        self.seq = seq
+        self.origin = time.perf_counter()  # 端到端计时起点，采集阶段改为画面的采集时间
+        self.frame = None        # vision.frame.Frame，回放时为 None
+        self.timestamp = None    # 该帧的时间戳（采集时间或录制中的时间）
+        self.landmarks = None    # (N, 21, 3) 关键点
+        self.handedness = None   # (N,) 左右手编码
+        self.states = None       # HandManager.process() 返回的 HandState 列表
+        self.gesture = None      # 代表手势
+        self.busy = 0.0          # 各阶段处理耗时之和（不含等待输入的阶段）
+        self.timings = {}        # 阶段名 -> 该帧在该阶段的处理耗时 (秒)
+        self.data = {}           # 前端自定义数据
+
+    def release(self):
+        """归还帧缓冲区（帧处理完成或被丢弃时由引擎调用）"""
+        if self.frame is not None and hasattr(self.frame, "release"):
+            self.frame.release()
+        self.frame = None
+
+
+def _discard(item):
+    if isinstance(item, FrameContext):
+        item.release()
+
+
+class BoundedQueue:
+    """两个阶段之间的有界队列，满时按丢帧策略处理，线程与协程都可以读取"""
+    def __init__(self, maxsize=2, policy=DROP_OLDEST, name="queue"):
+        if policy not in POLICIES:
+            raise ValueError(f"未知的丢帧策略: {policy}")
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.name = name
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._waiters = []   # 等待数据的协程 (loop, future)
+        self._closed = False
+        self.put_count = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item, timeout=None):
+        """
+        放入一项；流结束标记总是被接收
+
+        Returns:
+            是否被接收（被丢弃或队列已关闭时为 False，丢弃的帧已释放）
+        """
+        with self._cond:
+            if self._closed:
+                _discard(item)
+                return False
+            if item is not _END and len(self._items) >= self.maxsize:
+                if self.policy == BLOCK:
+                    if not self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed, timeout):
+                        self.dropped += 1
+                        _discard(item)
+                        return False
+                    if self._closed:
+                        _discard(item)
+                        return False
+                elif self.policy == DROP_OLDEST:
+                    self.dropped += 1
+                    _discard(self._items.popleft())
+                else:
+                    self.dropped += 1
+                    _discard(item)
+                    return False
+            self._items.append(item)
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+        return True
+
+    def get(self, timeout=None):
+        """取出一项，没有数据时阻塞；队列关闭且为空时抛出 QueueClosed"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                raise QueueClosed(self.name)
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    async def get_async(self):
+        """协程版本的 get()，等待期间不占用事件循环"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._items:
+                    item = self._items.popleft()
+                    self._cond.notify_all()
+                    return item
+                if self._closed:
+                    raise QueueClosed(self.name)
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            await future
+
+    def close(self):
+        """下游退出：丢弃剩余数据，唤醒所有等待者，此后 put() 直接丢弃"""
+        with self._cond:
+            self._closed = True
+            while self._items:
+                _discard(self._items.popleft())
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def get_stats(self):
+        return {"put": self.put_count, "dropped": self.dropped, "max_depth": self.max_depth}
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Stage:
+    """
+    流水线阶段基类
+
+    子类实现 process(ctx)：返回 ctx 交给下一个阶段，返回 None 表示丢弃该帧，
+    抛出 EndOfStream 结束整条流水线。open()/close() 在阶段所在的线程中调用。
+    process 也可以定义为协程函数，此时阶段只能以 "asyncio" 模式运行。
+    """
+    name = "stage"
+    waits_for_input = False  # 处理时间主要是等待外部输入（如采集），不计入 ctx.busy
+    lossless = False         # 输入帧不能丢弃（执行动作的阶段），丢帧策略固定为 "block"
+
+    def __init__(self, mode=INLINE, queue_size=2, policy=DROP_OLDEST, name=None):
+        if mode not in MODES:
+            raise ValueError(f"未知的执行位置: {mode}")
+        self.mode = mode
+        self.queue_size = queue_size
+        self.policy = BLOCK if self.lossless else policy
+        if name is not None:
+            self.name = name
+        self.calls = 0
+        self.busy_time = 0.0
+        self.max_time = 0.0
+        self.discarded = 0   # process() 返回 None 的次数
+
+    def open(self):
+        pass
+
+    def process(self, ctx):
+        return ctx
+
+    def close(self):
+        pass
+
+    def get_stats(self):
+        return {
+            "mode": self.mode,
+            "calls": self.calls,
+            "avg_ms": round(self.busy_time / self.calls * 1000.0, 3) if self.calls else None,
+            "max_ms": round(self.max_time * 1000.0, 3),
+            "discarded": self.discarded,
+        }
+
+
+class _Segment:
+    """在同一执行位置上顺序执行的一组连续阶段"""
+    def __init__(self, stages, mode):
+        self.stages = stages
+        self.mode = mode
+        self.input = None    # 上游队列，第一段为 None（数据源）
+        self.output = None   # 下游队列，最后一段为 None
+
+
+class Pipeline:
+    def __init__(self, stages, profiler=None, name="pipeline"):
+        """
+        Args:
+            stages: Stage 列表，第一个阶段为数据源（输入 ctx 只有 seq）
+            profiler: 可选的 LatencyProfiler，每段开始处理一帧时 begin_frame()（跨线程时恢复该帧的计时起点），
+                      最后一段处理完成时 end_frame()
+        """
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        self.stages = list(stages)
+        self.profiler = profiler
+        self.name = name
+        self.segments = []
+        for stage in self.stages:
+            if not self.segments or stage.mode != INLINE:
+                self.segments.append(_Segment([stage], stage.mode if self.segments else INLINE))
+            else:
+                self.segments[-1].stages.append(stage)
+        self.queues = []
+        for upstream, downstream in zip(self.segments, self.segments[1:]):
+            head = downstream.stages[0]
+            q = BoundedQueue(head.queue_size, head.policy, name=f"{head.name}.in")
+            upstream.output = downstream.input = q
+            self.queues.append(q)
+
+        self.frames = 0          # 完整走完所有阶段的帧数
+        self.produced = 0        # 数据源产生的帧数
+        self._stop = threading.Event()
+        self._max_frames = 0
+        self._errors = []
+        self._threads = []
+        self._loop = None
+        self._lock = threading.Lock()
+
+    # ---------- 控制 ----------
+    def stop(self):
+        """请求停止：数据源在下一帧之前退出，下游处理完队列中的帧后依次退出（可从任意线程调用）"""
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def run(self, max_frames=0):
+        """
+        在调用线程中运行第一段，其余段在各自的线程/事件循环中运行，全部结束后返回
+
+        Args:
+            max_frames: 数据源产生指定帧数后结束，0 表示不限
+        Returns:
+            完整处理的帧数
+        """
+        self._max_frames = max_frames
+        async_segments = [s for s in self.segments[1:] if s.mode == ASYNCIO]
+        if async_segments:
+            self._loop = asyncio.new_event_loop()
+            loop_thread = threading.Thread(target=self._run_loop, args=(async_segments,),
+                                           name=f"{self.name}-asyncio", daemon=True)
+            self._threads.append(loop_thread)
+        for segment in self.segments[1:]:
+            if segment.mode == THREAD:
+                self._threads.append(threading.Thread(target=self._run_segment, args=(segment,),
+                                                      name=f"{self.name}-{segment.stages[0].name}", daemon=True))
+        for t in self._threads:
+            t.start()
+        try:
+            self._run_segment(self.segments[0])
+        finally:
+            for t in self._threads:
+                t.join()
+            self._threads = []
+        if self._errors:
+            raise self._errors[0]
+        return self.frames
+
+    # ---------- 执行 ----------
+    def _process(self, segment, ctx, resume):
+        """依次执行段内阶段，返回输出 ctx 或 None（被丢弃）"""
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+            if resume:
+                # 跨线程：在本线程中恢复该帧的端到端计时起点
+                self.profiler.set_capture_timestamp(ctx.origin)
+        for stage in segment.stages:
+            start = time.perf_counter()
+            out = stage.process(ctx)
+            elapsed = time.perf_counter() - start
+            self._account(stage, elapsed, ctx)
+            if out is None:
+                stage.discarded += 1
+                ctx.release()
+                return None
+            ctx = out
+        return ctx
+
+    async def _process_async(self, segment, ctx):
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+            self.profiler.set_capture_timestamp(ctx.origin)
+        for stage in segment.stages:
+            start = time.perf_counter()
+            out = stage.process(ctx)
+            if asyncio.iscoroutine(out):
+                out = await out
+            self._account(stage, time.perf_counter() - start, ctx)
+            if out is None:
+                stage.discarded += 1
+                ctx.release()
+                return None
+            ctx = out
+        return ctx
+
+    @staticmethod
+    def _account(stage, elapsed, ctx):
+        stage.calls += 1
+        stage.busy_time += elapsed
+        ctx.timings[stage.name] = elapsed
+        if elapsed > stage.max_time:
+            stage.max_time = elapsed
+        if not stage.waits_for_input:
+            ctx.busy += elapsed
+
+    def _next_input(self, segment):
+        """数据源段产生新的 ctx，其他段从上游队列读取；流结束时返回 None"""
+        if segment.input is None:
+            if self._stop.is_set() or (self._max_frames and self.produced >= self._max_frames):
+                return None
+            self.produced += 1
+            return FrameContext(self.produced)
+        while True:
+            item = segment.input.get(timeout=0.5)
+            if item is _END:
+                return None
+            if item is not None:
+                return item
+
+    def _emit(self, segment, ctx):
+        if segment.output is not None:
+            segment.output.put(ctx)
+        else:
+            if self.profiler is not None:
+                self.profiler.end_frame()
+            ctx.release()
+            with self._lock:
+                self.frames += 1
+
+    def _fail(self, segment, error):
+        log(f"流水线阶段 {'/'.join(s.name for s in segment.stages)} 出错: {error!r}", ERROR)
+        self._errors.append(error)
+        self._stop.set()
+
+    def _open(self, segment):
+        opened = []
+        for stage in segment.stages:
+            stage.open()
+            opened.append(stage)
+        return opened
+
+    def _finish(self, segment, opened):
+        for stage in reversed(opened):
+            try:
+                stage.close()
+            except Exception as e:
+                self._fail(segment, e)
+        if segment.input is not None:
+            segment.input.close()   # 上游阻塞在 put() 时立即返回
+        if segment.output is not None:
+            segment.output.put(_END)
+
+    def _run_segment(self, segment):
+        opened = []
+        try:
+            opened = self._open(segment)
+            resume = segment.input is not None
+            while True:
+                ctx = self._next_input(segment)
+                if ctx is None:
+                    break
+                try:
+                    ctx = self._process(segment, ctx, resume)
+                except EndOfStream:
+                    ctx.release()
+                    self._stop.set()
+                    break
+                except Exception:
+                    ctx.release()
+                    raise
+                if ctx is not None:
+                    self._emit(segment, ctx)
+        except QueueClosed:
+            self._stop.set()
+        except Exception as e:
+            self._fail(segment, e)
+        finally:
+            self._finish(segment, opened)
+
+    async def _run_segment_async(self, segment):
+        opened = []
+        try:
+            opened = self._open(segment)
+            while True:
+                item = await segment.input.get_async()
+                if item is _END:
+                    break
+                try:
+                    ctx = await self._process_async(segment, item)
+                except EndOfStream:
+                    item.release()
+                    self._stop.set()
+                    break
+                except Exception:
+                    item.release()
+                    raise
+                if ctx is None:
+                    continue
+                if segment.output is not None and segment.output.policy == BLOCK:
+                    # 反压：在线程池中等待下游队列，不阻塞事件循环中的其他阶段
+                    await asyncio.get_running_loop().run_in_executor(None, segment.output.put, ctx)
+                else:
+                    self._emit(segment, ctx)
+        except QueueClosed:
+            self._stop.set()
+        except Exception as e:
+            self._fail(segment, e)
+        finally:
+            self._finish(segment, opened)
+
+    def _run_loop(self, segments):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(asyncio.gather(*(self._run_segment_async(s) for s in segments)))
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    # ---------- 统计 ----------
+    def get_stats(self):
+        """各阶段耗时/丢弃与各队列的统计"""
+        return {
+            "frames": self.frames,
+            "stages": {s.name: s.get_stats() for s in self.stages},
+            "queues": {q.name: q.get_stats() for q in self.queues},
+        }
+
+    def format_stats(self):
+        """便于日志输出的多行文本"""
+        lines = [f"{'stage':<14}{'mode':<9}{'calls':>8}{'avg_ms':>9}{'max_ms':>9}{'discard':>9}{'q_drop':>8}"]
+        drops = {q.name[:-3]: q.dropped for q in self.queues}
+        for s in self.stages:
+            st = s.get_stats()
+            avg = f"{st['avg_ms']:.2f}" if st["avg_ms"] is not None else "-"
+            lines.append(f"{s.name:<14}{s.mode:<9}{st['calls']:>8}{avg:>9}{st['max_ms']:>9.2f}"
+                         f"{st['discarded']:>9}{drops.get(s.name, 0):>8}")
+        return "\n".join(lines)
+
+
+def parse_placement(spec):
+    """'detect=thread,overlay=asyncio' -> {'detect': 'thread', 'overlay': 'asyncio'}"""
+    placement = {}
+    for item in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, _, mode = item.partition("=")
+        if mode not in MODES:
+            raise ValueError(f"无效的阶段位置: {item}（可选 {', '.join(MODES)}）")
+        placement[name.strip()] = mode
+    return placement
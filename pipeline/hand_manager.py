@@ -0,0 +1,217 @@
+# pipeline/hand_manager.py
+"""
+多手状态管理
+
+每只被跟踪的手（稳定编号见 vision.hand_tracker）拥有独立的 GestureRecognizer、GestureFilter
+与 ActionMapper 状态，共用同一个输入执行器。所有手在一次向量化计算中完成识别。
+
+两只手同时出现时按角色分工：Settings.CURSOR_HAND 指定的手控制光标（移动/拖拽/点击），
+另一只手负责模式手势（滚动/音量）与轨迹手势（挥动/缩放）；只有一只手时它拥有全部功能，与单手版本行为一致。
+"""
+from config import Settings
+from control.actuator import Actuator
+from gesture.gesture_base import GestureType
+from gesture.gesture_filter import GestureFilter
+from gesture.gesture_classifier import create_recognizer
+from gesture.trajectory_recognizer import TRAJECTORY_GESTURES, TrajectoryRecognizer
+from utils.config_store import ConfigSnapshot
+from utils.kalman_smoother import KalmanSmoother
+from utils.latency_profiler import E2E_ACTION
+from vision.hand_tracker import HandTracker
+from vision.landmark_utils import HAND_LABELS
+from .action_mapper import ActionMapper
+
+ROLE_ALL = "all"        # 单手：全部功能
+ROLE_CURSOR = "cursor"  # 光标手
+ROLE_MODE = "mode"      # 模式手
+ROLE_IDLE = "idle"      # 多于两只手时其余的手，不执行动作
+
+ROLE_GESTURES = {
+    ROLE_CURSOR: {GestureType.POINTING, GestureType.DRAGGING, GestureType.LEFT_CLICK, GestureType.RIGHT_CLICK},
+    ROLE_MODE: {GestureType.SCROLL_MODE, GestureType.VOLUME_MODE} | TRAJECTORY_GESTURES,
+    ROLE_IDLE: set(),
+}
+
+
+class HandState:
+    """一只手的识别/动作状态"""
+    def __init__(self, hand, actuator, config=None):
+        self.hand = hand                        # TrackedHand
+        self.recognizer = create_recognizer()  # 按 Settings.GESTURE_ENGINE 选择规则/学习引擎
+        self.filter = GestureFilter() if Settings.GESTURE_FILTER else None
+        # 识别前的关键点批量滤波（21 个点一次完成）
+        self.landmark_filter = KalmanSmoother(points=21, dims=3) if Settings.LANDMARK_KALMAN else None
+        # 关键点历史上的挥动/缩放识别
+        self.trajectory = TrajectoryRecognizer() if Settings.ENABLE_SWIPE or Settings.ENABLE_ZOOM else None
+        self.mapper = ActionMapper(actuator, config)
+        self.role = ROLE_ALL
+        self.raw_gesture = GestureType.NONE  # 识别器的原始输出
+        self.gesture = GestureType.NONE      # 经稳定过滤后交给动作映射的手势
+        self.info = None
+        self.present = True                  # 上一帧是否检测到该手
+
+    def lose(self):
+        """手在本帧丢失：重新出现时识别、过滤与轨迹都从头开始，不沿用丢失前的状态"""
+        self.present = False
+        self.recognizer.reset()
+        if self.filter is not None:
+            self.filter.reset()
+        if self.trajectory is not None:
+            self.trajectory.reset()
+
+    @property
+    def caption(self):
+        """画面上显示的文字"""
+        if self.role == ROLE_ALL:
+            return f"Gesture: {self.gesture.name}"
+        return f"{self.hand.label}#{self.hand.hand_id} {self.role}: {self.gesture.name}"
+
+
+class HandManager:
+    def __init__(self, actuator=None, profiler=None, config=None):
+        self.actuator = actuator if actuator is not None else Actuator()
+        self.profiler = profiler
+        self.config = config if config is not None else ConfigSnapshot.from_settings()  # 当前参数快照
+        self.tracker = HandTracker()
+        self.states = {}     # hand_id -> HandState
+        self.visible = []    # 当前帧检测到的手的 HandState，顺序与检测结果一致
+        self.primary = None  # 光标手（或唯一的手）的 HandState
+        self.hands_seen = 0  # 出现过的手数
+        self._filter_totals = {"raw_transitions": 0, "transitions": 0, "suppressed": 0}  # 已删除手的过滤统计
+        self._trajectory_events = 0  # 已删除手的轨迹手势数
+
+    def _assign_roles(self):
+        """按左右手和出现先后为当前可见的手分配角色"""
+        if len(self.visible) == 1:
+            self.visible[0].role = ROLE_ALL
+            self.primary = self.visible[0]
+            return
+        # 先出现的手优先，保证角色在手持续可见期间保持不变
+        ordered = sorted(self.visible, key=lambda s: s.hand.hand_id)
+        cursor_label = HAND_LABELS.index(Settings.CURSOR_HAND) if Settings.CURSOR_HAND in HAND_LABELS else -1
+        cursor = next((s for s in ordered if s.hand.handedness == cursor_label), ordered[0])
+        mode = next(s for s in ordered if s is not cursor)
+        for state in ordered:
+            state.role = ROLE_CURSOR if state is cursor else ROLE_MODE if state is mode else ROLE_IDLE
+        self.primary = cursor
+
+    def process(self, landmarks, handedness, timestamp=None):
+        """
+        识别所有手的手势并执行动作
+
+        Args:
+            landmarks: (N, 21, 3) 当前帧的关键点
+            handedness: (N,) 左右手编码
+            timestamp: 该帧的采集时间戳，供手势过滤器计算保持时间
+        Returns:
+            当前帧检测到的手的 HandState 列表
+        """
+        tracks, removed = self.tracker.update(landmarks, handedness)
+        for hand in removed:
+            # 手长时间丢失：松开它按下的按键
+            self._drop(self.states.pop(hand.hand_id))
+        self.visible = []
+        for hand in tracks:
+            state = self.states.get(hand.hand_id)
+            if state is None:
+                state = self.states[hand.hand_id] = HandState(hand, self.actuator, self.config)
+                self.hands_seen += 1
+            self.visible.append(state)
+            state.present = True
+        for state in self.states.values():
+            if state.present and state not in self.visible:
+                state.lose()
+        if not self.visible:
+            self.primary = None
+            return self.visible
+
+        if any(s.landmark_filter is not None for s in self.visible):
+            landmarks = landmarks.copy()
+            for state, arr in zip(self.visible, landmarks):
+                if state.landmark_filter is not None:
+                    arr[...] = state.landmark_filter.update(arr, timestamp)
+        self._update_latency()
+
+        # 所有手一次性识别
+        recognizers = [s.recognizer for s in self.visible]
+        results = type(recognizers[0]).recognize_hands(recognizers, landmarks)
+        for state, arr, (gesture, info) in zip(self.visible, landmarks, results):
+            state.raw_gesture = gesture
+            if state.filter is not None:
+                gesture, info = state.filter.update(gesture, info, arr, timestamp)
+            if state.trajectory is not None:
+                event = state.trajectory.update(arr, gesture, timestamp)
+                if event is not None:
+                    gesture, info = event, None
+            state.gesture, state.info = gesture, info
+        self._assign_roles()
+        if self.profiler is not None:
+            self.profiler.mark("recognize")
+
+        for state in self.visible:
+            if state.role == ROLE_ALL or state.gesture in ROLE_GESTURES[state.role]:
+                state.mapper.execute(state.gesture, state.info, timestamp)
+            else:
+                # 不属于该手角色的手势视为无动作，释放其按键与模式状态
+                state.mapper.execute(GestureType.NONE, None, timestamp)
+        if self.profiler is not None:
+            self.profiler.mark("execute")
+        return self.visible
+
+    def apply_config(self, config):
+        """应用新的参数快照：由处理线程在快照版本变化时调用"""
+        self.config = config
+        for state in self.states.values():
+            state.mapper.apply_config(config)
+
+    def _update_latency(self):
+        """每秒一次把实测的采集->执行延迟（含执行器排队与注入）交给各手的光标滤波器"""
+        if self.profiler is None or not Settings.KALMAN_PREDICT_LATENCY \
+                or self.profiler.frame_count % Settings.FPS != 0:
+            return
+        e2e = self.profiler.percentiles(E2E_ACTION)
+        if e2e is None:
+            return
+        latency = e2e[0]
+        for stage in ("queue", "inject"):
+            actuator_ms = self.actuator.profiler.percentiles(stage)
+            if actuator_ms is not None:
+                latency += actuator_ms[0]
+        for state in self.states.values():
+            state.mapper.set_latency(latency / 1000.0)
+
+    @property
+    def gesture(self):
+        """供检测器调整推理频率的代表手势：任一只手在拖拽时返回 DRAGGING"""
+        if any(s.gesture == GestureType.DRAGGING for s in self.visible):
+            return GestureType.DRAGGING
+        return self.primary.gesture if self.primary is not None else GestureType.NONE
+
+    def _drop(self, state):
+        state.mapper.release()
+        if state.filter is not None:
+            for k, v in state.filter.get_stats().items():
+                self._filter_totals[k] += v
+        if state.trajectory is not None:
+            self._trajectory_events += state.trajectory.events
+
+    def close(self):
+        """松开所有手按下的按键，并等待执行器处理完剩余命令后退出"""
+        for state in self.states.values():
+            self._drop(state)
+        self.states.clear()
+        self.tracker.reset()
+        self.actuator.stop()
+
+    def get_stats(self):
+        stats = {"hands_seen": self.hands_seen, "tracked": len(self.states)}
+        # 手势过滤统计：suppressed 为被抑制的手势跳变次数
+        totals = dict(self._filter_totals)
+        for state in self.states.values():
+            if state.filter is not None:
+                for k, v in state.filter.get_stats().items():
+                    totals[k] += v
+        stats.update(totals)
+        stats["trajectory_events"] = self._trajectory_events + sum(
+            s.trajectory.events for s in self.states.values() if s.trajectory is not None)
+        return stats
@@ -0,0 +1,179 @@
+# pipeline/quality_controller.py
+"""
+自适应画质控制
+
+采集分辨率、模型复杂度、检测/跟踪置信度和预览帧率原本在启动时固定，性能较弱的机器上处理循环会掉到 12-15 FPS。
+QualityController 统计每帧处理耗时（不含等待摄像头的时间），每个评估窗口取一次中位数与目标帧预算比较，
+在 Settings.QUALITY_LEVELS 的档位之间逐级调整：
+
+- 降档：窗口中位耗时超过预算 x QUALITY_DOWN_RATIO，立即降一档
+- 升档：连续 QUALITY_UP_WINDOWS 个窗口低于预算 x QUALITY_UP_RATIO 才升一档；
+  升档后又被降回的档位进入冷却，冷却时间每失败一次翻倍，避免在两档之间来回振荡
+- 档位切换后的第一个窗口包含模型重建、分辨率切换的一次性开销，不参与评估
+
+每次调整都写日志。控制器只调用各组件的接口，不修改 Settings：
+camera.set_resolution()、detector.reconfigure()、preview.set_max_fps()，组件不支持时跳过。
+"""
+import time
+
+import numpy as np
+from config import Settings
+from utils.logger import WARNING, log
+
+DETECTOR_PARAMS = ("model_complexity", "min_detection_confidence", "min_tracking_confidence")
+
+
+def describe_level(level):
+    """档位参数的简短描述，用于日志"""
+    w, h = level["resolution"]
+    return (f"{w}x{h} complexity={level['model_complexity']} "
+            f"det={level['min_detection_confidence']} track={level['min_tracking_confidence']} "
+            f"preview={level['preview_fps']}fps")
+
+
+class QualityController:
+    """按实测处理耗时在画质档位之间切换，保持目标帧率"""
+    def __init__(self, camera=None, detector=None, preview=None, levels=None, target_fps=None, start_level=None):
+        """
+        Args:
+            camera: 支持 set_resolution(w, h) 的采集对象
+            detector: 支持 reconfigure(...) 的检测器
+            preview: 支持 set_max_fps(fps) 的预览输出
+            levels: 画质档位（从高到低），默认 Settings.QUALITY_LEVELS
+            target_fps: 目标帧率，默认 Settings.QUALITY_TARGET_FPS
+            start_level: 启动档位，默认 Settings.QUALITY_START_LEVEL
+        """
+        self.camera = camera
+        self.detector = detector
+        self.preview = preview
+        self.levels = list(levels or Settings.QUALITY_LEVELS)
+        self.budget = 1.0 / (target_fps or Settings.QUALITY_TARGET_FPS)
+        self.window = Settings.QUALITY_WINDOW
+
+        self.level = None
+        self.changes = 0          # 档位切换次数
+        self.decisions = []       # (时间, 原档位, 新档位, 原因)
+        self._busy = []           # 当前窗口内的每帧处理耗时 (秒)
+        self._window_start = None
+        self._settling = False    # 档位切换后的第一个窗口不参与评估
+        self._up_windows = 0      # 连续满足升档条件的窗口数
+        self._cooldown = {}       # 档位 -> 冷却结束时间
+        self._backoff = {}        # 档位 -> 下次冷却时长
+        self._blocked_logged = None
+        self._upgraded_at = None  # 最近一次升档的时间，用于判断升档是否失败
+
+        # 组件当前生效的参数（启动时来自 Settings），切换档位时只下发有变化的部分
+        self._applied = {
+            "resolution": (Settings.CAP_WIDTH, Settings.CAP_HEIGHT),
+            "model_complexity": Settings.MODEL_COMPLEXITY,
+            "min_detection_confidence": Settings.MIN_DETECTION_CONFIDENCE,
+            "min_tracking_confidence": Settings.MIN_TRACKING_CONFIDENCE,
+            "preview_fps": Settings.PREVIEW_FPS,
+        }
+        start = Settings.QUALITY_START_LEVEL if start_level is None else start_level
+        self._set_level(min(max(start, 0), len(self.levels) - 1), "启动", time.perf_counter())
+
+    @property
+    def current(self):
+        """当前档位的参数"""
+        return self.levels[self.level]
+
+    def frame_done(self, busy, now=None):
+        """
+        记录一帧的处理耗时，到达评估窗口末尾时做一次决策
+
+        Args:
+            busy: 本帧处理耗时 (秒)，不含等待新画面的时间
+        Returns:
+            档位有变化时返回新档位编号，否则返回 None
+        """
+        now = time.perf_counter() if now is None else now
+        self._busy.append(busy)
+        if self._window_start is None:
+            self._window_start = now
+            return None
+        if now - self._window_start < self.window:
+            return None
+        median = float(np.median(self._busy))
+        self._busy.clear()
+        self._window_start = now
+        if self._settling:
+            self._settling = False
+            return None
+        return self._evaluate(median, now)
+
+    def _evaluate(self, median, now):
+        load = median / self.budget
+        if load > Settings.QUALITY_DOWN_RATIO:
+            self._up_windows = 0
+            if self.level + 1 >= len(self.levels):
+                return None
+            failed = self.level
+            if self._upgraded_at is not None:
+                # 升档后没能保持目标帧率：该档位进入冷却，冷却时间翻倍
+                backoff = self._backoff.get(failed, Settings.QUALITY_BACKOFF)
+                self._cooldown[failed] = now + backoff
+                self._backoff[failed] = min(backoff * 2, Settings.QUALITY_MAX_BACKOFF)
+                self._upgraded_at = None
+            self._set_level(self.level + 1, f"中位耗时 {median * 1000:.1f}ms 超过预算的 {load:.0%}", now)
+            return self.level
+
+        if load < Settings.QUALITY_UP_RATIO and self.level > 0:
+            self._up_windows += 1
+            if self._up_windows < Settings.QUALITY_UP_WINDOWS:
+                return None
+            target = self.level - 1
+            until = self._cooldown.get(target, 0.0)
+            if now < until:
+                if self._blocked_logged != until:
+                    log(f"画质: 可升至档位 {target}，但该档位冷却中（还剩 {until - now:.0f}s）")
+                    self._blocked_logged = until
+                return None
+            self._set_level(target, f"中位耗时 {median * 1000:.1f}ms 仅占预算的 {load:.0%}", now)
+            self._upgraded_at = now
+            return self.level
+
+        self._up_windows = 0
+        if self._upgraded_at is not None and load <= Settings.QUALITY_DOWN_RATIO:
+            # 升档后稳定运行了一个窗口，视为成功，恢复该档位的初始冷却时间
+            self._backoff.pop(self.level, None)
+            self._upgraded_at = None
+        return None
+
+    def _set_level(self, level, reason, now):
+        previous = self.level
+        self.level = level
+        self._up_windows = 0
+        self._settling = True
+        self._busy.clear()
+        self._window_start = None
+        params = self.levels[level]
+        if previous is not None:
+            self.changes += 1
+            self.decisions.append((now, previous, level, reason))
+        log(f"画质: 档位 {previous} -> {level} ({reason}): {describe_level(params)}"
+            if previous is not None else f"画质: 启动档位 {level}: {describe_level(params)}")
+        self._apply(params)
+
+    def _apply(self, params):
+        """把档位参数中与当前生效值不同的部分下发给各组件"""
+        changed = {k: v for k, v in params.items() if self._applied.get(k) != v}
+        if "resolution" in changed and self.camera is not None:
+            if self.camera.set_resolution(*params["resolution"]):
+                self._applied["resolution"] = params["resolution"]
+            else:
+                log("画质: 当前输入源不支持修改分辨率，保持原分辨率", WARNING)
+                self.camera = None
+        if any(k in changed for k in DETECTOR_PARAMS) and hasattr(self.detector, "reconfigure"):
+            self.detector.reconfigure(**{k: params[k] for k in DETECTOR_PARAMS})
+            self._applied.update({k: params[k] for k in DETECTOR_PARAMS})
+        if "preview_fps" in changed and self.preview is not None:
+            self.preview.set_max_fps(params["preview_fps"])
+            self._applied["preview_fps"] = params["preview_fps"]
+
+    def get_stats(self):
+        return {
+            "level": self.level,
+            "changes": self.changes,
+            "resolution": "x".join(map(str, self._applied["resolution"])),
+        }
@@ -0,0 +1,210 @@
+# pipeline/stages.py
+"""
+命令行与 GUI 共用的流水线阶段
+
+    CaptureStage -> DetectStage -> RecognizeStage -> OverlayStage -> (前端的显示阶段) [-> QualityStage] [-> TelemetryStage]
+
+回放录制的关键点时没有采集阶段，DetectStage 使用 ReplayHandDetector 作为数据源。
+显示出口（OpenCV 窗口、预览图片、Qt 预览）由各前端自己提供。
+"""
+import time
+
+import numpy as np
+from gesture.gesture_recognizer import HAND_CENTER_ID
+from utils.logger import WARNING, log, log_limited
+from .engine import BLOCK, EndOfStream, Stage
+
+
+def draw_overlay(img, states, fps):
+    """在画面上绘制各只手的手势文字与 FPS"""
+    import cv2
+    for k, state in enumerate(states or ()):
+        cv2.putText(img, state.caption, (10, 50 + 30 * k),
+                    cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 2)
+    cv2.putText(img, f"FPS: {fps}", (10, 20),
+                cv2.FONT_HERSHEY_PLAIN, 1, (255, 0, 0), 1)
+
+
+class CaptureStage(Stage):
+    """
+    从 Camera 读取最新一帧；输入结束（视频读完/摄像头读取失败）时结束流水线
+
+    等待新帧超时（摄像头打开慢、USB 卡顿、切换分辨率）只丢弃这一次读取，流水线继续等待下一帧。
+    """
+    name = "capture"
+    waits_for_input = True
+
+    def __init__(self, camera, profiler=None, timeout=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.camera = camera
+        self.profiler = profiler
+        self.timeout = timeout
+        self.failed = False  # 是否因读取失败而结束（而不是被要求停止）
+
+    def process(self, ctx):
+        # 帧由流水线在处理完成或被丢弃时释放，可以安全地交给其他线程中的阶段
+        frame = self.camera.read_frame(self.timeout, owned=True)
+        if frame is None:
+            if not self.camera.eof:
+                log_limited("capture_timeout", f"摄像头 {self.timeout:.1f}s 内没有新画面，继续等待", WARNING,
+                            timeouts=self.camera.timeouts)
+                return None
+            self.failed = True
+            raise EndOfStream("采集结束")
+        ctx.frame = frame
+        ctx.timestamp = ctx.origin = frame.timestamp
+        if self.profiler is not None:
+            self.profiler.mark("capture")
+            self.profiler.set_capture_timestamp(frame.timestamp)
+            self.profiler.record("flip", frame.flip_time)
+        return ctx
+
+
+class DetectStage(Stage):
+    """手部检测；draw=True 时在 frame.image 上绘制关键点与骨骼连线"""
+    name = "detect"
+
+    def __init__(self, detector, draw=True, **kwargs):
+        super().__init__(**kwargs)
+        self.detector = detector
+        self.draw = draw
+
+    def process(self, ctx):
+        detector = self.detector
+        if getattr(detector, "finished", False):
+            # 回放检测器：录制数据已经全部回放
+            raise EndOfStream("回放结束")
+        detector.find_hands(ctx.frame, draw=self.draw)
+        if ctx.frame is None:
+            ctx.timestamp = detector.timestamp
+        ctx.landmarks, ctx.handedness = detector.get_hands()
+        return ctx
+
+
+class RecognizeStage(Stage):
+    """
+    多手识别与动作执行
+
+    config_store 不为 None 时每帧比较一次快照版本号，变化时把新参数交给 HandManager（GUI 滑块调节）。
+    动作按帧顺序执行，丢帧可能漏掉按下/松开，因此该阶段的输入队列总是 "block"。
+    """
+    name = "recognize"
+    lossless = True
+
+    def __init__(self, hands, detector=None, profiler=None, config_store=None, **kwargs):
+        super().__init__(**kwargs)
+        self.hands = hands
+        self.detector = detector
+        self.profiler = profiler
+        self.config_store = config_store
+        self.config = config_store.current if config_store is not None else None
+
+    def process(self, ctx):
+        if self.config_store is not None and self.config_store.version != self.config.version:
+            self.config = self.config_store.current
+            self.hands.apply_config(self.config)
+        ctx.states = self.hands.process(ctx.landmarks, ctx.handedness, ctx.timestamp)
+        ctx.gesture = self.hands.gesture
+        if ctx.states:
+            if self.detector is not None:
+                # 检测器据此调整推理频率（拖拽时逐帧推理）
+                self.detector.set_gesture(ctx.gesture)
+            if self.profiler is not None:
+                self.profiler.mark_action()
+        return ctx
+
+
+class OverlayStage(Stage):
+    """在画面上绘制手势文字与 FPS"""
+    name = "overlay"
+
+    def __init__(self, profiler=None, **kwargs):
+        super().__init__(**kwargs)
+        self.profiler = profiler
+
+    def process(self, ctx):
+        if ctx.frame is not None:
+            fps = int(self.profiler.fps()) if self.profiler is not None else 0
+            draw_overlay(ctx.frame.image, ctx.states, fps)
+        if self.profiler is not None:
+            self.profiler.mark("overlay")
+        return ctx
+
+
+class QualityStage(Stage):
+    """把每帧的处理耗时交给自适应画质控制器 (pipeline.quality_controller)，应放在最后"""
+    name = "quality"
+
+    def __init__(self, controller, **kwargs):
+        super().__init__(**kwargs)
+        self.controller = controller
+
+    def process(self, ctx):
+        self.controller.frame_done(ctx.busy, time.perf_counter())
+        return ctx
+
+
+class TelemetryStage(Stage):
+    """
+    逐帧遥测：每帧一行写入 utils.telemetry.TelemetryWriter，应放在最后
+
+    列：时间戳、帧号、帧率、处理耗时、手数、代表手势、第一只手的中心与大小、之前各阶段的耗时、执行器累计命令数
+    """
+    name = "telemetry"
+
+    def __init__(self, path, stage_names, profiler=None, hands=None, **kwargs):
+        super().__init__(**kwargs)
+        from utils.telemetry import TelemetryWriter
+        self.stage_names = tuple(stage_names)
+        self.profiler = profiler
+        self.hands = hands
+        columns = (("time", "seq", "fps", "busy_ms", "hands", "gesture", "hand_x", "hand_y", "hand_size")
+                   + tuple(f"{name}_ms" for name in self.stage_names)
+                   + ("actuator_submitted", "actuator_executed", "actuator_dropped"))
+        self.writer = TelemetryWriter(path, columns)
+
+    def process(self, ctx):
+        landmarks = ctx.landmarks
+        count = len(landmarks) if landmarks is not None else 0
+        if count:
+            hand = landmarks[0]
+            x, y = round(float(hand[HAND_CENTER_ID, 0]), 4), round(float(hand[HAND_CENTER_ID, 1]), 4)
+            size = round(float(max(np.ptp(hand[:, 0]), np.ptp(hand[:, 1]))), 4)
+        else:
+            x = y = size = ""
+        timings = ctx.timings
+        row = [round(ctx.timestamp if ctx.timestamp is not None else ctx.origin, 4), ctx.seq,
+               round(self.profiler.fps(), 1) if self.profiler is not None else "",
+               round(ctx.busy * 1000.0, 3), count, ctx.gesture.name if ctx.gesture is not None else ""]
+        row += [x, y, size]
+        row += [round(timings[name] * 1000.0, 3) if name in timings else "" for name in self.stage_names]
+        actuator = self.hands.actuator if self.hands is not None else None
+        if actuator is not None:
+            row += [actuator.submitted, actuator.executed, actuator.dropped]
+        else:
+            row += ["", "", ""]
+        self.writer.record(row)
+        return ctx
+
+    def close(self):
+        self.writer.close()
+
+
+def apply_placement(stages, placement, queue_size=None, policy=None):
+    """
+    按 {阶段名: 执行位置} 调整各阶段的 mode，可同时统一设置队列大小与丢帧策略
+
+    第一个阶段是数据源，总是在调用 run() 的线程中执行（为它指定的位置被忽略并给出警告）；
+    lossless 的阶段（识别/执行）不使用统一的丢帧策略，固定为 "block"
+    """
+    if stages and stages[0].name in placement:
+        log(f"阶段 {stages[0].name} 是数据源，总是在调用线程中执行，忽略位置 {placement[stages[0].name]}", WARNING)
+    for i, stage in enumerate(stages):
+        if i > 0 and stage.name in placement:
+            stage.mode = placement[stage.name]
+        if queue_size is not None:
+            stage.queue_size = queue_size
+        if policy is not None:
+            stage.policy = BLOCK if stage.lossless else policy
+    return stages
+
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# 测试直接导入仓库根目录下的模块 (config, pipeline, control ...)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,98 @@
+# tests/test_actuator.py
+"""输入执行器：命令合并、按下/松开顺序、队列满时的处理与 stop() 之后的拒绝（RecordingBackend，不需要图形会话）"""
+import threading
+
+from control.actuator import CLICK, DOWN, MOVE, PRESS, UP, Actuator, RecordingBackend
+
+
+class GatedBackend(RecordingBackend):
+    """第一条命令在 gate 打开前不返回，用于在执行线程忙时填满队列"""
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def press(self, key):
+        self.started.set()
+        self.gate.wait(5.0)
+        super().press(key)
+
+
+def busy_actuator(maxsize):
+    """执行线程卡在一条 PRESS 上、队列为空的执行器"""
+    backend = GatedBackend()
+    actuator = Actuator(backend=backend, maxsize=maxsize, threaded=True)
+    actuator.press("busy")
+    assert backend.started.wait(5.0)
+    return actuator, backend
+
+
+def finish(actuator, backend):
+    backend.gate.set()
+    assert actuator.flush(5.0)
+    actuator.stop()
+    return [(op, args) for op, args in backend.events if args != ("busy",)]
+
+
+def test_consecutive_moves_coalesce():
+    actuator, backend = busy_actuator(maxsize=8)
+    for _ in range(5):
+        assert actuator.move(2, -1)
+    assert actuator.pending() == 1
+    assert finish(actuator, backend) == [(MOVE, (10, -5))]
+    assert actuator.get_stats()["coalesced"] == 4
+
+
+def test_down_up_order_is_kept():
+    actuator, backend = busy_actuator(maxsize=8)
+    actuator.down("left")
+    actuator.move(1, 1)
+    actuator.up("left")
+    actuator.down("right")
+    actuator.up("right")
+    assert [op for op, _ in finish(actuator, backend)] == [DOWN, MOVE, UP, DOWN, UP]
+
+
+def test_down_up_folds_into_click_when_full():
+    actuator, backend = busy_actuator(maxsize=2)
+    actuator.press("a")
+    actuator.down("left")
+    assert actuator.up("left")
+    assert actuator.pending() == 2
+    assert finish(actuator, backend) == [(PRESS, ("a",)), (CLICK, ("left",))]
+
+
+def test_moves_are_dropped_before_up():
+    actuator, backend = busy_actuator(maxsize=3)
+    actuator.down("left")
+    actuator.move(5, 0)
+    actuator.press("a")
+    # 队列已满：新的移动被丢弃，松开挤掉队列中的移动
+    assert not actuator.move(1, 0)
+    assert actuator.up("left")
+    assert finish(actuator, backend) == [(DOWN, ("left",)), (PRESS, ("a",)), (UP, ("left",))]
+    assert actuator.get_stats()["dropped"] == 2
+
+
+def test_up_is_never_dropped_and_submit_never_waits():
+    actuator, backend = busy_actuator(maxsize=2)
+    actuator.down("left")
+    actuator.press("a")
+    # 没有可丢弃的命令：按键被拒绝，松开超出上限入队
+    assert not actuator.press("b")
+    assert actuator.up("left")
+    assert actuator.pending() == 3
+    assert finish(actuator, backend) == [(DOWN, ("left",)), (PRESS, ("a",)), (UP, ("left",))]
+
+
+def test_submit_after_stop_is_rejected():
+    for threaded in (True, False):
+        backend = RecordingBackend()
+        actuator = Actuator(backend=backend, threaded=threaded)
+        assert actuator.click()
+        actuator.flush(5.0)
+        actuator.stop()
+        assert not actuator.down("left")
+        assert backend.events == [(CLICK, ("left",))]
+        stats = actuator.get_stats()
+        assert (stats["submitted"], stats["rejected"]) == (1, 1)
@@ -0,0 +1,117 @@
+# tests/test_camera.py
+"""采集：同步/线程模式读完视频、超时与 eof 的区分、丢帧/过期帧计数与 owned 帧的释放（临时目录中写出的小视频）"""
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from config import Settings
+from vision.camera import Camera
+
+WIDTH, HEIGHT = 64, 48
+
+
+def write_video(path, frames, fps=30.0):
+    """写出 frames 帧：左半边白、右半边黑，亮度随帧号变化"""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (WIDTH, HEIGHT))
+    if not writer.isOpened():
+        pytest.skip("无法写入测试视频")
+    for k in range(frames):
+        img = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        img[:, :WIDTH // 2] = 255 - 4 * k
+        writer.write(img)
+    writer.release()
+    return str(path)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_sync_reads_every_frame_then_eof(tmp_path):
+    camera = Camera(write_video(tmp_path / "clip.avi", 5), threaded=False)
+    try:
+        indexes = []
+        while True:
+            ok, frame = camera.read()
+            if not ok:
+                break
+            indexes.append(frame.index)
+            # 画面已镜像：原始左半边的白色在右半边
+            assert frame.image.shape == (HEIGHT, WIDTH, 3)
+            assert frame.image[:, -4:].mean() > 150 and frame.image[:, :4].mean() < 50
+            assert camera.timestamp == frame.timestamp
+        assert indexes == [1, 2, 3, 4, 5]
+        assert camera.eof
+        stats = camera.get_stats()
+        assert (stats["captured"], stats["dropped"], stats["timeouts"]) == (5, 0, 0)
+        # 同步模式只有一个槽位在循环使用
+        assert stats["pool_slots"] == 1
+    finally:
+        camera.release()
+
+
+def test_threaded_keeps_latest_frame_and_counts_dropped_and_stale(tmp_path):
+    camera = Camera(write_video(tmp_path / "clip.avi", 12), threaded=True, buffer_size=2, realtime=False)
+    try:
+        assert wait_for(lambda: camera.eof)
+        time.sleep(Settings.STALE_FRAME_AGE + 0.05)
+        frame = camera.read_frame(timeout=1.0)
+        # 处理跟不上时只拿到最新一帧，其余都计为丢弃；等待过久的帧计为过期
+        assert frame.index == 12
+        stats = camera.get_stats()
+        assert (stats["captured"], stats["dropped"], stats["stale"]) == (12, 11, 1)
+        # 输入结束后立即返回 None，不算超时
+        assert camera.read_frame(timeout=1.0) is None
+        assert camera.eof
+        assert camera.get_stats()["timeouts"] == 0
+    finally:
+        camera.release()
+
+
+def test_threaded_timeout_is_not_eof(tmp_path):
+    # 2 FPS 实时播放：第一帧之后 0.5 秒内没有新帧
+    camera = Camera(write_video(tmp_path / "slow.avi", 3, fps=2.0), threaded=True, realtime=True)
+    try:
+        first = camera.read_frame(timeout=2.0)
+        assert first.index == 1
+        assert camera.read_frame(timeout=0.05) is None
+        assert not camera.eof
+        assert camera.get_stats()["timeouts"] == 1
+        # 超时后继续读取，拿到后续的帧
+        assert camera.read_frame(timeout=2.0).index == 2
+        assert camera.get_stats()["stale"] == 0
+    finally:
+        camera.release()
+
+
+def test_owned_frames_are_released_by_caller(tmp_path):
+    camera = Camera(write_video(tmp_path / "clip.avi", 6), threaded=False)
+    try:
+        first = camera.read_frame(owned=True)
+        before = first.image.copy()
+        second = camera.read_frame(owned=True)
+        # owned 帧不随下一次读取释放，各占一个槽位，内容不被后续帧覆盖
+        assert camera.pool.size == 2
+        assert first.index == 1 and second.index == 2
+        np.testing.assert_array_equal(first.image, before)
+        assert first.image[:, -4:].mean() > second.image[:, -4:].mean()
+        first.release()
+        first.release()  # 重复释放无副作用
+        third = camera.read_frame()
+        assert camera.pool.size == 2
+        assert third.image is first.image  # 复用释放的槽位中的缓冲区
+        camera.read_frame()
+        camera.read_frame()
+        assert camera.pool.size == 2
+        second.release()
+        camera.read_frame()
+        assert camera.pool.size == 2
+    finally:
+        camera.release()
@@ -0,0 +1,124 @@
+# tests/test_gesture_classifier.py
+"""学习式手势分类：特征对旋转/尺度/平移/镜像不变，LearnedGestureRecognizer 可直接替换 GestureRecognizer"""
+import numpy as np
+import pytest
+
+from config import Settings
+from gesture.gesture_base import GestureType
+from gesture.gesture_classifier import LearnedGestureRecognizer, load_model, train_model
+from gesture.gesture_recognizer import GestureRecognizer, gesture_point
+from gesture.landmark_features import NUM_FEATURES, landmark_features
+from vision.landmark_utils import Landmark, LandmarkList
+
+
+def random_hands(n, seed=0):
+    return np.random.default_rng(seed).random((n, 21, 3), dtype=np.float32)
+
+
+def rotation(seed):
+    """随机三维旋转矩阵（QR 分解，行列式为 +1）"""
+    q, r = np.linalg.qr(np.random.default_rng(seed).normal(size=(3, 3)))
+    q *= np.sign(np.diag(r))
+    if np.linalg.det(q) < 0:
+        q[:, 0] = -q[:, 0]
+    return q
+
+
+def transform(hands, matrix, scale=1.0, shift=0.0):
+    """在像素比例坐标（x/z 按画面宽高比换算）中做线性变换，再换回归一化坐标"""
+    aspect = Settings.CAP_WIDTH / Settings.CAP_HEIGHT
+    axis = np.array([aspect, 1.0, aspect])
+    moved = (hands.astype(np.float64) * axis) @ matrix.T * scale + shift
+    return (moved / axis).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def model():
+    # 以规则引擎的输出作为标签，只验证推理路径，不关心分类质量
+    hands = random_hands(3000)
+    labels, _ = GestureRecognizer.classify_batch(hands)
+    return train_model("softmax", landmark_features(hands), labels, epochs=100)
+
+
+def test_feature_shape():
+    hands = random_hands(4)
+    assert landmark_features(hands).shape == (4, NUM_FEATURES)
+    assert landmark_features(hands[0]).shape == (NUM_FEATURES,)
+    np.testing.assert_allclose(landmark_features(hands[0]), landmark_features(hands)[0], rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_features_invariant_to_rotation_scale_and_shift(seed):
+    hands = random_hands(20, seed)
+    moved = transform(hands, rotation(seed), scale=0.4 + seed * 0.3, shift=np.array([0.1, -0.2, 0.05]))
+    np.testing.assert_allclose(landmark_features(moved), landmark_features(hands), atol=2e-3)
+
+
+def test_features_invariant_to_mirroring():
+    hands = random_hands(20)
+    mirrored = transform(hands, np.diag([-1.0, 1.0, 1.0]))
+    np.testing.assert_allclose(landmark_features(mirrored), landmark_features(hands), atol=2e-3)
+
+
+def test_bend_feature_decreases_with_joint_angle():
+    # 食指近节沿 y 轴，中节转过不同角度：夹角越大弯曲特征越小
+    values = []
+    for angle in (0.2, 0.8, 1.6, 2.4):
+        hand = np.zeros((21, 3), dtype=np.float32)
+        hand += np.linspace(0.0, 0.5, 21, dtype=np.float32)[:, None] * [0.3, 0.2, 0.1]  # 其余点不重合
+        hand[5] = [0.5, 0.5, 0.0]
+        hand[6] = [0.5, 0.4, 0.0]
+        hand[7] = hand[6] + 0.08 * np.array([np.sin(angle), -np.cos(angle), 0.0], dtype=np.float32)
+        values.append(landmark_features(hand)[4])  # bend_index_1：近节与中节
+    assert values == sorted(values, reverse=True)
+
+
+@pytest.mark.parametrize("min_confidence", [0.0, 0.5])
+def test_single_frame_matches_batch(model, min_confidence):
+    hands = random_hands(300, seed=7)
+    recognizer = LearnedGestureRecognizer(model, min_confidence)
+    single = [recognizer.recognize(hand)[0].value for hand in hands]
+    gestures, points = recognizer.classify_batch(hands)
+    assert single == gestures.tolist()
+    assert [model.predict_one(f, min_confidence) for f in landmark_features(hands)] == single
+    recognizers = [LearnedGestureRecognizer(model, min_confidence) for _ in range(3)]
+    assert [g.value for g, _ in LearnedGestureRecognizer.recognize_hands(recognizers, hands[:3])] == single[:3]
+
+
+def test_drop_in_replacement_for_rules_recognizer(model):
+    """与 GestureRecognizer 相同的调用方式与返回值：(GestureType, 定位点或 None)"""
+    learned = LearnedGestureRecognizer(model, min_confidence=0.0)
+    rules = GestureRecognizer()
+    seen = set()
+    for hand in random_hands(200, seed=11):
+        for lm in (hand, LandmarkList(hand), LandmarkList(hand).landmark):
+            for recognizer in (rules, learned):
+                recognizer.update_fingers_status(lm, Settings.CAP_HEIGHT)
+                gesture, info = recognizer.recognize(lm)
+                assert isinstance(gesture, GestureType)
+                expected = gesture_point(gesture, hand)
+                if expected is None:
+                    assert info is None
+                else:
+                    assert isinstance(info, Landmark)
+                    assert (info.x, info.y, info.z) == pytest.approx((expected.x, expected.y, expected.z))
+                if recognizer is learned:
+                    seen.add(gesture)
+    assert len(seen) > 1
+    for recognizer in (rules, learned):
+        assert recognizer.recognize(None) == (GestureType.NONE, None)
+        recognizer.reset()
+
+
+def test_model_round_trip_and_feature_version(model, tmp_path):
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = load_model(path)
+    features = landmark_features(random_hands(50, seed=3))
+    assert loaded.predict(features, 0.5).tolist() == model.predict(features, 0.5).tolist()
+    # 旧版本特征训练的模型（没有 feature_version）需要重新训练
+    with np.load(path) as data:
+        params = {k: data[k] for k in data.files if k != "feature_version"}
+    np.savez(path, **params)
+    with pytest.raises(ValueError):
+        load_model(path)
@@ -0,0 +1,72 @@
+# tests/test_gesture_filter.py
+"""手势稳定过滤器：进入/退出帧数、最短保持时间与被抑制的跳变计数（合成的手势序列）"""
+from control.actuator import Actuator, RecordingBackend
+from gesture.gesture_base import GestureType
+from gesture.gesture_filter import GestureFilter
+from pipeline.hand_manager import HandState
+
+N = GestureType.NONE
+P = GestureType.POINTING
+D = GestureType.DRAGGING
+L = GestureType.LEFT_CLICK
+
+FPS = 30.0
+
+
+def run(flt, sequence, start=0):
+    """逐帧输入手势序列（帧间隔 1/FPS），返回每帧的输出手势"""
+    return [flt.update(g, None, None, (start + k) / FPS)[0] for k, g in enumerate(sequence)]
+
+
+def test_enter_frames():
+    flt = GestureFilter(enter_frames=3, exit_frames=1, enter_overrides={}, min_dwell={})
+    assert run(flt, [P, P, P, P]) == [N, N, P, P]
+    assert flt.transitions == 1
+
+
+def test_enter_override_per_gesture():
+    flt = GestureFilter(enter_frames=1, exit_frames=1, enter_overrides={"LEFT_CLICK": 3}, min_dwell={})
+    assert run(flt, [P, L, L, L]) == [P, P, P, L]
+
+
+def test_exit_frames():
+    flt = GestureFilter(enter_frames=1, exit_frames=3, enter_overrides={}, min_dwell={})
+    # 初始的 NONE 同样要连续消失 3 帧；之后夹着的单帧/两帧跳变不会让 POINTING 退出
+    assert run(flt, [P, P, P, N, P, N, N, P, N, N, N]) == [N, N, P, P, P, P, P, P, P, P, N]
+
+
+def test_min_dwell():
+    flt = GestureFilter(enter_frames=1, exit_frames=1, enter_overrides={}, min_dwell={"DRAGGING": 0.12})
+    # DRAGGING 在第 0 帧生效，之后 0.12 秒（3 帧多）之内不会切换
+    out = run(flt, [D, N, N, N, N])
+    assert out == [D, D, D, D, N]
+
+
+def test_suppressed_counts_filtered_flicker():
+    flt = GestureFilter(enter_frames=2, exit_frames=2, enter_overrides={}, min_dwell={})
+    out = run(flt, [P, P, N, P, N, P, P, N, N, N])
+    assert out == [N, P, P, P, P, P, P, P, N, N]
+    assert flt.get_stats() == {"raw_transitions": 5, "transitions": 2, "suppressed": 3}
+
+
+def test_reset_forgets_candidate_and_dwell():
+    flt = GestureFilter(enter_frames=2, exit_frames=1, enter_overrides={}, min_dwell={"DRAGGING": 1.0})
+    run(flt, [D, D, P])
+    assert flt.gesture == D
+    flt.reset()
+    assert flt.gesture == N
+    # 重置后的 DRAGGING 候选需要重新累计 enter_frames，不会立即生效
+    assert run(flt, [D, D], start=10) == [N, D]
+
+
+def test_hand_state_lose_resets_filter_and_recognizer():
+    state = HandState(None, Actuator(backend=RecordingBackend(), threaded=False))
+    state.filter = GestureFilter(enter_frames=2, exit_frames=1, enter_overrides={}, min_dwell={})
+    run(state.filter, [D, D, D])
+    state.recognizer.fingers = [0, 1, 0, 0, 0]
+    state.lose()
+    assert not state.present
+    assert state.filter.gesture == N
+    assert state.recognizer.fingers == []
+    # 重新出现的第一帧不会直接输出丢失前的 DRAGGING
+    assert run(state.filter, [D], start=10) == [N]
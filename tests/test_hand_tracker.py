@@ -0,0 +1,87 @@
+# tests/test_hand_tracker.py
+"""多手跟踪：检测顺序变化时编号稳定、左右手标签惩罚、距离上限与丢失帧数上限（合成的手掌位置）"""
+import numpy as np
+
+from vision.hand_tracker import PALM_ID, HandTracker
+
+LEFT, RIGHT, UNKNOWN = 0, 1, -1
+
+
+def hands(*centers):
+    """每只手的 21 个关键点都放在给定的手掌中心"""
+    landmarks = np.zeros((len(centers), 21, 3), dtype=np.float32)
+    for k, (x, y) in enumerate(centers):
+        landmarks[k, :, 0] = x
+        landmarks[k, :, 1] = y
+    return landmarks
+
+
+def labels(*values):
+    return np.array(values, dtype=np.int8)
+
+
+def ids(visible):
+    return [track.hand_id for track in visible]
+
+
+def make_tracker():
+    return HandTracker(max_distance=0.2, label_penalty=0.5, max_misses=2)
+
+
+def test_ids_follow_hands_when_detection_order_swaps():
+    tracker = make_tracker()
+    first, _ = tracker.update(hands((0.2, 0.5), (0.8, 0.5)), labels(LEFT, RIGHT))
+    assert ids(first) == [0, 1]
+    visible, removed = tracker.update(hands((0.81, 0.52), (0.21, 0.49)), labels(RIGHT, LEFT))
+    assert ids(visible) == [1, 0]
+    assert removed == []
+    assert visible[0].age == 2 and visible[0].misses == 0
+    np.testing.assert_allclose(visible[0].center, [0.81, 0.52])
+    assert visible[0].landmarks[PALM_ID, 0] == np.float32(0.81)
+
+
+def test_label_penalty_keeps_crossing_hands_apart():
+    tracker = make_tracker()
+    tracker.update(hands((0.45, 0.5), (0.55, 0.5)), labels(LEFT, RIGHT))
+    # 两只手交叉：按距离左手更接近右手的旧位置，但标签不一致的代价更高
+    visible, _ = tracker.update(hands((0.54, 0.5), (0.46, 0.5)), labels(LEFT, RIGHT))
+    assert ids(visible) == [0, 1]
+    # 标签未知时只按距离匹配
+    visible, _ = tracker.update(hands((0.47, 0.5)), labels(UNKNOWN))
+    assert ids(visible) == [1]
+    assert visible[0].handedness == UNKNOWN
+
+
+def test_far_jump_starts_a_new_track():
+    tracker = make_tracker()
+    tracker.update(hands((0.2, 0.5)), labels(RIGHT))
+    visible, _ = tracker.update(hands((0.7, 0.5)), labels(RIGHT))
+    assert ids(visible) == [1]
+    old = [track for track in tracker.tracks if track.hand_id == 0][0]
+    assert old.misses == 1
+
+
+def test_lost_hand_keeps_id_within_max_misses_then_is_removed():
+    tracker = make_tracker()
+    tracker.update(hands((0.3, 0.5)), labels(LEFT))
+    for _ in range(2):
+        visible, removed = tracker.update(hands(), labels())
+        assert visible == [] and removed == []
+    visible, _ = tracker.update(hands((0.32, 0.5)), labels(LEFT))
+    assert ids(visible) == [0]
+    assert visible[0].misses == 0
+    for _ in range(2):
+        tracker.update(hands(), labels())
+    visible, removed = tracker.update(hands(), labels())
+    assert ids(removed) == [0]
+    assert tracker.tracks == []
+    # 删除后再出现是新的编号
+    visible, _ = tracker.update(hands((0.3, 0.5)), labels(LEFT))
+    assert ids(visible) == [1]
+
+
+def test_reset_returns_all_tracks():
+    tracker = make_tracker()
+    tracker.update(hands((0.2, 0.5), (0.8, 0.5)), labels(LEFT, RIGHT))
+    assert ids(tracker.reset()) == [0, 1]
+    assert tracker.tracks == []
@@ -0,0 +1,88 @@
+# tests/test_landmark_recorder.py
+"""关键点录制 -> 回放的往返：跨块写出、空录制、多只手与回放结束标志"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from vision.landmark_recorder import LandmarkRecorder, LandmarkReplay, ReplayHandDetector
+
+
+def mediapipe_results(hands, labels, scores):
+    """与 hands.process() 返回值结构相同的对象"""
+    return SimpleNamespace(
+        multi_hand_landmarks=[SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in arr.tolist()])
+                              for arr in hands] or None,
+        multi_handedness=[SimpleNamespace(classification=[SimpleNamespace(label=label, score=score)])
+                          for label, score in zip(labels, scores)] or None,
+    )
+
+
+def record(path, frames, chunk_size, max_hands=2, seed=0):
+    """录制 frames 帧，第 k 帧有 k % (max_hands + 1) 只手，返回每帧写入的关键点"""
+    rng = np.random.default_rng(seed)
+    recorder = LandmarkRecorder(str(path), max_hands=max_hands, chunk_size=chunk_size)
+    expected = []
+    for k in range(frames):
+        n = k % (max_hands + 1)
+        hands = rng.random((n, 21, 3)).astype(np.float32)
+        if k % 2:
+            recorder.add(mediapipe_results(hands, ["Left", "Right"][:n], [0.9] * n), timestamp=k / 30.0)
+        else:
+            recorder.add_arrays(hands, np.array([0, 1][:n], dtype=np.int8), np.full(n, 0.9, np.float32), n,
+                                timestamp=k / 30.0)
+        expected.append(hands)
+    assert recorder.frame_count == frames
+    assert recorder.save() == str(path)
+    return expected
+
+
+@pytest.mark.parametrize("frames, chunk_size", [(7, 3), (6, 3), (3, 3), (2, 3), (1, 1)])
+def test_round_trip_across_chunk_boundaries(tmp_path, frames, chunk_size):
+    expected = record(tmp_path / "rec", frames, chunk_size)
+    replay = LandmarkReplay(str(tmp_path / "rec"))
+    assert len(replay) == frames
+    assert replay.landmarks.shape == (frames, 2, 21, 3)
+    np.testing.assert_allclose(replay.timestamps, np.arange(frames) / 30.0)
+    for k, hands in enumerate(expected):
+        n = len(hands)
+        assert replay.num_hands[k] == n
+        np.testing.assert_allclose(replay.landmarks[k, :n], hands, rtol=1e-6)
+        # 没有手的位置保持填充值，不会残留上一块的数据
+        assert np.isnan(replay.landmarks[k, n:]).all()
+        assert replay.handedness[k].tolist() == [0, 1][:n] + [-1] * (2 - n)
+
+
+def test_replay_detector_walks_frames_and_sets_finished(tmp_path):
+    expected = record(tmp_path / "rec", 5, chunk_size=2)
+    detector = ReplayHandDetector(str(tmp_path / "rec"))
+    assert not detector.finished
+    for k, hands in enumerate(expected):
+        detector.find_hands(None)
+        landmarks, handedness = detector.get_hands()
+        np.testing.assert_allclose(landmarks, hands, rtol=1e-6)
+        assert handedness.tolist() == [0, 1][:len(hands)]
+        assert detector.timestamp == pytest.approx(k / 30.0)
+        assert detector.finished == (k == len(expected) - 1)
+        assert (detector.get_landmarks() is None) == (len(hands) == 0)
+    assert detector.get_stats() == {"replayed_frames": 5, "total_frames": 5}
+
+
+def test_empty_recording(tmp_path):
+    recorder = LandmarkRecorder(str(tmp_path / "empty"), max_hands=2)
+    recorder.save()
+    replay = LandmarkReplay(str(tmp_path / "empty"))
+    assert len(replay) == 0
+    assert replay.landmarks.shape == (0, 2, 21, 3)
+    detector = ReplayHandDetector(str(tmp_path / "empty"))
+    assert detector.finished
+    assert detector.get_landmarks() is None
+
+
+def test_add_after_save_is_rejected(tmp_path):
+    recorder = LandmarkRecorder(str(tmp_path / "rec"), max_hands=1, chunk_size=2)
+    recorder.add_arrays(np.zeros((1, 21, 3), np.float32), np.zeros(1, np.int8), np.ones(1, np.float32), 1)
+    recorder.save()
+    with pytest.raises(RuntimeError):
+        recorder.add_arrays(np.zeros((1, 21, 3), np.float32), np.zeros(1, np.int8), np.ones(1, np.float32), 1)
+    assert len(LandmarkReplay(str(tmp_path / "rec"))) == 1
@@ -0,0 +1,209 @@
+# tests/test_pipeline_engine.py
+"""流水线引擎：丢帧策略、停止、错误传播与 asyncio 阶段（只用内联定义的假阶段，不需要摄像头/MediaPipe）"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pipeline.engine import (ASYNCIO, BLOCK, DROP_NEWEST, DROP_OLDEST, THREAD, BoundedQueue, EndOfStream,
+                             FrameContext, Pipeline, Stage)
+from pipeline.stages import RecognizeStage, apply_placement
+
+
+class FakeFrame:
+    """记录是否被归还的帧"""
+    def __init__(self, released):
+        self.released = released
+
+    def release(self):
+        self.released.append(self)
+
+
+class Source(Stage):
+    """数据源：为每个 ctx 挂一个 FakeFrame，产生 count 帧后结束"""
+    name = "source"
+
+    def __init__(self, count, **kwargs):
+        super().__init__(**kwargs)
+        self.count = count
+        self.released = []
+
+    def process(self, ctx):
+        if ctx.seq > self.count:
+            raise EndOfStream()
+        ctx.frame = FakeFrame(self.released)
+        return ctx
+
+
+class Sink(Stage):
+    """记录到达的帧序号，可选地在每帧上等待 delay 秒或等待 gate"""
+    name = "sink"
+
+    def __init__(self, delay=0.0, gate=None, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.gate = gate
+        self.seqs = []
+        self.threads = set()
+        self.closed = False
+
+    def process(self, ctx):
+        if self.gate is not None:
+            self.gate.wait(5.0)
+        if self.delay:
+            time.sleep(self.delay)
+        self.seqs.append(ctx.seq)
+        self.threads.add(threading.current_thread().name)
+        return ctx
+
+    def close(self):
+        self.closed = True
+
+
+def make_ctx(seq, released):
+    ctx = FrameContext(seq)
+    ctx.frame = FakeFrame(released)
+    return ctx
+
+
+@pytest.mark.parametrize("policy, kept, dropped", [
+    (DROP_OLDEST, [2, 3], [1]),
+    (DROP_NEWEST, [1, 2], [3]),
+])
+def test_queue_drop_policies_release_dropped_frames(policy, kept, dropped):
+    released = []
+    q = BoundedQueue(maxsize=2, policy=policy)
+    items = [make_ctx(seq, released) for seq in (1, 2, 3)]
+    frames = [ctx.frame for ctx in items]
+    for ctx in items:
+        q.put(ctx)
+    assert [q.get(timeout=0).seq for _ in range(len(q))] == kept
+    assert q.dropped == 1
+    assert released == [frames[seq - 1] for seq in dropped]
+
+
+def test_queue_block_waits_for_space():
+    q = BoundedQueue(maxsize=1, policy=BLOCK)
+    q.put(1)
+    assert q.put(2, timeout=0.05) is False
+    threading.Timer(0.05, q.get).start()
+    assert q.put(3, timeout=2.0) is True
+    assert q.get(timeout=0) == 3
+    assert q.dropped == 1
+
+
+def test_block_policy_delivers_every_frame():
+    source = Source(20)
+    sink = Sink(delay=0.002, mode=THREAD, queue_size=1, policy=BLOCK)
+    pipeline = Pipeline([source, sink])
+    assert pipeline.run() == 20
+    assert sink.seqs == list(range(1, 21))
+    assert pipeline.queues[0].dropped == 0
+    assert len(source.released) == 20
+
+
+def test_drop_oldest_keeps_latest_frame():
+    gate = threading.Event()
+    source = Source(10)
+    sink = Sink(gate=gate, mode=THREAD, queue_size=1, policy=DROP_OLDEST)
+    pipeline = Pipeline([source, sink])
+    threading.Timer(0.2, gate.set).start()
+    frames = pipeline.run()
+    # 下游卡住期间只保留最新的一帧，最后一帧一定被处理
+    assert sink.seqs[-1] == 10
+    assert frames == len(sink.seqs) < 10
+    assert pipeline.queues[0].dropped == 10 - frames
+    assert len(source.released) == 10
+
+
+def test_drop_newest_keeps_oldest_frame():
+    gate = threading.Event()
+    source = Source(10)
+    sink = Sink(gate=gate, mode=THREAD, queue_size=1, policy=DROP_NEWEST)
+    pipeline = Pipeline([source, sink])
+    threading.Timer(0.2, gate.set).start()
+    frames = pipeline.run()
+    assert sink.seqs[0] == 1
+    assert frames < 10
+    assert pipeline.queues[0].dropped == 10 - frames
+    assert len(source.released) == 10
+
+
+def test_stop_ends_pipeline_and_closes_stages():
+    class Stopper(Stage):
+        name = "stopper"
+
+        def __init__(self, pipeline_ref, **kwargs):
+            super().__init__(**kwargs)
+            self.pipeline_ref = pipeline_ref
+
+        def process(self, ctx):
+            if ctx.seq == 5:
+                self.pipeline_ref[0].stop()
+            return ctx
+
+    ref = []
+    source = Source(1000)
+    sink = Sink(mode=THREAD, policy=BLOCK)
+    pipeline = Pipeline([source, Stopper(ref), sink])
+    ref.append(pipeline)
+    assert pipeline.run() == 5
+    assert pipeline.stopped
+    assert sink.closed
+    assert len(source.released) == 5
+
+
+def test_stage_error_propagates_and_releases_frame():
+    class Broken(Stage):
+        name = "broken"
+
+        def process(self, ctx):
+            if ctx.seq == 3:
+                raise ValueError("boom")
+            return ctx
+
+    source = Source(1000)
+    sink = Sink(policy=BLOCK)
+    pipeline = Pipeline([source, Broken(mode=THREAD, policy=BLOCK), sink])
+    with pytest.raises(ValueError, match="boom"):
+        pipeline.run()
+    assert sink.seqs == [1, 2]
+    assert sink.closed
+    # 出错的帧也被归还
+    assert len(source.released) == pipeline.produced
+
+
+def test_asyncio_stage():
+    class AsyncStage(Stage):
+        name = "async"
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.threads = set()
+
+        async def process(self, ctx):
+            await asyncio.sleep(0)
+            self.threads.add(threading.current_thread().name)
+            return ctx
+
+    source = Source(10)
+    stage = AsyncStage(mode=ASYNCIO, policy=BLOCK)
+    sink = Sink(policy=BLOCK)
+    pipeline = Pipeline([source, stage, sink], name="test")
+    assert pipeline.run() == 10
+    assert sink.seqs == list(range(1, 11))
+    assert stage.threads == {"test-asyncio"}
+    assert sink.threads == {"test-asyncio"}
+    assert len(source.released) == 10
+
+
+def test_apply_placement_ignores_source_and_keeps_recognize_lossless():
+    source = Source(1)
+    recognize = RecognizeStage(hands=None)
+    sink = Sink()
+    apply_placement([source, recognize, sink], {"source": THREAD, "recognize": THREAD, "sink": ASYNCIO},
+                    queue_size=3, policy=DROP_NEWEST)
+    assert source.mode == "inline"
+    assert (recognize.mode, recognize.policy, recognize.queue_size) == (THREAD, BLOCK, 3)
+    assert (sink.mode, sink.policy) == (ASYNCIO, DROP_NEWEST)
@@ -0,0 +1,61 @@
+# tests/test_scroll_engine.py
+"""速度式滚动：同样的手势在不同帧率下滚动的总量相同，离开模式时只停止一次（同步执行器 + RecordingBackend，不需要图形会话）"""
+import pytest
+
+from control.actuator import WHEEL, Actuator, RecordingBackend
+from gesture.gesture_base import GestureType
+from pipeline.action_mapper import ActionMapper
+from vision.landmark_utils import Landmark
+
+DURATION = 2.0
+ORIGIN_Y = 0.5
+# 偏移 0.0825，超出死区 (0.05) 0.0325 -> 0.0325 x SCROLL_SPEED (10) x SCROLL_VELOCITY_SCALE (10) = 3.25 格/秒，
+# 2 秒 6.5 格：取整后的总量远离整数边界，不受浮点累积误差影响
+HAND_Y = ORIGIN_Y - 0.0825
+
+
+def scroll_total(fps):
+    backend = RecordingBackend()
+    mapper = ActionMapper(Actuator(backend=backend, threaded=False))
+    # 摇杆滤波器对阶跃输入的滞后与帧间隔有关，这里只比较滚动引擎本身
+    mapper.joystick_filter = None
+    frames = round(DURATION * fps)
+    # 第 0 帧只记录原点，第 1 帧开始滚动，之后 DURATION 秒内逐帧保持同一偏移
+    mapper.execute(GestureType.SCROLL_MODE, Landmark(0.5, ORIGIN_Y, 0.0), 0.0)
+    for k in range(1, frames + 2):
+        mapper.execute(GestureType.SCROLL_MODE, Landmark(0.5, HAND_Y, 0.0), k / fps)
+    mapper.execute(GestureType.NONE, None, (frames + 1) / fps)
+    return sum(args[1] for op, args in backend.events if op == WHEEL)
+
+
+def test_scroll_total_is_frame_rate_independent():
+    totals = {fps: scroll_total(fps) for fps in (15, 30, 60)}
+    assert totals[15] == totals[30] == totals[60] == pytest.approx(6.0)
+
+
+def test_leaving_scroll_mode_stops_scrolling_once():
+    mapper = ActionMapper(Actuator(backend=RecordingBackend(), threaded=False))
+    mapper.joystick_filter = None
+    calls = []
+    set_velocity = mapper.mouse.set_scroll_velocity
+    mapper.mouse.set_scroll_velocity = lambda vx, vy, now=None: (calls.append((vx, vy)), set_velocity(vx, vy, now))
+    resets = []
+    reset_volume = mapper.volume.reset
+    mapper.volume.reset = lambda: (resets.append(True), reset_volume())
+    # 其他手势的帧不再重复停止滚动/重置音量
+    for k in range(5):
+        mapper.execute(GestureType.POINTING, Landmark(0.5, 0.5, 0.0), k / 30)
+    assert calls == [] and resets == []
+    mapper.execute(GestureType.SCROLL_MODE, Landmark(0.5, ORIGIN_Y, 0.0), 0.2)
+    mapper.execute(GestureType.SCROLL_MODE, Landmark(0.5, HAND_Y, 0.0), 0.25)
+    assert calls[-1][1] > 0
+    for k in range(3):
+        mapper.execute(GestureType.NONE, None, 0.3 + k / 30)
+    assert calls[-1] == (0.0, 0.0)
+    assert calls.count((0.0, 0.0)) == 1
+    assert mapper.origin_pos is None
+    mapper.execute(GestureType.VOLUME_MODE, Landmark(0.5, 0.5, 0.0), 0.5)
+    mapper.execute(GestureType.VOLUME_MODE, Landmark(0.5, 0.5, 0.0), 0.55)
+    mapper.execute(GestureType.POINTING, Landmark(0.5, 0.5, 0.0), 0.6)
+    mapper.execute(GestureType.POINTING, Landmark(0.5, 0.5, 0.0), 0.65)
+    assert len(resets) == 2  # VolumeController.begin() 一次 + 离开音量模式一次
@@ -0,0 +1,73 @@
+# tests/test_smoothing.py
+"""光标平滑器：阶跃输入的收敛、reset() 与 GUI 平滑系数的换算（合成的坐标序列，固定时间戳）"""
+import pytest
+
+from utils.smoothing import DoubleExponentialSmoother, OneEuroFilter, Smoother, _factor_to_cutoff
+
+FPS = 30.0
+
+
+def step_response(smoother, frames, before=10, start=0):
+    """先在 (0, 0) 静止 before 帧，再阶跃到 (1, 0.5) 并保持 frames 帧，返回阶跃后每帧的输出"""
+    for k in range(before):
+        smoother.get_smoothed_coords(0.0, 0.0, (start + k) / FPS)
+    return [smoother.get_smoothed_coords(1.0, 0.5, (start + before + k) / FPS) for k in range(frames)]
+
+
+@pytest.mark.parametrize("make", [
+    lambda: Smoother(0.2),
+    lambda: OneEuroFilter(min_cutoff=1.0, beta=20.0, d_cutoff=1.0),
+    lambda: DoubleExponentialSmoother(smoothing_factor=0.2, trend_factor=0.05),
+])
+def test_step_converges(make):
+    out = step_response(make(), frames=150)
+    # 阶跃后第一帧不会直接跳到目标，5 秒后收敛
+    assert out[0][0] < 1.0
+    assert out[-1] == pytest.approx((1.0, 0.5), abs=1e-3)
+
+
+def test_one_euro_follows_fast_motion_faster_than_static_cutoff():
+    static = step_response(OneEuroFilter(min_cutoff=1.0, beta=0.0, d_cutoff=1.0), frames=5)
+    adaptive = step_response(OneEuroFilter(min_cutoff=1.0, beta=20.0, d_cutoff=1.0), frames=5)
+    assert adaptive[0][0] > static[0][0]
+
+
+def test_double_exp_has_no_lag_on_constant_velocity():
+    smoother = DoubleExponentialSmoother(smoothing_factor=0.2, trend_factor=0.05)
+    for k in range(300):
+        x, _ = smoother.get_smoothed_coords(0.01 * k, 0.0, k / FPS)
+    assert x == pytest.approx(0.01 * 299, abs=1e-3)
+
+
+@pytest.mark.parametrize("make", [OneEuroFilter, DoubleExponentialSmoother])
+def test_reset_restarts_from_next_sample(make):
+    smoother = make()
+    step_response(smoother, frames=3)
+    smoother.reset()
+    assert smoother.smoothed_x is None
+    # 重置后第一帧原样输出，之后不带重置前的速度/趋势
+    assert smoother.get_smoothed_coords(0.3, 0.7, 100.0) == (0.3, 0.7)
+    assert smoother.get_smoothed_coords(0.3, 0.7, 100.0 + 1 / FPS) == pytest.approx((0.3, 0.7))
+
+
+def test_one_euro_smoothing_factor_sets_static_cutoff():
+    smoother = OneEuroFilter(min_cutoff=1.0, beta=0.0, d_cutoff=1.0)
+    smoother.update_smoothing_factor(0.5)
+    assert smoother.min_cutoff == pytest.approx(_factor_to_cutoff(0.5))
+    # 没有速度项时，按系数换算的截止频率在 Settings.FPS 下与同系数的指数平滑逐帧一致
+    ema = Smoother(0.5)
+    for got, want in zip(step_response(smoother, frames=5), step_response(ema, frames=5)):
+        assert got == pytest.approx(want)
+    # 系数越大截止频率越高
+    assert _factor_to_cutoff(0.2) < _factor_to_cutoff(0.5) < _factor_to_cutoff(0.9)
+
+
+def test_double_exp_smoothing_factor_is_clamped():
+    smoother = DoubleExponentialSmoother(smoothing_factor=0.2, trend_factor=0.05)
+    smoother.update_smoothing_factor(1.5)
+    assert smoother.smoothing_factor == 1.0
+    smoother.update_smoothing_factor(-1)
+    assert smoother.smoothing_factor == 0.0
+    smoother.update_smoothing_factor(0.6)
+    slow = step_response(DoubleExponentialSmoother(smoothing_factor=0.2, trend_factor=0.05), frames=1)
+    assert step_response(smoother, frames=1)[0][0] > slow[0][0]
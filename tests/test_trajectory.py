@@ -0,0 +1,150 @@
+# tests/test_trajectory.py
+"""关键点历史环形缓冲区与轨迹手势：窗口查询、环绕写入、挥动/缩放的触发与冷却（合成的手掌轨迹）"""
+import numpy as np
+import pytest
+
+from config import Settings
+from gesture.gesture_base import GestureType
+from gesture.gesture_recognizer import HAND_CENTER_ID
+from gesture.trajectory_recognizer import TrajectoryRecognizer
+from utils.landmark_history import LandmarkHistory
+
+FPS = 30.0
+
+
+def hand(x, y, size=0.1):
+    """手掌中心在 (x, y)、手掌三角形（手腕、食指根、小指根）边长约为 size 的关键点"""
+    arr = np.zeros((21, 3), dtype=np.float32)
+    arr[:, 0], arr[:, 1] = x, y
+    aspect = Settings.CAP_WIDTH / Settings.CAP_HEIGHT
+    for point, (dx, dy) in zip((0, 5, 17), ((0.0, 0.58), (-0.5, -0.29), (0.5, -0.29))):
+        arr[point, 0] = x + dx * size / aspect
+        arr[point, 1] = y + dy * size
+    return arr
+
+
+def point(x, y):
+    arr = np.zeros((21, 3), dtype=np.float32)
+    arr[:, 0], arr[:, 1] = x, y
+    return arr
+
+
+# ---------- LandmarkHistory ----------
+
+def test_history_wraps_and_returns_latest_frames_in_order():
+    history = LandmarkHistory(capacity=4)
+    for k in range(10):
+        history.append(point(k, 0), k / FPS)
+    times, landmarks = history.window()
+    assert len(history) == 4
+    np.testing.assert_allclose(times, np.arange(6, 10) / FPS)
+    assert landmarks[:, 0, 0].tolist() == [6, 7, 8, 9]
+    assert history.latest_time == pytest.approx(9 / FPS)
+    # 返回的是内部数组的只读视图
+    assert not landmarks.flags.writeable
+    assert np.shares_memory(landmarks, history._landmarks)
+
+
+def test_history_window_by_duration_and_since():
+    history = LandmarkHistory(capacity=8)
+    for k in range(6):
+        history.append(point(k, 0), k * 0.1)
+    times, _ = history.window(duration=0.2)
+    np.testing.assert_allclose(times, [0.3, 0.4, 0.5])
+    times, _ = history.window(since=0.35)
+    np.testing.assert_allclose(times, [0.4, 0.5])
+    times, _ = history.window(duration=0.3, since=0.35)
+    np.testing.assert_allclose(times, [0.4, 0.5])
+
+
+def test_history_motion_queries():
+    history = LandmarkHistory(capacity=16)
+    assert history.velocity(0) is None
+    assert history.path_length(0) == 0.0
+    # x 匀加速 (a = 2)，y 匀速 (v = -1)
+    for k in range(11):
+        t = k * 0.1
+        history.append(point(t * t, -t), t)
+    delta, elapsed = history.displacement(0)
+    np.testing.assert_allclose(delta, [1.0, -1.0], atol=1e-6)
+    assert elapsed == pytest.approx(1.0)
+    np.testing.assert_allclose(history.velocity(0, duration=0.5), [1.5, -1.0], atol=1e-5)
+    np.testing.assert_allclose(history.acceleration(0), [2.0, 0.0], atol=1e-4)
+    assert history.path_length(0) == pytest.approx(sum(
+        np.hypot((k + 1) ** 2 / 100 - k ** 2 / 100, 0.1) for k in range(10)), rel=1e-5)
+    history.clear()
+    assert len(history) == 0 and history.latest_time is None
+    assert history.displacement(0) == (None, 0.0)
+
+
+# ---------- TrajectoryRecognizer ----------
+
+def make_recognizer(swipe=True, zoom=True):
+    recognizer = TrajectoryRecognizer(LandmarkHistory(32))
+    recognizer.enable_swipe = swipe
+    recognizer.enable_zoom = zoom
+    return recognizer
+
+
+def feed(recognizer, frames, gesture=GestureType.NONE, start=0.0):
+    """逐帧输入，返回 [(帧号, 事件)]"""
+    events = []
+    for k, arr in enumerate(frames):
+        event = recognizer.update(arr, gesture, start + k / FPS)
+        if event is not None:
+            events.append((k, event))
+    return events
+
+
+def test_swipe_right_fires_once_then_cools_down():
+    recognizer = make_recognizer(zoom=False)
+    # 0.3 秒内手掌向右移动半个画面
+    frames = [hand(0.2 + 0.05 * k, 0.5) for k in range(10)] + [hand(0.65, 0.5)] * 10
+    events = feed(recognizer, frames)
+    assert [event for _, event in events] == [GestureType.SWIPE_RIGHT]
+    assert recognizer.events == 1
+    assert recognizer.history.window()[1][-1, HAND_CENTER_ID, 0] == pytest.approx(0.65)
+
+
+@pytest.mark.parametrize("frames, expected", [
+    ([hand(0.5, 0.8 - 0.06 * k) for k in range(10)], GestureType.SWIPE_UP),
+    ([hand(0.8 - 0.05 * k, 0.5) for k in range(10)], GestureType.SWIPE_LEFT),
+])
+def test_swipe_direction(frames, expected):
+    assert [event for _, event in feed(make_recognizer(zoom=False), frames)] == [expected]
+
+
+def test_swipe_needs_pose_and_straight_path():
+    # 控制手势（如指针移动）中的快速移动不触发
+    assert feed(make_recognizer(), [hand(0.2 + 0.05 * k, 0.5) for k in range(10)], GestureType.POINTING) == []
+    # 来回晃动：位移足够但路径远长于位移
+    zigzag = [hand(0.2 + 0.03 * k, 0.5 + (0.08 if k % 2 else -0.08)) for k in range(10)]
+    assert feed(make_recognizer(zoom=False), zigzag) == []
+    # 关闭开关时不检测
+    assert feed(make_recognizer(swipe=False, zoom=False), [hand(0.2 + 0.05 * k, 0.5) for k in range(10)]) == []
+
+
+def test_zoom_in_and_out():
+    grow = [hand(0.5, 0.5, 0.1 + 0.01 * k) for k in range(10)]
+    assert [event for _, event in feed(make_recognizer(swipe=False), grow)] == [GestureType.ZOOM_IN]
+    shrink = [hand(0.5, 0.5, 0.2 - 0.01 * k) for k in range(10)]
+    assert [event for _, event in feed(make_recognizer(swipe=False), shrink)] == [GestureType.ZOOM_OUT]
+    # 手掌中心同时大幅移动时视为挥动而非推拉
+    drift = [hand(0.3 + 0.03 * k, 0.5, 0.1 + 0.01 * k) for k in range(10)]
+    assert feed(make_recognizer(swipe=False), drift) == []
+
+
+def test_pose_change_restarts_window_and_reset_clears_cooldown():
+    recognizer = make_recognizer(zoom=False)
+    # 前半段在控制手势中移动，切换到允许的姿态后窗口从切换时开始，不包含之前的位移
+    moving = [hand(0.2 + 0.05 * k, 0.5) for k in range(10)]
+    feed(recognizer, moving[:7], GestureType.POINTING)
+    assert feed(recognizer, moving[7:], start=7 / FPS) == []
+    # 触发后冷却期内不再触发；reset() 后立即可以再次触发
+    recognizer = make_recognizer(zoom=False)
+    assert len(feed(recognizer, moving)) == 1
+    back = [hand(0.65 - 0.05 * k, 0.5) for k in range(10)]
+    assert feed(recognizer, back, start=10 / FPS) == []
+    recognizer.reset()
+    assert len(recognizer.history) == 0
+    assert [event for _, event in feed(recognizer, back, start=20 / FPS)] == [GestureType.SWIPE_LEFT]
@@ -0,0 +1,122 @@
+# tests/test_volume_controller.py
+"""音量控制：速率模式与帧率无关、绝对模式的跟随，以及音量键混音器的估计值跨多次进入保留（FakeMixer / RecordingBackend）"""
+import time
+
+import pytest
+
+from config import Settings
+from control.actuator import VOLUME, VOLUME_FLOOR, Actuator, RecordingBackend
+from control.mixer import FakeMixer, KeyMixer
+from control.volume_controller import ABSOLUTE, RATE, VolumeController
+
+THRESHOLD = 0.05
+
+
+def controller(mode, mixer=None):
+    actuator = Actuator(backend=RecordingBackend(), threaded=False)
+    return VolumeController(actuator, mixer if mixer is not None else FakeMixer(step=0.02), mode=mode)
+
+
+def hold(volume, offset, seconds, fps, start=0.0, y=0.5):
+    """以 fps 帧率保持同一偏移 seconds 秒"""
+    for k in range(round(seconds * fps) + 1):
+        volume.update(offset, y, THRESHOLD, start + k / fps)
+
+
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_rate_mode_is_frame_rate_independent(fps):
+    volume = controller(RATE)
+    volume.begin()
+    # 超出阈值 0.05625 -> 0.05625 x VOLUME_RATE_GAIN (80) = 4.5 步/秒，2.1 秒 9.45 步
+    hold(volume, -(THRESHOLD + 0.05625), 2.1, fps)
+    assert volume.mixer.presses == 9
+    assert volume.mixer.level == pytest.approx(0.5 + 9 * 0.02)
+    # 调用次数随帧率变化，但每次至少一步
+    assert volume.mixer.calls <= 9
+
+
+def test_rate_mode_direction_cap_and_reset_inside_threshold():
+    volume = controller(RATE)
+    volume.begin()
+    # 手向下：音量降低，速率不超过 VOLUME_MAX_RATE
+    hold(volume, 0.5, 1.0, 30)
+    assert volume.mixer.level == pytest.approx(0.5 - Settings.VOLUME_MAX_RATE * 0.02)
+    # 回到阈值内：不调节，余量清零
+    level = volume.mixer.level
+    hold(volume, THRESHOLD / 2, 1.0, 30, start=1.0)
+    assert volume.mixer.level == level
+    # 丢帧后单帧积分不超过 VOLUME_MAX_STEP：两帧各间隔 1~2 秒，合计只有 2 x 0.1 x 12 = 2.4 步
+    presses = volume.mixer.presses
+    volume.update(-0.5, 0.5, THRESHOLD, 3.0)
+    volume.update(-0.5, 0.5, THRESHOLD, 5.0)
+    assert volume.mixer.presses - presses == int(2 * Settings.VOLUME_MAX_RATE * Settings.VOLUME_MAX_STEP)
+    assert volume.mixer.level > level
+
+
+def test_absolute_mode_follows_hand_after_threshold():
+    volume = controller(ABSOLUTE)
+    volume.begin()
+    top, bottom = Settings.VOLUME_ABSOLUTE_RANGE
+    # 偏移未超过阈值前不改变音量（进入模式时不跳变）
+    volume.update(THRESHOLD / 2, bottom, THRESHOLD)
+    assert volume.mixer.calls == 0
+    volume.update(-0.3, top, THRESHOLD)
+    assert volume.mixer.level == 1.0
+    # 已经跟随后，回到阈值内也继续跟随手的位置；同一步内的小移动不重复设置
+    volume.update(0.0, (top + bottom) / 2, THRESHOLD)
+    volume.update(0.0, (top + bottom) / 2 + 0.001, THRESHOLD)
+    assert volume.mixer.level == pytest.approx(0.5)
+    assert volume.mixer.calls == 2
+    volume.update(0.3, bottom + 0.1, THRESHOLD)
+    assert volume.mixer.level == 0.0
+    # 离开模式后重新进入需要再次超过阈值
+    volume.begin()
+    volume.update(0.0, top, THRESHOLD)
+    assert volume.mixer.level == 0.0
+
+
+def test_key_mixer_keeps_estimate_across_entries():
+    actuator = Actuator(backend=RecordingBackend(), threaded=False)
+    mixer = KeyMixer(actuator, step=0.02)
+    volume = VolumeController(actuator, mixer, mode=ABSOLUTE)
+    top, bottom = Settings.VOLUME_ABSOLUTE_RANGE
+    middle = (top + bottom) / 2
+
+    volume.begin()
+    volume.update(-0.3, middle, THRESHOLD)
+    # 第一次设置绝对音量：先按到 0 再按到 50%
+    assert actuator.backend.events == [(VOLUME_FLOOR, (50,)), (VOLUME, (25,))]
+    assert mixer.calibrations == 1 and mixer.level == 0.5
+
+    # 离开后很快再次进入：沿用估计值，只按差值
+    volume.reset()
+    volume.begin()
+    volume.update(-0.3, top, THRESHOLD)
+    assert actuator.backend.events[-1] == (VOLUME, (25,))
+    assert mixer.calibrations == 1 and mixer.level == 1.0
+
+    # 速率模式的步进也更新估计值，已到上限时不再发送音量键
+    rate = VolumeController(actuator, mixer, mode=RATE)
+    rate.begin()
+    hold(rate, -0.5, 1.0, 30)
+    assert mixer.level == 1.0
+    assert len(actuator.backend.events) == 2 + 1
+
+    # 闲置超过 VOLUME_RESYNC_IDLE 后重新进入：估计值可能过期，重新校准
+    mixer.resync_idle = 0.01
+    time.sleep(0.02)
+    volume.begin()
+    volume.update(-0.3, middle, THRESHOLD)
+    assert mixer.calibrations == 2
+    assert actuator.backend.events[-2:] == [(VOLUME_FLOOR, (50,)), (VOLUME, (25,))]
+
+
+def test_fake_mixer_history_is_bounded():
+    mixer = FakeMixer(step=0.02, level=0.0, history=3)
+    for _ in range(10):
+        mixer.step(1)
+    assert list(mixer.history) == pytest.approx([0.16, 0.18, 0.2])
+    assert mixer.calls == 10 and mixer.presses == 10
+    silent = FakeMixer(history=0)
+    silent.set_level(0.7)
+    assert len(silent.history) == 0 and silent.level == pytest.approx(0.7)
@@ -0,0 +1,63 @@
+# tools/replay_session.py
+"""
+高速回放录制的关键点，驱动 GestureRecognizer（可选 ActionMapper），不需要摄像头和 MediaPipe
+
+用法:
+    python -m tools.replay_session <录制目录> [--execute]
+"""
+import argparse
+import time
+from collections import Counter
+
+from config import Settings
+from gesture.gesture_classifier import create_recognizer
+from vision.landmark_recorder import LandmarkReplay
+
+
+def replay(path, mapper=None):
+    """不限速回放，返回 (帧数, 耗时秒, 手势统计)"""
+    source = LandmarkReplay(path)
+    recognizer = create_recognizer()
+    counts = Counter()
+
+    start = time.perf_counter()
+    for timestamp, lm_list in source:
+        if lm_list is None:
+            counts["NO_HAND"] += 1
+            continue
+        recognizer.update_fingers_status(lm_list, Settings.CAP_HEIGHT)
+        gesture_type, info = recognizer.recognize(lm_list)
+        if mapper is not None:
+            # 使用录制的时间戳：不限速回放时滤波器/滚动/音量按录制时的帧间隔积分
+            mapper.execute(gesture_type, info, timestamp)
+        counts[gesture_type.name] += 1
+    elapsed = time.perf_counter() - start
+    return len(source), elapsed, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="关键点录制高速回放")
+    parser.add_argument("path", help="LandmarkRecorder 保存的目录")
+    parser.add_argument("--execute", action="store_true", help="同时调用 ActionMapper 执行动作（会真实操作鼠标键盘）")
+    args = parser.parse_args()
+
+    mapper = None
+    if args.execute:
+        from control.actuator import Actuator
+        from pipeline.action_mapper import ActionMapper
+        # 同步执行器：滚动引擎按传入的录制时间戳积分，而不是由定时线程按实际时间输出
+        mapper = ActionMapper(Actuator(threaded=False))
+
+    try:
+        frames, elapsed, counts = replay(args.path, mapper)
+    finally:
+        if mapper is not None:
+            mapper.close()
+    rate = frames / elapsed if elapsed > 0 else 0.0
+    print(f"回放 {frames} 帧，用时 {elapsed:.3f}s，{rate:.0f} 帧/秒")
+    for name, count in counts.most_common():
+        print(f"  {name:<12} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# tools/train_gesture_model.py
+"""
+从标注的关键点录制训练学习式手势分类模型
+
+用法:
+    python -m tools.train_gesture_model <录制目录>[:手势名] ... [--kind softmax|centroid] [--output 路径]
+
+标注方式（按优先级）:
+    1. 目录后加 ":手势名"（如 rec_point:POINTING）：整段录制中检测到的所有手都标为该手势，
+       适合每段只做一种手势的采集方式
+    2. 录制目录中的 labels.npy：(帧数,) 或 (帧数, 手数) 的 GestureType.value，0 表示未标注
+    3. --bootstrap-rules：用现有规则引擎的输出作为标签（可作为初始模型，再补充规则容易出错的旋转样本）
+
+输出验证集准确率、各类别召回率、混淆矩阵，以及与规则引擎的单帧推理耗时对比。
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from config import Settings
+from gesture.gesture_base import GestureType
+from gesture.gesture_classifier import MODEL_KINDS, LearnedGestureRecognizer, train_model
+from gesture.gesture_recognizer import GestureRecognizer
+from gesture.landmark_features import landmark_features
+from vision.landmark_recorder import LandmarkReplay
+
+
+def parse_source(spec):
+    """'目录[:手势名]' -> (目录, GestureType 或 None)；Windows 盘符中的冒号不会被当作分隔符"""
+    path, _, name = spec.rpartition(":")
+    if path and name in GestureType.__members__:
+        return path, GestureType[name]
+    return spec, None
+
+
+def load_samples(spec, bootstrap_rules=False):
+    """读取一个录制目录中所有已标注的手，返回 ((M, 21, 3) 关键点, (M,) GestureType.value)"""
+    path, gesture = parse_source(spec)
+    replay = LandmarkReplay(path, mmap=False)
+    hands = np.arange(replay.landmarks.shape[1])[None, :] < replay.num_hands[:, None]  # (帧数, 手数)
+    landmarks = replay.landmarks[hands]
+    if gesture is not None:
+        labels = np.full(len(landmarks), gesture.value, dtype=np.int16)
+    elif os.path.exists(os.path.join(path, "labels.npy")):
+        labels = np.load(os.path.join(path, "labels.npy"))
+        if labels.ndim == 1:
+            labels = np.broadcast_to(labels[:, None], hands.shape)
+        labels = labels[hands].astype(np.int16)
+    elif bootstrap_rules:
+        labels, _ = GestureRecognizer.classify_batch(landmarks)
+    else:
+        raise SystemExit(f"{path}: 没有标注（用 目录:手势名、labels.npy 或 --bootstrap-rules）")
+    mask = labels > 0
+    return landmarks[mask], labels[mask].astype(np.int16)
+
+
+def split(count, val_fraction, seed):
+    order = np.random.default_rng(seed).permutation(count)
+    n_val = int(count * val_fraction)
+    return order[n_val:], order[:n_val]
+
+
+def report(model, features, labels):
+    """打印准确率、各类召回率与混淆矩阵"""
+    predicted = model.predict(features)
+    print(f"准确率: {np.mean(predicted == labels):.3f} ({len(labels)} 个样本)")
+    values = sorted(set(labels.tolist()) | set(predicted.tolist()))
+    names = [GestureType(v).name[:8] for v in values]
+    print(f"{'真实/预测':<12}" + "".join(f"{n:>9}" for n in names) + f"{'召回率':>8}")
+    for v, name in zip(values, names):
+        row = predicted[labels == v]
+        counts = [int(np.sum(row == u)) for u in values]
+        recall = counts[values.index(v)] / len(row) if len(row) else float("nan")
+        print(f"{name:<12}" + "".join(f"{c:>9}" for c in counts) + f"{recall:>9.3f}")
+
+
+def time_per_frame(func, samples, repeat=2000):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(samples[i % len(samples)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="训练学习式手势分类模型")
+    parser.add_argument("sources", nargs="+", help="LandmarkRecorder 录制目录，可加 :手势名 标注整段录制")
+    parser.add_argument("--kind", choices=sorted(MODEL_KINDS), default="softmax", help="模型类型")
+    parser.add_argument("--output", default=Settings.GESTURE_MODEL_PATH, help="模型保存路径")
+    parser.add_argument("--val", type=float, default=0.2, help="验证集比例")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bootstrap-rules", action="store_true", help="没有标注的录制用规则引擎的输出作为标签")
+    args = parser.parse_args()
+
+    parts = [load_samples(spec, args.bootstrap_rules) for spec in args.sources]
+    landmarks = np.concatenate([p[0] for p in parts]).astype(np.float32)
+    labels = np.concatenate([p[1] for p in parts])
+    if len(labels) == 0:
+        raise SystemExit("没有可用的标注样本")
+    features = landmark_features(landmarks)
+    print(f"样本数: {len(labels)}  特征维数: {features.shape[1]}")
+    for value, count in zip(*np.unique(labels, return_counts=True)):
+        print(f"  {GestureType(int(value)).name:<12} {count}")
+
+    train, val = split(len(labels), args.val, args.seed)
+    model = train_model(args.kind, features[train], labels[train])
+    print("\n训练集:")
+    report(model, features[train], labels[train])
+    if len(val):
+        print("\n验证集:")
+        report(model, features[val], labels[val])
+        rules, _ = GestureRecognizer.classify_batch(landmarks[val])
+        print(f"规则引擎在验证集上的准确率: {np.mean(rules == labels[val]):.3f}")
+
+    # 用全部样本重新训练后保存
+    model = train_model(args.kind, features, labels)
+    model.save(args.output)
+    print(f"\n模型已保存: {args.output}")
+
+    # 单帧推理耗时（实时路径）：学习引擎 vs 规则引擎
+    samples = landmarks[:min(len(landmarks), 2000)]
+    learned = LearnedGestureRecognizer(model)
+    rules = GestureRecognizer()
+    rules.hysteresis = 0.0
+    print(f"单帧推理: learned {time_per_frame(learned.recognize, samples):.1f} us, "
+          f"rules {time_per_frame(rules.recognize, samples):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# utils/config_store.py
+"""
+运行时可调参数的不可变快照
+
+GUI 线程通过 ConfigStore.publish() 发布新快照（整体替换引用，读者不会看到一半更新的参数），
+处理线程每帧只比较一次版本号，变化时才把新快照交给 ActionMapper / MouseController / 平滑器，
+各模块把参数保存为自己的字段，热路径上不再读取 Settings 类属性。
+"""
+import threading
+from dataclasses import dataclass, fields, replace
+
+from config import Settings
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    version: int = 0
+    # GUI 可调参数（名称与 Settings.PARAM_RANGES 一致）
+    mouse_sensitivity: float = Settings.MOUSE_SENSITIVITY
+    smoothing_factor: float = Settings.SMOOTHING_FACTOR
+    scroll_speed: float = Settings.SCROLL_SPEED
+    accel_factor: float = Settings.ACCEL_FACTOR
+    joystick_deadzone: float = Settings.JOYSTICK_DEADZONE
+    # 其余动作映射参数
+    move_threshold: float = Settings.MOVE_THRESHOLD
+    accel_threshold: float = Settings.ACCEL_THRESHOLD
+    volume_trigger_threshold: float = Settings.VOLUME_TRIGGER_THRESHOLD
+    mute_trigger_threshold: float = Settings.MUTE_TRIGGER_THRESHOLD
+
+    @classmethod
+    def from_settings(cls, version=0):
+        """按 Settings 当前的类属性创建快照（字段名为对应配置项的小写）"""
+        return cls(version=version, **{f.name: getattr(Settings, f.name.upper())
+                                       for f in fields(cls) if f.name != "version"})
+
+
+PARAMS = tuple(f.name for f in fields(ConfigSnapshot) if f.name != "version")
+
+
+class ConfigStore:
+    """持有当前快照；publish() 可从任意线程调用，读取 current/version 不加锁"""
+    def __init__(self, snapshot=None):
+        self._snapshot = snapshot if snapshot is not None else ConfigSnapshot.from_settings()
+        self._lock = threading.Lock()
+
+    @property
+    def current(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def publish(self, **changes):
+        """
+        用 changes 更新参数并发布新快照，参数没有变化时不增加版本号
+
+        Returns:
+            发布后的当前快照
+        """
+        unknown = set(changes) - set(PARAMS)
+        if unknown:
+            raise ValueError(f"未知的配置参数: {', '.join(sorted(unknown))}")
+        with self._lock:
+            current = self._snapshot
+            if all(getattr(current, k) == v for k, v in changes.items()):
+                return current
+            self._snapshot = replace(current, version=current.version + 1, **changes)
+            return self._snapshot
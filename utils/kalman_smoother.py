@@ -1,22 +1,170 @@
 # utils/kalman_smoother.py
-from filterpy.kalman import KalmanFilter
+"""
+卡尔曼平滑器
+
+直接在预分配的 NumPy 数组上实现的匀速 (cv) / 匀加速 (ca) 卡尔曼滤波，不依赖 filterpy：
+- 按真实帧时间戳计算 dt，帧率波动或丢帧时状态转移仍然正确
+- 每个坐标分量是一个独立通道，21 个关键点 x 3 个坐标可以作为一批同时滤波；
+  各通道模型与观测时刻相同，协方差和卡尔曼增益只需计算一份
+- 可按实测的采集->执行延迟向前预测，使光标领先于手部而不是滞后
+"""
+import time
+
 import numpy as np
+from config import Settings
+
+MODEL_ORDERS = {"cv": 2, "ca": 3}  # 模型 -> 每个通道的状态维数 [位置, 速度(, 加速度)]
+MAX_DT = 0.25                       # dt 上限 (秒)，长时间中断后避免协方差发散
+
 
 class KalmanSmoother:
-    def __init__(self):
-        self.kf = KalmanFilter(dim_x=4, dim_z=2)
-        # 状态向量：[x, y, vx, vy]（位置+速度）
-        self.kf.x = np.array([0, 0, 0, 0])
-        # 状态转移矩阵（匀速模型）
-        self.kf.F = np.array([[1, 0, 1, 0], [0, 1, 0, 1], [0, 0, 1, 0], [0, 0, 0, 1]])
-        # 观测矩阵（只观测位置）
-        self.kf.H = np.array([[1, 0, 0, 0], [0, 1, 0, 0]])
-        # 噪声协方差（可根据抖动情况调整）
-        self.kf.P *= 1000  # 初始不确定性
-        self.kf.R = np.array([[0.02, 0], [0, 0.02]])  # 观测噪声
-        self.kf.Q = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 10, 0], [0, 0, 0, 10]])  # 过程噪声
-
-    def smooth(self, x, y):
-        self.kf.predict()
-        self.kf.update(np.array([x, y]))
-        return self.kf.x[0], self.kf.x[1]
\ No newline at end of file
+    def __init__(self, points=1, dims=2, model=None, process_noise=None, measurement_noise=None,
+                 predict_ahead=0.0):
+        """
+        Args:
+            points, dims: 一次滤波的点数与每个点的坐标维数，如光标 (1, 2)、整只手 (21, 3)
+            model: "cv" 匀速 / "ca" 匀加速，默认 Settings.KALMAN_MODEL
+            process_noise: 过程噪声谱密度，越大越跟手，默认 Settings.KALMAN_PROCESS_NOISE
+            measurement_noise: 观测噪声方差 (归一化坐标²)，越大越平滑，默认 Settings.KALMAN_MEASUREMENT_NOISE
+            predict_ahead: 向前预测的时长 (秒)，可用 set_latency() 按实测延迟更新
+        """
+        self.model = model or Settings.KALMAN_MODEL
+        if self.model not in MODEL_ORDERS:
+            raise ValueError(f"未知的卡尔曼模型: {self.model}")
+        order = MODEL_ORDERS[self.model]
+        self.shape = (points, dims)
+        channels = points * dims
+        self.q = Settings.KALMAN_PROCESS_NOISE if process_noise is None else process_noise
+        self.base_r = Settings.KALMAN_MEASUREMENT_NOISE if measurement_noise is None else measurement_noise
+        self.r = self.base_r
+        self.latency = 0.0
+        self.set_latency(predict_ahead)
+
+        # 状态与协方差（协方差所有通道共用）
+        self.x = np.zeros((channels, order))
+        self.P = np.zeros((order, order))
+        self.F = np.eye(order)
+        self.Q = np.zeros((order, order))
+        self.K = np.zeros(order)
+        # 运算缓冲区
+        self._tmp = np.empty((channels, order))
+        self._z = np.empty(channels)
+        self._innovation = np.empty(channels)
+        self._powers = np.zeros(order)  # 外推系数 [1, t(, t²/2)]
+        self._powers[0] = 1.0
+        self._FP = np.empty((order, order))
+        self._KP = np.empty((order, order))
+        self._out = np.empty(self.shape)
+        self._ahead = np.empty(self.shape)
+
+        self.last_time = None
+        self.initialized = False
+
+    def _set_dt(self, dt):
+        """按 dt 更新状态转移矩阵 F 与离散化的过程噪声 Q"""
+        F, Q, q = self.F, self.Q, self.q
+        F[0, 1] = dt
+        if self.model == "cv":
+            # 白噪声加速度
+            Q[0, 0], Q[0, 1], Q[1, 1] = q * dt ** 3 / 3, q * dt ** 2 / 2, q * dt
+            Q[1, 0] = Q[0, 1]
+        else:
+            # 白噪声加加速度
+            F[1, 2] = dt
+            F[0, 2] = dt * dt / 2
+            Q[0, 0], Q[0, 1], Q[0, 2] = q * dt ** 5 / 20, q * dt ** 4 / 8, q * dt ** 3 / 6
+            Q[1, 1], Q[1, 2], Q[2, 2] = q * dt ** 3 / 3, q * dt ** 2 / 2, q * dt
+            Q[1, 0], Q[2, 0], Q[2, 1] = Q[0, 1], Q[0, 2], Q[1, 2]
+
+    def update(self, z, timestamp=None):
+        """
+        输入一次观测，返回滤波后的位置
+
+        Args:
+            z: 观测位置，形状为 (points, dims) 或可展平为 points*dims 的序列
+            timestamp: 观测时刻 (秒)，默认取当前 time.perf_counter()
+        Returns:
+            (points, dims) 滤波结果，内部缓冲区，下一次调用前有效
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        # 观测写入预分配的缓冲区，float32 关键点在复制时转换为 float64，不另外分配数组
+        np.copyto(self._z, np.asarray(z).reshape(-1))
+        z = self._z
+        if not self.initialized:
+            self.x[:, 0] = z
+            self.x[:, 1:] = 0.0
+            # 初始位置取观测，速度/加速度未知
+            self.P[...] = 0.0
+            self.P[0, 0] = self.r
+            self.P[1:, 1:] = np.eye(len(self.P) - 1)
+            self.initialized = True
+            self.last_time = now
+            np.copyto(self._out.reshape(-1), z)
+            return self._out
+
+        dt = now - self.last_time
+        if dt <= 0:
+            dt = 1.0 / Settings.FPS
+        self.last_time = now
+        self._set_dt(min(dt, MAX_DT))
+
+        # 预测：x = F x, P = F P F^T + Q
+        np.matmul(self.x, self.F.T, out=self._tmp)
+        self.x, self._tmp = self._tmp, self.x
+        np.matmul(self.F, self.P, out=self._FP)
+        np.matmul(self._FP, self.F.T, out=self.P)
+        self.P += self.Q
+
+        # 更新：只观测位置，H = [1, 0(, 0)]
+        np.divide(self.P[:, 0], self.P[0, 0] + self.r, out=self.K)
+        np.subtract(z, self.x[:, 0], out=self._innovation)
+        np.multiply(self._innovation[:, None], self.K[None, :], out=self._tmp)
+        self.x += self._tmp
+        np.multiply(self.K[:, None], self.P[0][None, :], out=self._KP)
+        self.P -= self._KP
+
+        np.copyto(self._out.reshape(-1), self.x[:, 0])
+        return self._out
+
+    def predict(self, ahead):
+        """不改变状态，返回向前外推 ahead 秒的位置（内部缓冲区）"""
+        # 位置 + 速度 t (+ 加速度 t²/2)：一次矩阵乘法写入输出缓冲区
+        powers = self._powers
+        powers[1] = ahead
+        if self.model == "ca":
+            powers[2] = ahead * ahead / 2
+        np.matmul(self.x, powers, out=self._ahead.reshape(-1))
+        return self._ahead
+
+    def filter(self, landmarks, timestamp=None):
+        """批量滤波一组关键点，返回含延迟补偿的 (points, dims) 结果"""
+        out = self.update(landmarks, timestamp)
+        return self.predict(self.latency) if self.latency > 0 else out
+
+    # ---------- 与 utils.smoothing.Smoother 一致的接口 ----------
+    def get_smoothed_coords(self, x, y, timestamp=None):
+        """
+        x,y：传入的原始坐标
+
+        Return：滤波并按延迟向前预测后的坐标
+        """
+        out = self.filter((x, y), timestamp)
+        return float(out[0, 0]), float(out[0, 1])
+
+    def reset(self):
+        """重置滤波器状态"""
+        self.initialized = False
+        self.last_time = None
+
+    def update_smoothing_factor(self, new_factor):
+        """
+        GUI实时调节的参数更新接口：沿用指数平滑系数的含义（越小越平滑），换算为观测噪声
+        """
+        factor = max(0.01, min(1.0, float(new_factor)))
+        default = max(0.01, min(1.0, Settings.SMOOTHING_FACTOR))
+        # 系数为默认值时使用配置的观测噪声，系数为 1 时几乎不平滑
+        self.r = max(self.base_r * ((1 - factor) / factor) ** 2 / ((1 - default) / default) ** 2, 1e-12)
+
+    def set_latency(self, seconds):
+        """设置向前预测的时长（实测的采集->执行延迟），不超过 Settings.KALMAN_MAX_PREDICT"""
+        self.latency = min(max(float(seconds), 0.0), Settings.KALMAN_MAX_PREDICT)
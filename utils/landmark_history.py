@@ -0,0 +1,103 @@
+# utils/landmark_history.py
+"""
+关键点历史环形缓冲区
+
+固定容量的预分配数组保存最近若干帧的 (21, 3) 关键点与时间戳，内存与每帧开销不随会话时长增长。
+每帧同时写入 i 与 i + capacity 两个位置（双写），最近 n 帧总是 [pos + capacity - n, pos + capacity)
+这一段连续内存，窗口查询直接返回视图，速度/加速度/路径长度在视图上计算，不复制历史数据。
+"""
+import numpy as np
+
+
+class LandmarkHistory:
+    def __init__(self, capacity=32, points=21, dims=3):
+        self.capacity = capacity
+        self._landmarks = np.zeros((2 * capacity, points, dims), dtype=np.float32)
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._pos = 0     # 下一次写入的位置 [0, capacity)
+        self._count = 0   # 有效帧数 (<= capacity)
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0
+
+    def append(self, landmarks, timestamp):
+        """写入一帧，O(1)；容量已满时覆盖最旧的一帧"""
+        pos = self._pos
+        self._landmarks[pos] = landmarks
+        self._landmarks[pos + self.capacity] = landmarks
+        self._times[pos] = timestamp
+        self._times[pos + self.capacity] = timestamp
+        self._pos = pos + 1 if pos + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    @property
+    def latest_time(self):
+        return self._times[self._pos + self.capacity - 1] if self._count else None
+
+    def _span(self, duration=None, since=None):
+        """最近 duration 秒内（且不早于 since）的帧在双写数组中的 [start, end)"""
+        end = self._pos + self.capacity
+        start = end - self._count
+        if duration is not None or since is not None:
+            limit = -np.inf if since is None else since
+            if duration is not None:
+                limit = max(limit, self._times[end - 1] - duration)
+            # 有效区间内时间戳单调递增，二分查找窗口起点
+            start += int(np.searchsorted(self._times[start:end], limit, side="left"))
+        return start, end
+
+    def window(self, duration=None, since=None):
+        """
+        最近 duration 秒（不早于 since）的历史，默认返回全部有效帧
+
+        Returns:
+            ((n,) 时间戳, (n, points, dims) 关键点)，都是内部数组的只读视图，下一次 append() 前有效
+        """
+        start, end = self._span(duration, since)
+        times = self._times[start:end]
+        landmarks = self._landmarks[start:end]
+        times.flags.writeable = False
+        landmarks.flags.writeable = False
+        return times, landmarks
+
+    def displacement(self, point, duration=None, since=None, dims=2):
+        """窗口内某个关键点的位移 (dims,) 与对应时长 (秒)，不足两帧时返回 (None, 0.0)"""
+        start, end = self._span(duration, since)
+        if end - start < 2:
+            return None, 0.0
+        first, last = self._landmarks[start, point, :dims], self._landmarks[end - 1, point, :dims]
+        return last - first, float(self._times[end - 1] - self._times[start])
+
+    def velocity(self, point, duration=None, since=None, dims=2):
+        """窗口内某个关键点的平均速度 (dims,)（单位/秒），不足两帧时返回 None"""
+        delta, elapsed = self.displacement(point, duration, since, dims)
+        if delta is None or elapsed <= 0:
+            return None
+        return delta / elapsed
+
+    def acceleration(self, point, duration=None, since=None, dims=2):
+        """窗口后半段与前半段平均速度之差除以半段时长，不足三帧时返回 None"""
+        start, end = self._span(duration, since)
+        if end - start < 3:
+            return None
+        mid = (start + end - 1) // 2
+        p0, p1, p2 = (self._landmarks[i, point, :dims] for i in (start, mid, end - 1))
+        t0, t1, t2 = (self._times[i] for i in (start, mid, end - 1))
+        if t1 <= t0 or t2 <= t1:
+            return None
+        v0 = (p1 - p0) / (t1 - t0)
+        v1 = (p2 - p1) / (t2 - t1)
+        return (v1 - v0) / ((t2 - t0) / 2)
+
+    def path_length(self, point, duration=None, since=None, dims=2):
+        """窗口内某个关键点经过的路径长度"""
+        start, end = self._span(duration, since)
+        if end - start < 2:
+            return 0.0
+        steps = np.diff(self._landmarks[start:end, point, :dims], axis=0)
+        return float(np.sqrt(np.einsum("ij,ij->i", steps, steps)).sum())
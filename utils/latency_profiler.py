@@ -0,0 +1,147 @@
+# utils/latency_profiler.py
+import threading
+import time
+
+import numpy as np
+
+# 流水线各阶段名称（按执行顺序）
+STAGES = (
+    "capture",    # 读取画面（等待采集线程/驱动）
+    "flip",       # 镜像翻转
+    "to_rgb",     # BGR -> RGB
+    "inference",  # hands.process
+    "draw",       # draw_landmarks
+    "recognize",  # 手势识别
+    "execute",    # ActionMapper.execute
+    "overlay",    # putText 等叠加信息
+    "display",    # imshow / 发送信号到GUI
+)
+# 端到端指标：从采集时间戳到动作执行完成 / 到画面显示完成
+E2E_ACTION = "e2e_action"
+E2E_TOTAL = "e2e_total"
+
+
+class LatencyProfiler:
+    """
+    分阶段延迟统计，替代原来只能给出瞬时 1/dt 的 FpsCounter
+
+    每个阶段的耗时写入预分配的滚动窗口（numpy 环形数组），记录时不分配内存；
+    只有查询 p50/p95/p99 时才做排序，开销足够低，可以在生产环境常开。
+
+    用法：
+        profiler.begin_frame()
+        success, img = camera.read()
+        profiler.mark("capture")                      # 记录自上一次 mark 以来的耗时
+        profiler.set_capture_timestamp(camera.timestamp)
+        ...
+        profiler.mark_action()
+        ...
+        profiler.end_frame()
+    """
+    def __init__(self, stages=STAGES, window=1024, enabled=True):
+        self.enabled = enabled
+        self.window = window
+        self.names = tuple(stages) + (E2E_ACTION, E2E_TOTAL)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        # 各指标的滚动样本（秒）及写入计数
+        self.samples = np.zeros((len(self.names), window), dtype=np.float64)
+        self.counts = [0] * len(self.names)
+        # 帧完成时间，用于计算平均帧率
+        self.frame_times = np.zeros(window, dtype=np.float64)
+        self.frame_count = 0
+
+        # 当前帧的采集时间戳与上一次 mark 的时间按线程保存：流水线各阶段在不同线程中执行时互不干扰
+        self._local = threading.local()
+
+    @property
+    def frame_start(self):
+        return getattr(self._local, "frame_start", None)
+
+    @frame_start.setter
+    def frame_start(self, value):
+        self._local.frame_start = value
+
+    @property
+    def last_mark(self):
+        return getattr(self._local, "last_mark", None)
+
+    @last_mark.setter
+    def last_mark(self, value):
+        self._local.last_mark = value
+
+    def begin_frame(self):
+        """开始一帧，端到端计时默认从此刻开始"""
+        now = time.perf_counter()
+        self.frame_start = now
+        self.last_mark = now
+        return now
+
+    def set_capture_timestamp(self, capture_ts):
+        """以画面的采集时间戳作为端到端计时起点（包含在缓冲区中等待的时间）"""
+        if capture_ts is not None:
+            self.frame_start = capture_ts
+
+    def record(self, stage, duration):
+        """直接记录某阶段耗时（秒），用于在其他线程测得的耗时（如采集线程中的翻转）"""
+        if not self.enabled or duration is None:
+            return
+        i = self.index[stage]
+        self.samples[i, self.counts[i] % self.window] = duration
+        self.counts[i] += 1
+
+    def mark(self, stage):
+        """记录自上一次 mark（或 begin_frame）以来的耗时，归入 stage"""
+        now = time.perf_counter()
+        if self.enabled and self.last_mark is not None:
+            self.record(stage, now - self.last_mark)
+        self.last_mark = now
+        return now
+
+    def mark_action(self):
+        """动作执行完成，记录采集到动作的端到端延迟"""
+        if self.frame_start is not None:
+            self.record(E2E_ACTION, time.perf_counter() - self.frame_start)
+
+    def end_frame(self):
+        """结束一帧，记录采集到显示完成的端到端延迟"""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.record(E2E_TOTAL, now - self.frame_start)
+        self.frame_times[self.frame_count % self.window] = now
+        self.frame_count += 1
+        self.frame_start = None
+        return now
+
+    def fps(self):
+        """最近窗口内的平均帧率"""
+        n = min(self.frame_count, self.window)
+        if n < 2:
+            return 0.0
+        newest = self.frame_times[(self.frame_count - 1) % self.window]
+        oldest = self.frame_times[(self.frame_count - n) % self.window]
+        return (n - 1) / (newest - oldest) if newest > oldest else 0.0
+
+    def percentiles(self, stage, q=(50, 95, 99)):
+        """返回某指标的分位数（毫秒），无样本时返回 None"""
+        i = self.index[stage]
+        n = min(int(self.counts[i]), self.window)
+        if n == 0:
+            return None
+        return tuple((np.percentile(self.samples[i, :n], q) * 1000.0).tolist())
+
+    def summary(self):
+        """所有指标的 {名称: (p50, p95, p99)}（毫秒）"""
+        result = {}
+        for name in self.names:
+            p = self.percentiles(name)
+            if p is not None:
+                result[name] = p
+        return result
+
+    def format_summary(self):
+        """生成便于日志输出的多行文本"""
+        lines = [f"{'stage':<12}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"]
+        for name, (p50, p95, p99) in self.summary().items():
+            lines.append(f"{name:<12}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}")
+        lines.append(f"fps: {self.fps():.1f}")
+        return "\n".join(lines)
@@ -1,2 +1,152 @@
-def log(message):
-    print(f"[System] {message}")
\ No newline at end of file
+# utils/logger.py
+"""
+结构化日志
+
+log() 原来直接 print，处理循环中的日志会阻塞在 stdout 上。现在基于标准库 logging：
+
+- 日志带级别（DEBUG/INFO/WARNING/ERROR），低于 Settings.LOG_LEVEL 的直接丢弃
+- 调用方只把记录放入有界队列（不格式化、不写文件），由后台线程 (QueueListener) 格式化并写到 stdout / LOG_FILE；
+  队列满时丢弃新记录并计数，处理循环永远不会等待输出
+- 关键字参数作为结构化字段：文本格式附加在消息后 (key=value)，LOG_FORMAT = "json" 时每条记录一行 JSON
+- log_limited() 对同一个 key 的重复日志限频，用于热路径中可能每帧出现的错误
+
+第一次调用 log() 时按 Settings 自动配置，进程退出时写完队列中剩余的记录。
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+from config import Settings
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+_logger = logging.getLogger("hand_control")
+_logger.propagate = False
+_lock = threading.Lock()
+_handler = None    # 调用方使用的入队 handler
+_listener = None   # 后台写出线程
+_limited = {}      # log_limited 的 key -> [上次输出时间, 期间被抑制的次数]
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record):
+        prefix = "[System]" if record.levelno == INFO else f"[System][{record.levelname}]"
+        text = f"{prefix} {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        data.update(getattr(record, "fields", None) or {})
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _BufferedHandler(logging.handlers.QueueHandler):
+    """只入队的 handler：队列满时丢弃并计数"""
+    def __init__(self, maxsize):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 格式化在后台线程中进行
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level=None, path=None, fmt=None):
+    """
+    配置日志输出（重复调用时先关闭原来的后台线程）
+
+    Args:
+        level: 级别名称或数值，默认 Settings.LOG_LEVEL
+        path: 同时写入的日志文件，默认 Settings.LOG_FILE（None 表示只输出到 stdout）
+        fmt: "text" 或 "json"，默认 Settings.LOG_FORMAT
+    """
+    global _handler, _listener
+    with _lock:
+        _stop_listener()
+        level = level if level is not None else Settings.LOG_LEVEL
+        _logger.setLevel(logging.getLevelName(level) if isinstance(level, str) else level)
+        formatter = _JsonFormatter() if (fmt or Settings.LOG_FORMAT) == "json" else _TextFormatter()
+        outputs = [logging.StreamHandler(sys.stdout)]
+        path = path if path is not None else Settings.LOG_FILE
+        if path:
+            outputs.append(logging.FileHandler(path, encoding="utf-8"))
+        for output in outputs:
+            output.setFormatter(formatter)
+        _handler = _BufferedHandler(Settings.LOG_QUEUE_SIZE)
+        _logger.addHandler(_handler)
+        _listener = logging.handlers.QueueListener(_handler.queue, *outputs)
+        _listener.start()
+
+
+def _stop_listener():
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()  # 写完队列中剩余的记录
+        for output in _listener.handlers:
+            output.close()
+        _listener = None
+    if _handler is not None:
+        _logger.removeHandler(_handler)
+        _handler = None
+
+
+def shutdown_logging():
+    """写完剩余记录并停止后台线程"""
+    with _lock:
+        _stop_listener()
+
+
+atexit.register(shutdown_logging)
+
+
+def log(message, level=INFO, **fields):
+    """记录一条日志，关键字参数作为结构化字段"""
+    if _handler is None:
+        setup_logging()
+    if _logger.isEnabledFor(level):
+        _logger.log(level, message, extra={"fields": fields} if fields else None)
+
+
+def log_limited(key, message, level=WARNING, interval=None, **fields):
+    """同一个 key 在 interval 秒（默认 Settings.LOG_RATE_LIMIT）内只记录一次，下次记录时附带被抑制的次数"""
+    now = time.monotonic()
+    state = _limited.get(key)
+    if state is not None and now - state[0] < (Settings.LOG_RATE_LIMIT if interval is None else interval):
+        state[1] += 1
+        return
+    suppressed = state[1] if state is not None else 0
+    _limited[key] = [now, 0]
+    if suppressed:
+        fields["suppressed"] = suppressed
+    log(message, level, **fields)
+
+
+def get_stats():
+    """日志队列统计：queued 为尚未写出的记录数，dropped 为队列满时丢弃的记录数"""
+    if _handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _handler.queue.qsize(), "dropped": _handler.dropped}
@@ -0,0 +1,119 @@
+# utils/metrics.py
+"""
+本地指标接口
+
+MetricsServer 在 127.0.0.1:Settings.METRICS_PORT 上提供 GET /metrics，返回 Prometheus 文本格式的指标，
+可以用 Prometheus / curl 观察长时间运行时的帧率、各阶段延迟、丢帧与输入执行情况。
+指标只在收到请求时由 HTTP 线程从各组件的统计接口读取，处理循环没有额外开销。
+"""
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.logger import WARNING, get_stats as log_stats, log
+
+PREFIX = "hand_control_"
+
+
+def format_metrics(samples):
+    """
+    [(名称, 类型, 说明, [(标签字典, 值), ...]), ...] -> Prometheus 文本格式
+
+    值为 None 的样本被跳过。
+    """
+    lines = []
+    for name, kind, help_text, values in samples:
+        values = [(labels, v) for labels, v in values if v is not None]
+        if not values:
+            continue
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for labels, value in values:
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels.items()) if labels else ""
+            value = float(value)
+            text = "NaN" if math.isnan(value) else repr(value)
+            lines.append(f"{PREFIX}{name}{{{label_text}}} {text}" if label_text else f"{PREFIX}{name} {text}")
+    return "\n".join(lines) + "\n"
+
+
+def collect_pipeline_metrics(profiler=None, pipeline=None, camera=None, hands=None, quality=None):
+    """从处理流水线的各组件读取指标，缺少的组件跳过"""
+    samples = []
+    if pipeline is not None:
+        stats = pipeline.get_stats()
+        samples.append(("frames_total", "counter", "已处理的帧数", [(None, stats["frames"])]))
+        stages = stats["stages"]
+        samples.append(("stage_calls_total", "counter", "各阶段的调用次数",
+                        [({"stage": k}, v["calls"]) for k, v in stages.items()]))
+        samples.append(("stage_avg_ms", "gauge", "各阶段的平均处理耗时 (毫秒)",
+                        [({"stage": k}, v["avg_ms"]) for k, v in stages.items()]))
+        samples.append(("stage_discarded_total", "counter", "各阶段丢弃的帧数",
+                        [({"stage": k}, v["discarded"]) for k, v in stages.items()]))
+        samples.append(("queue_dropped_total", "counter", "阶段之间的队列因满而丢弃的帧数",
+                        [({"queue": k}, v["dropped"]) for k, v in stats["queues"].items()]))
+    if profiler is not None:
+        samples.append(("fps", "gauge", "最近的处理帧率", [(None, profiler.fps())]))
+        latency = []
+        for stage in profiler.names:
+            p = profiler.percentiles(stage)
+            if p is not None:
+                latency.extend(({"stage": stage, "quantile": q}, v) for q, v in zip(("0.5", "0.95", "0.99"), p))
+        samples.append(("latency_ms", "gauge", "各阶段与端到端延迟的分位数 (毫秒)", latency))
+    if camera is not None:
+        stats = camera.get_stats()
+        samples.append(("capture_frames_total", "counter", "采集统计",
+                        [({"state": k}, stats[k]) for k in ("captured", "dropped", "stale", "timeouts")]))
+    if hands is not None:
+        samples.append(("hands_tracked", "gauge", "正在跟踪的手数", [(None, len(hands.states))]))
+        samples.append(("hands_visible", "gauge", "当前帧可见的手数", [(None, len(hands.visible))]))
+        stats = hands.actuator.get_stats()
+        samples.append(("actuator_commands_total", "counter", "输入执行器的命令数",
+                        [({"state": k}, stats[k]) for k in ("submitted", "coalesced", "dropped", "executed", "errors", "rejected")]))
+        samples.append(("actuator_pending", "gauge", "执行队列中尚未执行的命令数", [(None, stats["pending"])]))
+    if quality is not None:
+        samples.append(("quality_level", "gauge", "当前画质档位", [(None, quality.level)]))
+    stats = log_stats()
+    samples.append(("log_dropped_total", "counter", "日志队列满时丢弃的记录数", [(None, stats["dropped"])]))
+    return samples
+
+
+class MetricsServer:
+    """在后台线程中提供 /metrics，collect() 返回 format_metrics() 所需的样本列表"""
+    def __init__(self, collect, port, host="127.0.0.1"):
+        self.collect = collect
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = format_metrics(server.collect()).encode("utf-8")
+                except Exception as e:
+                    log(f"指标收集失败: {e!r}", WARNING)
+                    self.send_error(500)
+                    return
+                server.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 不为每个请求输出访问日志
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.address = self._httpd.server_address
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        log(f"指标接口: http://{self.address[0]}:{self.address[1]}/metrics")
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=1.0)
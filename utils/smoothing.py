@@ -1,4 +1,8 @@
 # utils/smoothing.py
+import math
+import time
+
+from config import Settings
 
 class Smoother:
     def __init__(self, smoothing_factor=0.2):
@@ -8,9 +12,10 @@ class Smoother:
         self.smoothed_y = None
         self.is_first = True  
 
-    def get_smoothed_coords(self, x, y):
+    def get_smoothed_coords(self, x, y, timestamp=None):
         """
         x,y：传入的原始坐标
+        timestamp：采集时间戳（固定系数平滑不使用，与按时间滤波的平滑器保持接口一致）
 
         Return：平滑后的坐标
         """
@@ -36,4 +41,159 @@ class Smoother:
         GUI实时调节的参数更新接口
         """
         # 做范围限制，防止传入无效值（0.0~1.0）
-        self.smoothing_factor = max(0.0, min(1.0, float(new_factor)))
\ No newline at end of file
+        self.smoothing_factor = max(0.0, min(1.0, float(new_factor)))
+
+def _factor_to_cutoff(factor):
+    """
+    把指数平滑系数换算为同等平滑程度的截止频率 (Hz)，按 Settings.FPS 的帧间隔计算
+
+    系数 f 的指数平滑相当于截止频率 f / ((1 - f) * 2π * dt) 的一阶低通，
+    例如 30 FPS 下 GUI 滑块的 0.2 对应约 1.2 Hz；系数越大截止频率越高、越跟手。
+    """
+    factor = max(0.01, min(0.99, float(factor)))
+    dt = 1.0 / Settings.FPS
+    return factor / ((1 - factor) * 2 * math.pi * dt)
+
+
+def _alpha(cutoff, dt):
+    """一阶低通滤波器在截止频率 cutoff、采样间隔 dt 下的平滑系数"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro 自适应低通滤波器
+
+    截止频率随速度变化：cutoff = min_cutoff + beta * |速度|。
+    手静止时截止频率低，抖动被充分抑制；快速移动时截止频率升高，几乎没有滞后。
+    """
+    def __init__(self, min_cutoff=None, beta=None, d_cutoff=None):
+        self.min_cutoff = Settings.ONE_EURO_MIN_CUTOFF if min_cutoff is None else min_cutoff
+        self.beta = Settings.ONE_EURO_BETA if beta is None else beta
+        self.d_cutoff = Settings.ONE_EURO_D_CUTOFF if d_cutoff is None else d_cutoff
+        self.fps = Settings.FPS
+        self.reset()
+
+    def get_smoothed_coords(self, x, y, timestamp=None):
+        """
+        x,y：传入的原始坐标
+        timestamp：采集时间戳 (秒)，默认取当前时间
+
+        Return：平滑后的坐标
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        x, y = float(x), float(y)
+        if self.last_time is None:
+            self.smoothed_x, self.smoothed_y = x, y
+            self.dx = self.dy = 0.0
+            self.last_time = now
+            return x, y
+
+        dt = now - self.last_time
+        if dt <= 0:
+            dt = 1.0 / self.fps
+        self.last_time = now
+
+        # 速度先经过固定截止频率的低通滤波
+        a_d = _alpha(self.d_cutoff, dt)
+        self.dx += a_d * ((x - self.smoothed_x) / dt - self.dx)
+        self.dy += a_d * ((y - self.smoothed_y) / dt - self.dy)
+        speed = math.hypot(self.dx, self.dy)
+
+        a = _alpha(self.min_cutoff + self.beta * speed, dt)
+        self.smoothed_x += a * (x - self.smoothed_x)
+        self.smoothed_y += a * (y - self.smoothed_y)
+        return self.smoothed_x, self.smoothed_y
+
+    def reset(self):
+        """重置平滑器状态"""
+        self.smoothed_x = None
+        self.smoothed_y = None
+        self.dx = self.dy = 0.0
+        self.last_time = None
+
+    def update_smoothing_factor(self, new_factor):
+        """
+        GUI实时调节的参数更新接口：平滑系数换算为静止时的最小截止频率
+
+        只改变手静止时的平滑程度；移动时截止频率仍随速度按 beta 升高，滑块对快速移动的影响很小
+        """
+        self.min_cutoff = _factor_to_cutoff(new_factor)
+
+
+class DoubleExponentialSmoother:
+    """
+    双指数平滑 (Holt 线性趋势)
+
+    同时平滑位置和趋势，匀速移动时没有单指数平滑的固定滞后。
+    系数按实际帧间隔换算，帧率波动时平滑程度保持一致。
+    """
+    def __init__(self, smoothing_factor=None, trend_factor=None):
+        self.smoothing_factor = Settings.SMOOTHING_FACTOR if smoothing_factor is None else smoothing_factor
+        self.trend_factor = Settings.DOUBLE_EXP_TREND if trend_factor is None else trend_factor
+        self.fps = Settings.FPS
+        self.reset()
+
+    def get_smoothed_coords(self, x, y, timestamp=None):
+        """
+        x,y：传入的原始坐标
+        timestamp：采集时间戳 (秒)，默认取当前时间
+
+        Return：平滑后的坐标
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        x, y = float(x), float(y)
+        if self.last_time is None:
+            self.smoothed_x, self.smoothed_y = x, y
+            self.trend_x = self.trend_y = 0.0
+            self.last_time = now
+            return x, y
+
+        # 系数按 Settings.FPS 标定，换算到实际帧间隔 (趋势以 每帧 为单位)
+        frames = (now - self.last_time) * self.fps if now > self.last_time else 1.0
+        self.last_time = now
+        a = 1.0 - (1.0 - self.smoothing_factor) ** frames
+        b = 1.0 - (1.0 - self.trend_factor) ** frames
+
+        prev_x, prev_y = self.smoothed_x, self.smoothed_y
+        self.smoothed_x = a * x + (1 - a) * (prev_x + self.trend_x * frames)
+        self.smoothed_y = a * y + (1 - a) * (prev_y + self.trend_y * frames)
+        self.trend_x = b * (self.smoothed_x - prev_x) / frames + (1 - b) * self.trend_x
+        self.trend_y = b * (self.smoothed_y - prev_y) / frames + (1 - b) * self.trend_y
+        return self.smoothed_x, self.smoothed_y
+
+    def reset(self):
+        """重置平滑器状态"""
+        self.smoothed_x = None
+        self.smoothed_y = None
+        self.trend_x = self.trend_y = 0.0
+        self.last_time = None
+
+    def update_smoothing_factor(self, new_factor):
+        """
+        GUI实时调节的参数更新接口
+        """
+        self.smoothing_factor = max(0.0, min(1.0, float(new_factor)))
+
+
+FILTERS = ("ema", "one_euro", "double_exp", "kalman")
+
+
+def create_smoother(name):
+    """
+    按名称创建平滑器，所有平滑器都提供 get_smoothed_coords / reset / update_smoothing_factor 接口
+
+    Args:
+        name: "ema" 指数平滑 / "one_euro" One-Euro 自适应 / "double_exp" 双指数平滑 / "kalman" 卡尔曼滤波
+    """
+    if name == "ema":
+        return Smoother(Settings.SMOOTHING_FACTOR)
+    if name == "one_euro":
+        return OneEuroFilter()
+    if name == "double_exp":
+        return DoubleExponentialSmoother()
+    if name == "kalman":
+        from .kalman_smoother import KalmanSmoother
+        return KalmanSmoother()
+    raise ValueError(f"未知的滤波器: {name}，可选: {', '.join(FILTERS)}")
@@ -0,0 +1,118 @@
+# utils/startup.py
+"""
+启动阶段计时与后台预加载
+
+- report: 进程级启动报告，计时起点为首次导入本模块（入口脚本应最先导入），按阶段记录耗时
+- BackgroundTask: 在后台线程执行耗时的初始化（如构造 MediaPipe 图并预热），主线程同时做其他事
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from .logger import log
+
+
+class StartupReport:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []        # [(阶段名, 相对启动的开始时刻, 耗时, 线程名)]
+        self.first_frame_time = None
+        self._last_mark = self.start
+        self._lock = threading.Lock()
+
+    def record(self, name, duration, started=None):
+        """记录一个阶段的耗时（秒）"""
+        offset = (started if started is not None else time.perf_counter() - duration) - self.start
+        with self._lock:
+            self.phases.append((name, offset, duration, threading.current_thread().name))
+
+    @contextmanager
+    def phase(self, name):
+        """计时一个代码块"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, started)
+
+    def mark(self, name):
+        """记录自上一次 mark（或启动）以来的耗时，用于主线程上顺序执行的阶段"""
+        now = time.perf_counter()
+        self.record(name, now - self._last_mark, self._last_mark)
+        self._last_mark = now
+
+    def first_frame(self, since=None):
+        """第一帧处理完成，记录从 since（默认进程启动）到此刻的时间，只记录一次"""
+        if self.first_frame_time is not None:
+            return False
+        now = time.perf_counter()
+        self.first_frame_time = now - (self.start if since is None else since)
+        self.record("first_frame", self.first_frame_time, now - self.first_frame_time)
+        return True
+
+    def format(self):
+        lines = [f"{'phase':<16}{'start(ms)':>10}{'took(ms)':>10}  thread"]
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        for name, offset, duration, thread in phases:
+            lines.append(f"{name:<16}{offset * 1000:>10.1f}{duration * 1000:>10.1f}  {thread}")
+        if self.first_frame_time is not None:
+            lines.append(f"time to first processed frame: {self.first_frame_time * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+report = StartupReport()
+
+
+class BackgroundTask:
+    """在守护线程中执行 func()，result() 取回返回值（func 抛出的异常在 result() 中重新抛出）"""
+    def __init__(self, name, func):
+        self.name = name
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(func,), name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self, func):
+        try:
+            self._result = func()
+        except Exception as e:
+            self._error = e
+
+    def done(self):
+        return not self._thread.is_alive()
+
+    def result(self, timeout=None):
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError(f"后台任务 {self.name} 超时")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def load_detector(recorder=None, profiler=None, warm_up=None):
+    """
+    按配置构造手部检测器并预热（加载 MediaPipe 模型 + 一次空白帧推理），可在后台线程调用
+
+    Returns:
+        ProcessHandDetector 或 HandDetector
+    """
+    from config import Settings
+    with report.phase("detector_import"):
+        if Settings.DETECTOR_PROCESS:
+            from vision.detector_process import ProcessHandDetector as detector_cls
+        else:
+            from vision.hand_detector import HandDetector as detector_cls
+    with report.phase("detector_init"):
+        detector = detector_cls(recorder, profiler)
+    if Settings.DETECTOR_WARM_UP if warm_up is None else warm_up:
+        with report.phase("warm_up"):
+            detector.warm_up()
+    return detector
+
+
+def preload_detector():
+    """在后台线程构造并预热检测器，返回 BackgroundTask"""
+    log("后台加载手部检测模型...")
+    return BackgroundTask("DetectorLoader", load_detector)
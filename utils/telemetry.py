@@ -0,0 +1,108 @@
+# utils/telemetry.py
+"""
+逐帧遥测
+
+TelemetryWriter 把每帧一行的记录写入 CSV 文件，用于事后分析长时间运行（整个班次）的行为：
+record() 只把一行放入有界缓冲区（满时丢弃并计数），后台线程每 Settings.TELEMETRY_FLUSH_INTERVAL 秒批量写出。
+文件超过 TELEMETRY_MAX_BYTES 时轮转：path -> path.1 -> ... -> path.N（最多保留 TELEMETRY_BACKUPS 个旧文件），
+每个文件都以表头开始，可以单独读取。重新启动时追加到已有的文件（只有新文件才写表头），上次运行的记录不会被覆盖。
+"""
+import csv
+import os
+import threading
+from collections import deque
+
+from config import Settings
+from utils.logger import WARNING, log
+
+
+class TelemetryWriter:
+    def __init__(self, path, columns, max_bytes=None, backups=None, flush_interval=None, buffer_size=None):
+        """
+        Args:
+            path: CSV 文件路径
+            columns: 列名，record() 传入的行与之一一对应
+        """
+        self.path = path
+        self.columns = tuple(columns)
+        self.max_bytes = max_bytes or Settings.TELEMETRY_MAX_BYTES
+        self.backups = Settings.TELEMETRY_BACKUPS if backups is None else backups
+        self.flush_interval = flush_interval or Settings.TELEMETRY_FLUSH_INTERVAL
+        self.buffer_size = buffer_size or Settings.TELEMETRY_BUFFER_SIZE
+
+        self.rows = 0         # 写出的行数
+        self.dropped = 0      # 缓冲区满时丢弃的行数
+        self.rotations = 0
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._running = True
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._writer = None
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="TelemetryWriter", daemon=True)
+        self._thread.start()
+
+    def record(self, row):
+        """放入一行，不等待写出"""
+        if len(self._buffer) >= self.buffer_size:
+            self.dropped += 1
+            return
+        self._buffer.append(row)
+
+    def _open(self):
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(self.columns)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self.rotations += 1
+        self._open()
+
+    def _write_pending(self):
+        buffer = self._buffer
+        if not buffer:
+            return
+        while buffer:
+            self._writer.writerow(buffer.popleft())
+            self.rows += 1
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: not self._running, self.flush_interval)
+                running = self._running
+            try:
+                self._write_pending()
+            except OSError as e:
+                log(f"遥测写入失败 ({e})，停止记录", WARNING)
+                self._buffer.clear()
+                return
+            if not running:
+                return
+
+    def close(self):
+        """写出剩余的行并关闭文件"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=5.0)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_stats(self):
+        return {"rows": self.rows, "dropped": self.dropped, "rotations": self.rotations, "path": self.path}
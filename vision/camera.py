@@ -1,18 +1,207 @@
+import threading
+import time
+from collections import deque
+
 import cv2
 from config import Settings
+from utils.logger import WARNING, log
+from .frame import BufferPool, Frame
 
 class Camera:
-    def __init__(self):
-        self.cap = cv2.VideoCapture(Settings.CAMERA_ID)
-        self.cap.set(3, Settings.CAP_WIDTH)
-        self.cap.set(4, Settings.CAP_HEIGHT)
+    """
+    摄像头/视频采集类
+
+    支持两种模式：
+    - 同步模式：read() 时才调用 cap.read()，适合逐帧处理视频文件
+    - 线程模式：后台线程持续抓帧写入小环形缓冲区，read() 总是取最新一帧（latest-frame-wins），
+      避免推理耗时超过帧间隔时驱动缓冲区堆积、处理的是"几帧之前"的旧画面
+
+    read() 返回的 Frame 使用缓冲区池中的内存，在下一次 read() 之前有效；
+    read_frame(owned=True) 返回的帧由调用方释放。
+    """
+    def __init__(self, source=None, threaded=None, buffer_size=None, realtime=True):
+        """
+        Args:
+            source: 摄像头编号(int) 或 视频文件路径(str)，默认 Settings.CAMERA_ID
+            threaded: 是否启用后台抓帧线程，默认 Settings.THREADED_CAPTURE
+            buffer_size: 环形缓冲区大小，默认 Settings.CAPTURE_BUFFER_SIZE
+            realtime: 视频文件在线程模式下是否按原始帧率播放（模拟摄像头）
+        """
+        self.source = Settings.CAMERA_ID if source is None else source
+        self.is_file = isinstance(self.source, str)
+        self.threaded = Settings.THREADED_CAPTURE if threaded is None else threaded
+        self.realtime = realtime
+
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.is_file:
+            self.cap.set(3, Settings.CAP_WIDTH)
+            self.cap.set(4, Settings.CAP_HEIGHT)
+
+        # 统计计数
+        self.captured_frames = 0  # 抓取到的总帧数
+        self.dropped_frames = 0   # 被新帧覆盖、从未被处理的帧数
+        self.stale_frames = 0     # 交给处理时已超过 Settings.STALE_FRAME_AGE 的帧数
+        self.timeouts = 0         # 等待新帧超时的次数（摄像头打开慢、USB 卡顿、切换分辨率）
+        self.timestamp = None     # 最近一次 read() 返回帧的采集时间戳 (time.perf_counter)
+        self.flip_time = None     # 最近一次 read() 返回帧的镜像翻转耗时 (秒)
+
+        self.pool = BufferPool()  # 帧缓冲区池，稳定运行时不再分配新数组
+        self._raw_shape = None
+        self._pending_resolution = None  # set_resolution() 请求、尚未生效的分辨率
+        self._current = None      # 最近一次交给调用方的帧，下一次 read() 时释放
+        self._frame_id = 0
+        self._eof = False
+        self._running = False
+        self._thread = None
+        self._cond = threading.Condition()
+        self._buffer = deque(maxlen=buffer_size or Settings.CAPTURE_BUFFER_SIZE)
+
+        if self.threaded:
+            self._running = True
+            self._thread = threading.Thread(target=self._grab_loop, name="CameraGrabber", daemon=True)
+            self._thread.start()
+
+    def _grab(self):
+        """抓取一帧写入池中的缓冲区并镜像翻转，失败时返回 None"""
+        if self._pending_resolution is not None:
+            self._apply_resolution()
+        slot = self.pool.acquire()
+        raw = self.pool.get(slot, "raw", self._raw_shape) if self._raw_shape else None
+        success, raw = self.cap.read(raw)
+        timestamp = time.perf_counter()
+        if not success:
+            self.pool.release(slot)
+            return None
+        self._raw_shape = raw.shape
+        self._frame_id += 1
+        frame = Frame(raw, timestamp, self._frame_id, mirror=True, pool=self.pool, slot=slot)
+        # 翻转图像，使其像照镜子一样自然（在采集线程中完成，不占用处理线程）
+        frame.image
+        frame.flip_time = time.perf_counter() - timestamp
+        return frame
+
+    def set_resolution(self, width, height):
+        """
+        请求修改摄像头采集分辨率，由抓帧的线程在下一次读取前执行（不与 cap.read() 并发）
+
+        Returns:
+            是否支持修改；视频文件的分辨率固定，返回 False
+        """
+        if self.is_file:
+            return False
+        self._pending_resolution = (int(width), int(height))
+        return True
+
+    def _apply_resolution(self):
+        width, height = self._pending_resolution
+        self._pending_resolution = None
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        # 驱动不支持时会选择最接近的分辨率，帧缓冲区按实际尺寸重新分配
+        self._raw_shape = None
+        actual = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        if actual != (width, height):
+            log(f"摄像头不支持 {width}x{height}，实际分辨率 {actual[0]}x{actual[1]}", WARNING)
+
+    def _grab_loop(self):
+        """后台抓帧线程：持续读取，新帧覆盖旧帧"""
+        interval = 0.0
+        if self.is_file and self.realtime:
+            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            interval = 1.0 / fps if fps and fps > 0 else 1.0 / Settings.FPS
+        next_time = time.perf_counter()
+
+        while self._running:
+            frame = self._grab()
+            with self._cond:
+                if frame is None:
+                    self._eof = True
+                    self._cond.notify_all()
+                    break
+                self.captured_frames += 1
+                if len(self._buffer) == self._buffer.maxlen:
+                    # 缓冲区已满，最旧的帧还没被消费就被覆盖
+                    self.dropped_frames += 1
+                    self._buffer.popleft().release()
+                self._buffer.append(frame)
+                self._cond.notify_all()
+
+            if interval:
+                next_time += interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter()
+
+    @property
+    def eof(self):
+        """输入已经结束（视频读完或摄像头读取失败），之后不会再有新帧"""
+        return self._eof
+
+    def read_frame(self, timeout=1.0, owned=False):
+        """
+        读取最新一帧
+
+        Args:
+            timeout: 线程模式下等待新帧的最长时间 (秒)
+            owned: False 时帧在下一次 read() 时自动释放；True 时由调用方在用完后调用 frame.release()
+                   （流水线中帧会在其他线程继续处理，不能随下一次读取释放）
+        Returns:
+            Frame；输入结束或等待超时时返回 None，两者用 eof 区分（超时后可以继续读取）
+        """
+        if self._current is not None:
+            self._current.release()
+            self._current = None
+
+        if not self.threaded:
+            frame = self._grab()
+            if frame is None:
+                self._eof = True
+                return None
+            self.captured_frames += 1
+        else:
+            with self._cond:
+                # 等待比上次读到的更新的帧
+                if not self._cond.wait_for(lambda: self._buffer or self._eof, timeout):
+                    self.timeouts += 1
+                    return None
+                if not self._buffer:
+                    return None
+                frame = self._buffer.pop()
+                # 缓冲区中比最新帧更旧的帧直接丢弃
+                while self._buffer:
+                    self.dropped_frames += 1
+                    self._buffer.popleft().release()
+
+        if time.perf_counter() - frame.timestamp > Settings.STALE_FRAME_AGE:
+            self.stale_frames += 1
+        self.timestamp = frame.timestamp
+        self.flip_time = frame.flip_time
+        if not owned:
+            self._current = frame
+        return frame
 
     def read(self):
-        success, img = self.cap.read()
-        if success:
-            # 翻转图像，使其像照镜子一样自然
-            return True, cv2.flip(img, 1)
+        """读取最新一帧，返回 (success, Frame)"""
+        frame = self.read_frame()
+        if frame is not None:
+            return True, frame
         return False, None
 
+    def get_stats(self):
+        """采集统计信息"""
+        return {
+            "captured": self.captured_frames,
+            "dropped": self.dropped_frames,
+            "stale": self.stale_frames,
+            "timeouts": self.timeouts,
+            "pool_slots": self.pool.size,
+        }
+
     def release(self):
-        self.cap.release()
\ No newline at end of file
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
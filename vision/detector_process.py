@@ -0,0 +1,317 @@
+# vision/detector_process.py
+"""
+多进程手部检测
+
+MediaPipe 推理放到独立的子进程中执行，主进程只负责采集、识别和动作执行，
+两者可以在不同 CPU 核心上并行，不再受 GIL 和串行阶段的限制。
+
+- 画面通过 multiprocessing.shared_memory 环形槽位传递，不对 ndarray 做 pickle
+- 检测结果写回共享内存中的定长记录，队列里只传递槽位编号
+- 子进程异常退出时自动重启（超过次数上限则报错），close() 时优雅退出
+"""
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+from config import Settings
+from .frame import as_frame
+from .landmark_utils import LandmarkList, draw_landmark_array
+
+NUM_LANDMARKS = 21
+
+
+def result_dtype(max_hands):
+    """单帧检测结果的定长记录格式"""
+    return np.dtype([
+        ("num_hands", np.int32),
+        ("handedness", np.int8, (max_hands,)),   # 0-Left, 1-Right, -1-无
+        ("scores", np.float32, (max_hands,)),
+        ("landmarks", np.float32, (max_hands, NUM_LANDMARKS, 3)),
+    ])
+
+
+def _settings_snapshot():
+    """导出可传递给子进程的配置项"""
+    simple = (int, float, str, bool, tuple, type(None))
+    return {k: v for k, v in vars(Settings).items() if k.isupper() and isinstance(v, simple)}
+
+
+def _worker_main(frame_name, result_name, shape, slots, max_hands, settings, requests, responses):
+    """子进程入口：循环读取槽位编号，推理后把结果写回共享内存"""
+    for k, v in settings.items():
+        setattr(Settings, k, v)
+    # 子进程每帧都做真实推理，外推由主进程负责
+    Settings.ADAPTIVE_CADENCE = False
+    from .hand_detector import HandDetector
+    from .landmark_utils import HAND_LABELS, landmarks_to_array
+
+    frame_shm = shared_memory.SharedMemory(name=frame_name)
+    result_shm = shared_memory.SharedMemory(name=result_name)
+    frames = np.ndarray((slots,) + shape, dtype=np.uint8, buffer=frame_shm.buf)
+    records = np.ndarray((slots,), dtype=result_dtype(max_hands), buffer=result_shm.buf)
+    try:
+        detector = HandDetector()
+        while True:
+            idx = requests.get()
+            if idx is None:
+                break
+            detector.find_hands(frames[idx], draw=False)
+            hands = detector.results.multi_hand_landmarks or []
+            handedness = detector.results.multi_handedness or []
+            record = records[idx]
+            n = min(len(hands), max_hands)
+            record["num_hands"] = n
+            record["handedness"] = -1
+            for h in range(n):
+                landmarks_to_array(hands[h], out=record["landmarks"][h])
+                if h < len(handedness):
+                    cls = handedness[h].classification[0]
+                    record["handedness"][h] = HAND_LABELS.index(cls.label) if cls.label in HAND_LABELS else -1
+                    record["scores"][h] = cls.score
+            responses.put(idx)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del frames, records
+        frame_shm.close()
+        result_shm.close()
+
+
+class ProcessHandDetector:
+    """
+    与 HandDetector 接口一致的多进程检测器
+
+    默认为流水线模式：find_hands() 把当前帧放入空闲槽位后立即返回最近一次完成的检测结果，
+    推理与主进程的其他阶段重叠执行（结果比画面晚约一帧）；所有槽位都在推理中时跳过该帧。
+    sync=True 时等待当前帧的结果，只利用多核而不引入额外延迟。
+    """
+    def __init__(self, recorder=None, profiler=None, slots=None, sync=None):
+        self.recorder = recorder
+        self.profiler = profiler
+        self.slots = slots or Settings.DETECTOR_PROCESS_SLOTS
+        self.sync = Settings.DETECTOR_PROCESS_SYNC if sync is None else sync
+        self.max_hands = Settings.MAX_NUM_HANDS
+        self.ctx = mp.get_context("spawn")
+        self.overrides = {}  # reconfigure() 修改的配置项，启动子进程时覆盖 Settings 快照
+        self._pending_overrides = None
+
+        self.shape = None
+        self.process = None
+        self._frame_shm = None
+        self._result_shm = None
+        self._frames = None
+        self._records = None
+        self._requests = None
+        self._responses = None
+        self._in_flight = {}  # 槽位编号 -> 提交时的采集时间戳
+
+        # 最近一次完成的检测结果
+        self.latest = np.zeros((), dtype=result_dtype(self.max_hands))
+        self.latest_timestamp = None
+
+        self.submitted = 0   # 提交推理的帧数
+        self.completed = 0   # 完成推理的帧数
+        self.skipped = 0     # 没有空闲槽位而跳过的帧数
+        self.restarts = 0    # 子进程重启次数
+
+    # ---------- 子进程与共享内存管理 ----------
+    def _open(self, shape):
+        """按画面尺寸创建共享内存并启动子进程"""
+        self.shape = tuple(shape)
+        frame_bytes = int(np.prod(self.shape)) * self.slots
+        record_dtype = result_dtype(self.max_hands)
+        self._frame_shm = shared_memory.SharedMemory(create=True, size=frame_bytes)
+        self._result_shm = shared_memory.SharedMemory(create=True, size=record_dtype.itemsize * self.slots)
+        self._frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self._frame_shm.buf)
+        self._records = np.ndarray((self.slots,), dtype=record_dtype, buffer=self._result_shm.buf)
+        self._start_worker()
+
+    def _start_worker(self):
+        self._requests = self.ctx.Queue()
+        self._responses = self.ctx.Queue()
+        self._in_flight.clear()
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(self._frame_shm.name, self._result_shm.name, self.shape, self.slots,
+                  self.max_hands, {**_settings_snapshot(), **self.overrides}, self._requests, self._responses),
+            name="HandDetectorWorker",
+            daemon=True,
+        )
+        self.process.start()
+
+    def _stop_worker(self, timeout=2.0):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self._requests.put(None)
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        for q in (self._requests, self._responses):
+            q.close()
+            q.cancel_join_thread()
+        self.process = None
+
+    def _restart_worker(self):
+        """子进程异常退出后重启，超过次数上限时抛出异常"""
+        self.restarts += 1
+        if self.restarts > Settings.DETECTOR_PROCESS_MAX_RESTARTS:
+            raise RuntimeError(f"检测子进程异常退出 (exitcode={self.process.exitcode})，已超过重启次数上限")
+        self._stop_worker()
+        self._start_worker()
+
+    def reconfigure(self, model_complexity=None, min_detection_confidence=None, min_tracking_confidence=None):
+        """
+        修改子进程中检测器的模型参数：下一次 find_hands() 时以新配置重启子进程（不计入异常重启次数），
+        推理中的帧被丢弃，此后继续使用最近一次的结果直到新进程完成推理。可从其他线程调用。
+
+        Returns:
+            参数是否有变化
+        """
+        params = {
+            "MODEL_COMPLEXITY": model_complexity,
+            "MIN_DETECTION_CONFIDENCE": min_detection_confidence,
+            "MIN_TRACKING_CONFIDENCE": min_tracking_confidence,
+        }
+        pending = dict(self._pending_overrides or {})
+        changes = {k: v for k, v in params.items()
+                   if v is not None and v != pending.get(k, self.overrides.get(k, getattr(Settings, k)))}
+        if not changes:
+            return False
+        pending.update(changes)
+        self._pending_overrides = pending
+        return True
+
+    def warm_up(self, shape=None):
+        """提前启动子进程并等待一次空白帧推理完成（子进程内加载模型），首帧不再等待模型加载"""
+        shape = tuple(shape or (Settings.CAP_HEIGHT, Settings.CAP_WIDTH, 3))
+        if self.shape != shape:
+            if self.shape is not None:
+                self.close()
+            self._open(shape)
+        elif self.process is None:
+            self._start_worker()
+        idx = next((i for i in range(self.slots) if i not in self._in_flight), None)
+        if idx is None:
+            # 所有槽位都在推理中：模型已在加载/运行，等最早的一帧完成即可，不再提交空白帧
+            self._wait(next(iter(self._in_flight)))
+            return
+        recorder, self.recorder = self.recorder, None
+        self._frames[idx] = 0
+        self._in_flight[idx] = time.perf_counter()
+        self._requests.put(idx)
+        self._wait(idx)
+        # 预热结果不录制、不计入统计
+        self.recorder = recorder
+        self.latest[...] = 0
+        self.latest_timestamp = None
+        self.completed = 0
+
+    def close(self):
+        """通知子进程退出并释放共享内存"""
+        self._stop_worker()
+        self._frames = None
+        self._records = None
+        for shm in (self._frame_shm, self._result_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._frame_shm = None
+        self._result_shm = None
+        self.shape = None
+
+    # ---------- 检测 ----------
+    def _wait(self, idx):
+        """等待 idx 槽位的结果，期间检查子进程是否存活"""
+        while idx in self._in_flight:
+            if not self._collect(timeout=0.05) and not self.process.is_alive():
+                self._restart_worker()
+                break
+
+    def _collect(self, timeout=None):
+        """取回已完成的结果；timeout 为 None 时不等待"""
+        while self._in_flight:
+            try:
+                idx = self._responses.get(timeout=timeout) if timeout else self._responses.get_nowait()
+            except queue.Empty:
+                return False
+            timestamp = self._in_flight.pop(idx)
+            self.latest[...] = self._records[idx]
+            self.latest_timestamp = timestamp
+            self.completed += 1
+            if self.recorder is not None:
+                r = self.latest
+                self.recorder.add_arrays(r["landmarks"], r["handedness"], r["scores"], r["num_hands"], timestamp)
+            if timeout:
+                return True
+        return True
+
+    def find_hands(self, frame, draw=True, timestamp=None):
+        """提交当前帧推理并在 frame.image 上绘制最近一次的检测结果，返回 Frame"""
+        frame = as_frame(frame, timestamp)
+        img = frame.image
+        if timestamp is None:
+            timestamp = frame.timestamp
+        now = time.perf_counter() if timestamp is None else timestamp
+        if self._pending_overrides is not None:
+            changes, self._pending_overrides = self._pending_overrides, None
+            self.overrides.update(changes)
+            if self.process is not None:
+                self._stop_worker()
+                self._start_worker()
+        if self.shape != img.shape:
+            if self.shape is not None:
+                self.close()
+            self._open(img.shape)
+        if self.process is None:
+            # close() / 配置重启失败后没有子进程
+            self._start_worker()
+        elif not self.process.is_alive():
+            self._restart_worker()
+
+        self._collect()
+        free = [i for i in range(self.slots) if i not in self._in_flight]
+        if free:
+            idx = free[0]
+            np.copyto(self._frames[idx], img)
+            self._in_flight[idx] = now
+            self._requests.put(idx)
+            self.submitted += 1
+            if self.sync:
+                self._wait(idx)
+        else:
+            self.skipped += 1
+        if self.profiler is not None:
+            self.profiler.mark("inference")
+
+        if draw:
+            for h in range(int(self.latest["num_hands"])):
+                draw_landmark_array(img, self.latest["landmarks"][h])
+        if self.profiler is not None:
+            self.profiler.mark("draw")
+        return frame
+
+    def get_hands(self):
+        """返回最近一次检测到的所有手：(N, 21, 3) 关键点与 (N,) 左右手编码"""
+        n = int(self.latest["num_hands"])
+        return self.latest["landmarks"][:n].copy(), self.latest["handedness"][:n].copy()
+
+    def get_landmarks(self):
+        """返回最近一次检测到的第一只手 (LandmarkList)，未检测到则返回None"""
+        if self.latest["num_hands"] > 0:
+            return LandmarkList(self.latest["landmarks"][0].copy())
+        return None
+
+    def set_gesture(self, gesture):
+        pass
+
+    def get_stats(self):
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "restarts": self.restarts,
+        }
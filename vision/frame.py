@@ -0,0 +1,134 @@
+# vision/frame.py
+"""
+帧对象与缓冲区池
+
+一帧画面从采集到显示会经过镜像翻转、BGR->RGB、缩放等多次转换，原来每一步都新分配一块数组。
+Frame 携带原始采集数据和采集时间戳，各种颜色空间/尺寸的视图按需计算并缓存，
+计算结果通过 OpenCV 的 dst 参数写入 BufferPool 中按槽位预分配的缓冲区，稳定运行时不再分配内存。
+"""
+import threading
+
+import cv2
+import numpy as np
+
+
+class BufferPool:
+    """
+    按槽位复用的预分配缓冲区池
+
+    每个在用的 Frame 占用一个槽位，槽位下按名称保存各个视图的缓冲区；
+    Frame 释放后槽位回到空闲列表，下一帧直接复用其中的缓冲区。
+    槽位数只会增长到同时在用的最大帧数（采集缓冲区大小 + 正在处理的帧）。
+    """
+    def __init__(self):
+        self._slots = []   # 每个槽位：{名称: ndarray}
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取得一个空闲槽位编号"""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            self._slots.append({})
+            return len(self._slots) - 1
+
+    def release(self, slot):
+        with self._lock:
+            self._free.append(slot)
+
+    def get(self, slot, name, shape, dtype=np.uint8):
+        """返回槽位中指定名称的缓冲区，形状不符时重新分配"""
+        buffers = self._slots[slot]
+        buf = buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            buffers[name] = buf
+        return buf
+
+    @property
+    def size(self):
+        """已分配的槽位数"""
+        return len(self._slots)
+
+
+class Frame:
+    """
+    一帧画面
+
+    - raw: 原始采集数据 (BGR)
+    - image: 镜像后的 BGR 画面，是后续处理与绘制叠加信息的目标
+    - rgb / gray / downscaled(size): 由 image 派生的视图，首次访问时计算并缓存
+
+    派生视图反映首次访问时 image 的内容（例如 rgb 在绘制骨骼之前计算，不包含叠加信息）。
+    """
+    __slots__ = ("raw", "timestamp", "index", "mirror", "flip_time",
+                 "_pool", "_slot", "_image", "_rgb", "_gray", "_scaled")
+
+    def __init__(self, raw, timestamp=None, index=0, mirror=False, pool=None, slot=None):
+        self.raw = raw
+        self.timestamp = timestamp
+        self.index = index
+        self.mirror = mirror
+        self.flip_time = 0.0
+        self._pool = pool
+        self._slot = slot
+        self._image = None if mirror else raw
+        self._rgb = None
+        self._gray = None
+        self._scaled = {}
+
+    def _buffer(self, name, shape):
+        if self._pool is None:
+            return None
+        return self._pool.get(self._slot, name, shape)
+
+    @property
+    def image(self):
+        """镜像后的 BGR 画面"""
+        if self._image is None:
+            self._image = cv2.flip(self.raw, 1, dst=self._buffer("mirrored", self.raw.shape))
+        return self._image
+
+    @property
+    def rgb(self):
+        """RGB 画面（MediaPipe 输入）"""
+        if self._rgb is None:
+            img = self.image
+            self._rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self._buffer("rgb", img.shape))
+        return self._rgb
+
+    @property
+    def gray(self):
+        """灰度画面"""
+        if self._gray is None:
+            img = self.image
+            self._gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=self._buffer("gray", img.shape[:2]))
+        return self._gray
+
+    def downscaled(self, size):
+        """缩放到 size=(w, h) 的 BGR 画面"""
+        view = self._scaled.get(size)
+        if view is None:
+            w, h = size
+            view = cv2.resize(self.image, (w, h), dst=self._buffer(f"scaled_{w}x{h}", (h, w, 3)),
+                              interpolation=cv2.INTER_AREA)
+            self._scaled[size] = view
+        return view
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    def release(self):
+        """归还缓冲区槽位，之后不能再使用该帧的任何视图"""
+        if self._pool is not None and self._slot is not None:
+            self._pool.release(self._slot)
+            self._slot = None
+
+
+def as_frame(img, timestamp=None):
+    """把 ndarray 包装为 Frame（已镜像、无缓冲池）；已是 Frame 时原样返回"""
+    if isinstance(img, Frame):
+        return img
+    return Frame(img, timestamp)
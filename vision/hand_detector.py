@@ -1,54 +1,342 @@
-import mediapipe as mp
-print(mp.__file__)
+import time
+
 import cv2
+import numpy as np
 from config import Settings
+from gesture.gesture_base import GestureType
+from .frame import as_frame
+from .landmark_utils import HAND_LABELS, LandmarkList, draw_landmark_array, landmarks_to_array
 
 class HandDetector:
     """
     手部检测器类，使用MediaPipe进行手部关键点检测和跟踪
     """
-    def __init__(self):
+    def __init__(self, recorder=None, profiler=None):
         """
         初始化手部检测器
+
+        Args:
+            recorder: 可选的 LandmarkRecorder，设置后每帧检测结果都会被录制
+            profiler: 可选的 LatencyProfiler，记录颜色转换/推理/绘制各阶段耗时
         """
+        # MediaPipe 导入耗时较长，延迟到构造检测器时（可在后台线程中进行）
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
+        # 模型参数，可由 reconfigure() 在运行时修改
+        self.model_complexity = Settings.MODEL_COMPLEXITY
+        self.min_detection_confidence = Settings.MIN_DETECTION_CONFIDENCE
+        self.min_tracking_confidence = Settings.MIN_TRACKING_CONFIDENCE
+        self._pending_params = None  # reconfigure() 请求、尚未生效的参数
+        self.hands = self._create_hands()
+        self.mp_draw = mp.solutions.drawing_utils
+        self.recorder = recorder
+        self.profiler = profiler
+
+        # ROI 跟踪模式：用上一帧的手部包围盒裁剪出扩展区域，缩放到固定尺寸后推理
+        self.roi_tracking = Settings.ROI_TRACKING
+        self.roi_size = Settings.ROI_INPUT_SIZE
+        self.roi = None  # 当前跟踪区域 (x0, y0, side)，像素坐标，None 表示需要全图检测
+        self._frame_shape = None  # 上一帧的图像尺寸，变化时 ROI 与运动状态失效
+        # ROI 输入尺寸固定，单独使用一个实例，避免与全图实例的跟踪状态互相干扰
+        self.roi_hands = self._create_hands() if self.roi_tracking else None
+        self.roi_frames = 0   # 在 ROI 上完成检测的帧数
+        self.full_frames = 0  # 全图检测的帧数
+        self.roi_lost = 0     # ROI 中丢失手部、回退到全图检测的次数
+        # ROI 裁剪/颜色转换的预分配缓冲区
+        self._roi_crop = np.empty((self.roi_size, self.roi_size, 3), dtype=np.uint8)
+        self._roi_rgb = np.empty((self.roi_size, self.roi_size, 3), dtype=np.uint8)
+
+        # 自适应检测频率：手部静止时每 N 帧才推理一次，中间帧用匀速运动模型外推关键点
+        self.adaptive_cadence = Settings.ADAPTIVE_CADENCE
+        self.interval = 1         # 当前推理间隔 N
+        self.predicted = None     # 当前帧第一只手的外推结果 (LandmarkList)，推理帧为 None
+        self.predicted_hands = None  # 当前帧所有手的外推结果 (N, 21, 3)
+        self.gesture = None       # 上一帧识别出的手势，由 set_gesture() 提供
+        self._skip = 0            # 距下一次推理还可跳过的帧数
+        self._last = None         # 最近一次推理得到的 (N, 21, 3) 关键点
+        self._last_time = None
+        self._last_handedness = None
+        self._velocity = None     # 关键点速度 (归一化坐标/秒)
+        self.inferred_frames = 0  # 实际推理的帧数
+        self.predicted_frames = 0 # 外推的帧数
+
+        # 当前帧所有手的关键点 (N, 21, 3) 与左右手编码 (N,)，每个推理帧从 MediaPipe 结果转换一次
+        self.landmark_array = np.empty((0, 21, 3), dtype=np.float32)
+        self.handedness_array = np.empty(0, dtype=np.int8)
+
+    def _create_hands(self):
+        return self.mp_hands.Hands(
             max_num_hands=Settings.MAX_NUM_HANDS,
-            min_detection_confidence=Settings.MIN_DETECTION_CONFIDENCE,
-            min_tracking_confidence=Settings.MIN_TRACKING_CONFIDENCE
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
         )
-        self.mp_draw = mp.solutions.drawing_utils
 
-    def find_hands(self, img, draw=True):
+    def reconfigure(self, model_complexity=None, min_detection_confidence=None, min_tracking_confidence=None):
+        """
+        修改模型参数，在下一次 find_hands() 开始时重建 MediaPipe 图（可从其他线程调用，不与推理并发）
+
+        重建后 MediaPipe 的跟踪状态、ROI 与运动模型都从头开始，下一帧做一次全图检测。
+
+        Returns:
+            参数是否有变化
+        """
+        params = {
+            "model_complexity": model_complexity,
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence,
+        }
+        pending = dict(self._pending_params or {})
+        changes = {k: v for k, v in params.items() if v is not None and v != pending.get(k, getattr(self, k))}
+        if not changes:
+            return False
+        pending.update(changes)
+        self._pending_params = pending
+        return True
+
+    def _apply_params(self):
+        params, self._pending_params = self._pending_params, None
+        for k, v in params.items():
+            setattr(self, k, v)
+        self.close()
+        self.hands = self._create_hands()
+        if self.roi_tracking:
+            self.roi_hands = self._create_hands()
+        self.roi = None
+        self._last = None
+        self._velocity = None
+        self._skip = 0
+        self.interval = 1
+
+    def find_hands(self, frame, draw=True, timestamp=None):
         """
         在图像中检测手部并绘制关键点
         
         Args:
-            img: 输入图像
+            frame: 输入帧 (Frame)，也接受已镜像的BGR图像
             draw: 是否在图像上绘制手部关键点连接线，默认为True
+            timestamp: 该帧的采集时间戳，供录制与运动模型使用，默认取 frame.timestamp
             
         Returns:
-            处理后的图像
+            输入帧 (Frame)，关键点绘制在 frame.image 上
         """
-        # 将BGR图像转换为RGB格式,以适应MediaPipe处理要求
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        # 运行MediaPipe手部检测模型
-        self.results = self.hands.process(img_rgb)
+        if self._pending_params is not None:
+            self._apply_params()
+        frame = as_frame(frame, timestamp)
+        img = frame.image
+        if img.shape != self._frame_shape:
+            # 分辨率变化（如画质档位只改了采集尺寸）：像素坐标的 ROI 与外推状态不再有效
+            self._frame_shape = img.shape
+            self.roi = None
+            self._last = None
+            self._velocity = None
+            self._skip = 0
+        if timestamp is None:
+            timestamp = frame.timestamp
+        now = time.perf_counter() if timestamp is None else timestamp
+        self.predicted = None
+        self.predicted_hands = None
+        if self.adaptive_cadence and self._skip > 0 and self._last is not None \
+                and self.gesture != GestureType.DRAGGING:
+            # 跳过推理，用运动模型外推关键点
+            self._skip -= 1
+            self.predicted_hands = self._last + self._velocity * (now - self._last_time)
+            self.predicted = LandmarkList(self.predicted_hands[0])
+            self.predicted_frames += 1
+            if self.profiler is not None:
+                self.profiler.mark("inference")
+            if draw:
+                for arr in self.predicted_hands:
+                    draw_landmark_array(img, arr)
+            if self.profiler is not None:
+                self.profiler.mark("draw")
+            return frame
+
+        self.results = None
+        if self.roi_tracking and self.roi is not None:
+            self.results = self._process_roi(img)
+            if self.results is None:
+                self.roi_lost += 1
+
+        if self.results is None:
+            # 将BGR图像转换为RGB格式,以适应MediaPipe处理要求（结果缓存在帧的缓冲区中）
+            img_rgb = frame.rgb
+            if self.profiler is not None:
+                self.profiler.mark("to_rgb")
+            # 运行MediaPipe手部检测模型
+            self.results = self.hands.process(img_rgb)
+            self.full_frames += 1
+
+        self.inferred_frames += 1
+        self._extract_hands()
+        if self.roi_tracking:
+            self.roi = self._compute_roi(img.shape[1], img.shape[0])
+        if self.adaptive_cadence:
+            self._update_motion(now)
+        if self.recorder is not None:
+            self.recorder.add(self.results, timestamp)
+        if self.profiler is not None:
+            self.profiler.mark("inference")
         
         # 如果检测到手部关键点且需要绘制，则在图像上绘制连接线
         if self.results.multi_hand_landmarks and draw:
             for hand_lms in self.results.multi_hand_landmarks:
                 self.mp_draw.draw_landmarks(img, hand_lms, self.mp_hands.HAND_CONNECTIONS)
+        if self.profiler is not None:
+            self.profiler.mark("draw")
         
-        return img
+        return frame
+
+    def _process_roi(self, img):
+        """
+        在跟踪区域上推理，并把关键点映射回全图归一化坐标
+
+        Returns:
+            检测到手部时返回 MediaPipe 结果，否则返回 None
+        """
+        h, w = img.shape[:2]
+        x0, y0, side = self.roi
+        # 只裁剪并转换 ROI 区域，全图不做颜色转换
+        cv2.resize(img[y0:y0 + side, x0:x0 + side], (self.roi_size, self.roi_size),
+                   dst=self._roi_crop, interpolation=cv2.INTER_AREA)
+        crop_rgb = cv2.cvtColor(self._roi_crop, cv2.COLOR_BGR2RGB, dst=self._roi_rgb)
+        if self.profiler is not None:
+            self.profiler.mark("to_rgb")
+        results = self.roi_hands.process(crop_rgb)
+        if not results.multi_hand_landmarks:
+            return None
+
+        # 裁剪区域坐标 -> 全图归一化坐标（z 与 x 同尺度）
+        sx, sy = side / w, side / h
+        ox, oy = x0 / w, y0 / h
+        for hand_lms in results.multi_hand_landmarks:
+            for p in hand_lms.landmark:
+                p.x = ox + p.x * sx
+                p.y = oy + p.y * sy
+                p.z = p.z * sx
+        self.roi_frames += 1
+        return results
+
+    def _compute_roi(self, width, height):
+        """根据当前检测结果计算下一帧的跟踪区域（正方形，限制在画面内），未检测到手时返回 None"""
+        if not self.results.multi_hand_landmarks:
+            return None
+        xs = [p.x for hand_lms in self.results.multi_hand_landmarks for p in hand_lms.landmark]
+        ys = [p.y for hand_lms in self.results.multi_hand_landmarks for p in hand_lms.landmark]
+        x_min, x_max = min(xs) * width, max(xs) * width
+        y_min, y_max = min(ys) * height, max(ys) * height
+
+        side = max(x_max - x_min, y_max - y_min) * Settings.ROI_EXPAND
+        side = int(min(max(side, Settings.ROI_MIN_SIZE), width, height))
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x0 = int(min(max(cx - side / 2, 0), width - side))
+        y0 = int(min(max(cy - side / 2, 0), height - side))
+        return x0, y0, side
+
+    def _extract_hands(self):
+        """把 MediaPipe 结果转换为 (N, 21, 3) 关键点与 (N,) 左右手编码数组"""
+        hands = self.results.multi_hand_landmarks or []
+        handedness = self.results.multi_handedness or []
+        landmarks = np.empty((len(hands), 21, 3), dtype=np.float32)
+        labels = np.full(len(hands), -1, dtype=np.int8)
+        for h, hand_lms in enumerate(hands):
+            landmarks_to_array(hand_lms, out=landmarks[h])
+            if h < len(handedness):
+                label = handedness[h].classification[0].label
+                labels[h] = HAND_LABELS.index(label) if label in HAND_LABELS else -1
+        self.landmark_array = landmarks
+        self.handedness_array = labels
+
+    def _update_motion(self, now):
+        """用最新推理结果更新运动模型，并根据关键点速度选择下一段的推理间隔"""
+        if not len(self.landmark_array):
+            self._last = None
+            self._velocity = None
+            self._skip = 0
+            self.interval = 1
+            return
+
+        current = self.landmark_array
+        # 手数与左右手都没有变化时才认为是同一组手，否则速度置零
+        same_hands = self._last is not None and self._last.shape == current.shape \
+            and np.array_equal(self._last_handedness, self.handedness_array)
+        if same_hands and now > self._last_time:
+            self._velocity = (current - self._last) / (now - self._last_time)
+        else:
+            self._velocity = np.zeros_like(current)
+        self._last = current
+        self._last_handedness = self.handedness_array
+        self._last_time = now
+
+        # 取所有手、所有关键点中最大的平面速度
+        speed = float(np.sqrt((self._velocity[..., :2] ** 2).sum(axis=-1)).max())
+        still, fast = Settings.CADENCE_STILL_SPEED, Settings.CADENCE_FAST_SPEED
+        max_interval = Settings.CADENCE_MAX_INTERVAL
+        if speed >= fast or self.gesture == GestureType.DRAGGING:
+            self.interval = 1
+        elif speed <= still:
+            self.interval = max_interval
+        else:
+            self.interval = 1 + int((max_interval - 1) * (fast - speed) / (fast - still))
+        self._skip = self.interval - 1
+
+    def set_gesture(self, gesture):
+        """告知检测器当前手势；拖拽时立即恢复逐帧推理"""
+        self.gesture = gesture
+        if gesture == GestureType.DRAGGING:
+            self._skip = 0
+
+    def get_stats(self):
+        """检测统计信息"""
+        total = self.inferred_frames + self.predicted_frames
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "roi_lost": self.roi_lost,
+            "inferred_frames": self.inferred_frames,
+            "predicted_frames": self.predicted_frames,
+            "skip_ratio": round(self.predicted_frames / total, 3) if total else 0.0,
+        }
+
+    def warm_up(self, shape=None):
+        """
+        用空白帧做一次推理，完成模型的首次初始化，避免第一帧真实画面承担这部分耗时
+
+        空白帧中没有手，不会留下跟踪状态；统计计数不受影响
+        """
+        shape = shape or (Settings.CAP_HEIGHT, Settings.CAP_WIDTH, 3)
+        blank = np.zeros(shape, dtype=np.uint8)
+        self.hands.process(blank)
+        if self.roi_hands is not None:
+            self.roi_hands.process(np.zeros_like(self._roi_rgb))
+
+    def close(self):
+        """释放 MediaPipe 资源"""
+        self.hands.close()
+        if self.roi_hands is not None:
+            self.roi_hands.close()
+
+    def get_hands(self):
+        """
+        获取当前帧检测到的所有手
+
+        Returns:
+            landmarks: (N, 21, 3) 关键点数组（外推帧为外推结果）
+            handedness: (N,) 左右手编码，0-Left, 1-Right, -1-未知
+        """
+        if self.predicted_hands is not None:
+            return self.predicted_hands, self._last_handedness
+        return self.landmark_array, self.handedness_array
 
     def get_landmarks(self):
         """
         获取检测到的第一只手的关键点数据
         
         Returns:
-            第一只手的关键点数据，如果未检测到则返回None
+            第一只手的关键点数据（外推帧为 LandmarkList），如果未检测到则返回None
         """
+        if self.predicted is not None:
+            return self.predicted
         if self.results.multi_hand_landmarks:
             return self.results.multi_hand_landmarks[0] # 只返回第一只手
         return None
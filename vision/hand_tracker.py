@@ -0,0 +1,101 @@
+# vision/hand_tracker.py
+"""
+多手跟踪
+
+MediaPipe 每帧返回的手没有固定顺序，这里按左右手标签与手掌中心位置把当前检测结果
+关联到上一帧的轨迹，为每只手维持一个稳定的编号，供上层保存各自的识别/动作状态。
+"""
+import numpy as np
+from config import Settings
+from .landmark_utils import HAND_LABELS
+
+PALM_ID = 9  # 手掌中心（中指根部）
+
+
+class TrackedHand:
+    """一只被跟踪的手"""
+    __slots__ = ("hand_id", "handedness", "landmarks", "center", "age", "misses")
+
+    def __init__(self, hand_id, handedness, landmarks):
+        self.hand_id = hand_id
+        self.handedness = handedness  # 0-Left, 1-Right, -1-未知
+        self.landmarks = landmarks    # 最近一次检测到的 (21, 3) 关键点
+        self.center = landmarks[PALM_ID, :2].copy()
+        self.age = 1                  # 被检测到的帧数
+        self.misses = 0               # 连续未检测到的帧数
+
+    @property
+    def label(self):
+        return HAND_LABELS[self.handedness] if self.handedness >= 0 else "Unknown"
+
+    def __repr__(self):
+        return f"TrackedHand(id={self.hand_id}, {self.label}, age={self.age}, misses={self.misses})"
+
+
+class HandTracker:
+    def __init__(self, max_distance=None, label_penalty=None, max_misses=None):
+        self.max_distance = Settings.HAND_TRACK_MAX_DISTANCE if max_distance is None else max_distance
+        self.label_penalty = Settings.HAND_TRACK_LABEL_PENALTY if label_penalty is None else label_penalty
+        self.max_misses = Settings.HAND_TRACK_MAX_MISSES if max_misses is None else max_misses
+        self.tracks = []     # 按创建顺序排列的 TrackedHand
+        self._next_id = 0
+
+    def update(self, landmarks, handedness):
+        """
+        用当前帧的检测结果更新轨迹
+
+        Args:
+            landmarks: (N, 21, 3) 关键点数组
+            handedness: (N,) 左右手编码
+        Returns:
+            visible: 与 landmarks 顺序一致的 TrackedHand 列表
+            removed: 本帧因长时间丢失而删除的 TrackedHand 列表
+        """
+        n = len(landmarks)
+        visible = [None] * n
+        matched = set()
+        if n and self.tracks:
+            # 代价矩阵 (轨迹 x 检测)：手掌中心距离 + 左右手标签不一致的惩罚
+            centers = landmarks[:, PALM_ID, :2]
+            previous = np.array([t.center for t in self.tracks])
+            cost = np.linalg.norm(previous[:, None, :] - centers[None, :, :], axis=2)
+            labels = np.array([t.handedness for t in self.tracks])
+            known = (labels[:, None] >= 0) & (handedness[None, :] >= 0)
+            cost += self.label_penalty * (known & (labels[:, None] != handedness[None, :]))
+            # 手数很少，按代价从小到大贪心匹配即可
+            for flat in np.argsort(cost, axis=None):
+                t, d = divmod(int(flat), n)
+                if cost[t, d] > self.max_distance:
+                    break
+                if t in matched or visible[d] is not None:
+                    continue
+                track = self.tracks[t]
+                track.landmarks = landmarks[d]
+                track.center[:] = landmarks[d, PALM_ID, :2]
+                track.handedness = int(handedness[d])
+                track.age += 1
+                track.misses = 0
+                visible[d] = track
+                matched.add(t)
+
+        removed = []
+        kept = []
+        for t, track in enumerate(self.tracks):
+            if t not in matched:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    removed.append(track)
+                    continue
+            kept.append(track)
+        for d in range(n):
+            if visible[d] is None:
+                track = TrackedHand(self._next_id, int(handedness[d]), landmarks[d])
+                self._next_id += 1
+                kept.append(track)
+                visible[d] = track
+        self.tracks = kept
+        return visible, removed
+
+    def reset(self):
+        removed, self.tracks = self.tracks, []
+        return removed
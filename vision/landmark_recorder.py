@@ -0,0 +1,220 @@
+# vision/landmark_recorder.py
+"""
+关键点录制与高速回放
+
+录制格式为一个目录，内含若干列式 .npy 文件（均可 np.load(..., mmap_mode='r') 内存映射）：
+    landmarks.npy   (frames, hands, 21, 3) float32  归一化关键点坐标，无手处为 NaN
+    handedness.npy  (frames, hands)        int8     0-Left, 1-Right, -1-无
+    scores.npy      (frames, hands)        float32  handedness 置信度
+    timestamps.npy  (frames,)              float64  采集时间戳 (秒)
+    num_hands.npy   (frames,)              uint8    该帧检测到的手数
+"""
+import os
+import time
+
+import numpy as np
+from config import Settings
+from .frame import as_frame
+from .landmark_utils import HAND_LABELS, LandmarkList, draw_landmark_array, landmarks_to_array
+
+NUM_LANDMARKS = 21
+FIELDS = ("landmarks", "handedness", "scores", "timestamps", "num_hands")
+
+
+class LandmarkRecorder:
+    """
+    关键点录制器，挂接在 HandDetector 上，每帧记录 MediaPipe 的检测结果
+
+    数据先写入一个预分配的内存块（chunk），块写满时追加到各 .npy 文件并复用该块，
+    内存占用与录制时长无关；save() 写出最后不满的一块，并在文件头中原地填入最终帧数
+    （NumPy 写出的 .npy 文件头为首轴长度预留了空间）。save() 之后录制结束
+    """
+    def __init__(self, path, max_hands=None, chunk_size=4096):
+        self.path = path
+        self.max_hands = max_hands or Settings.MAX_NUM_HANDS
+        self.chunk_size = chunk_size
+        self.frame_count = 0
+        h = self.max_hands
+        # 字段名 -> (dtype, 每帧的形状, 无数据时的填充值)
+        self._layout = {
+            "landmarks": (np.float32, (h, NUM_LANDMARKS, 3), np.nan),
+            "handedness": (np.int8, (h,), -1),
+            "scores": (np.float32, (h,), 0),
+            "timestamps": (np.float64, (), 0),
+            "num_hands": (np.uint8, (), 0),
+        }
+        self._chunk = {field: np.empty((chunk_size,) + shape, dtype=dtype)
+                       for field, (dtype, shape, _) in self._layout.items()}
+        self._files = None      # 字段名 -> 打开的 .npy 文件，首帧时创建
+        self._data_offset = {}  # 字段名 -> 文件头长度
+        self._pos = chunk_size  # 当前块写入位置，初始视为已满，首帧时清空
+        self._saved = False
+
+    def _write_header(self, field, frames):
+        dtype, shape, _ = self._layout[field]
+        header = {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False,
+                  "shape": (frames,) + shape}
+        np.lib.format.write_array_header_1_0(self._files[field], header)
+
+    def _open_files(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._files = {}
+        for field in FIELDS:
+            self._files[field] = open(os.path.join(self.path, f"{field}.npy"), "wb")
+            self._write_header(field, 0)
+            self._data_offset[field] = self._files[field].tell()
+
+    def _flush_chunk(self, count):
+        """把当前块的前 count 行追加到各文件"""
+        for field in FIELDS:
+            self._files[field].write(self._chunk[field][:count].tobytes())
+
+    def _new_chunk(self):
+        for field, (_, _, fill) in self._layout.items():
+            self._chunk[field].fill(fill)
+        self._pos = 0
+        return self._chunk
+
+    def add(self, results, timestamp=None):
+        """
+        记录一帧 MediaPipe 结果
+
+        Args:
+            results: hands.process() 的返回值
+            timestamp: 采集时间戳，默认取当前 time.perf_counter()
+        """
+        chunk, i = self._next_row(timestamp)
+
+        hands = results.multi_hand_landmarks or []
+        handedness = results.multi_handedness or []
+        n = min(len(hands), self.max_hands)
+        for h in range(n):
+            landmarks_to_array(hands[h], out=chunk["landmarks"][i, h])
+            if h < len(handedness):
+                cls = handedness[h].classification[0]
+                chunk["handedness"][i, h] = HAND_LABELS.index(cls.label) if cls.label in HAND_LABELS else -1
+                chunk["scores"][i, h] = cls.score
+        chunk["num_hands"][i] = n
+
+    def add_arrays(self, landmarks, handedness, scores, num_hands, timestamp=None):
+        """
+        记录一帧已经是数组形式的结果（如检测子进程返回的记录）
+
+        Args:
+            landmarks: (hands, 21, 3)
+            handedness: (hands,) 0-Left, 1-Right, -1-无
+            scores: (hands,)
+            num_hands: 检测到的手数
+        """
+        chunk, i = self._next_row(timestamp)
+        n = min(int(num_hands), self.max_hands)
+        chunk["landmarks"][i, :n] = landmarks[:n]
+        chunk["handedness"][i, :n] = handedness[:n]
+        chunk["scores"][i, :n] = scores[:n]
+        chunk["num_hands"][i] = n
+
+    def _next_row(self, timestamp):
+        """分配下一帧的写入位置，返回 (chunk, 行号)；上一块已满时先把它写入文件"""
+        if self._saved:
+            raise RuntimeError("录制已经保存，不能继续添加帧")
+        if self._pos < self.chunk_size:
+            chunk = self._chunk
+        else:
+            if self._files is None:
+                self._open_files()
+            else:
+                self._flush_chunk(self.chunk_size)
+            chunk = self._new_chunk()
+        i = self._pos
+        chunk["timestamps"][i] = time.perf_counter() if timestamp is None else timestamp
+        self._pos += 1
+        self.frame_count += 1
+        return chunk, i
+
+    def save(self):
+        """写出剩余数据并在文件头中填入帧数，返回目录路径"""
+        if self._saved:
+            return self.path
+        if self._files is None:
+            self._open_files()
+        else:
+            self._flush_chunk(self._pos)
+        self._saved = True
+        try:
+            for field, f in self._files.items():
+                f.seek(0)
+                self._write_header(field, self.frame_count)
+                if f.tell() != self._data_offset[field]:
+                    raise RuntimeError(f"{field}.npy 的文件头长度改变，无法原地填入帧数 {self.frame_count}")
+        finally:
+            for f in self._files.values():
+                f.close()
+        return self.path
+
+
+class LandmarkReplay:
+    """
+    录制数据回放源，不依赖摄像头和 MediaPipe，可不限速地向 GestureRecognizer / ActionMapper 喂数据
+    """
+    def __init__(self, path, mmap=True):
+        mode = "r" if mmap else None
+        for field in FIELDS:
+            setattr(self, field, np.load(os.path.join(path, f"{field}.npy"), mmap_mode=mode))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frame(self, index, hand=0):
+        """返回第 index 帧第 hand 只手的 LandmarkList，无手时返回 None"""
+        if hand >= self.num_hands[index]:
+            return None
+        return LandmarkList(self.landmarks[index, hand])
+
+    def __iter__(self):
+        """逐帧迭代，产出 (timestamp, LandmarkList 或 None)"""
+        for i in range(len(self)):
+            yield float(self.timestamps[i]), self.frame(i)
+
+
+class ReplayHandDetector:
+    """
+    与 HandDetector 接口一致的回放检测器，可直接替换到主循环中
+
+    find_hands() 每调用一次前进一帧，回放结束后 finished 置为 True
+    """
+    def __init__(self, path, mmap=True):
+        self.replay = LandmarkReplay(path, mmap=mmap)
+        self.index = -1
+        self.timestamp = None
+        self.finished = len(self.replay) == 0
+
+    def find_hands(self, frame=None, draw=True, timestamp=None):
+        self.index += 1
+        if self.index >= len(self.replay) - 1:
+            self.finished = True
+        if self.index < len(self.replay):
+            self.timestamp = float(self.replay.timestamps[self.index])
+            lm_list = self.get_landmarks()
+            if draw and frame is not None and lm_list is not None:
+                draw_landmark_array(as_frame(frame).image, lm_list.array)
+        return frame
+
+    def get_hands(self):
+        if self.index < 0 or self.index >= len(self.replay):
+            return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), np.empty(0, dtype=np.int8)
+        n = int(self.replay.num_hands[self.index])
+        return np.array(self.replay.landmarks[self.index, :n]), np.array(self.replay.handedness[self.index, :n])
+
+    def get_landmarks(self):
+        if self.index < 0 or self.index >= len(self.replay):
+            return None
+        return self.replay.frame(self.index)
+
+    def set_gesture(self, gesture):
+        pass
+
+    def close(self):
+        pass
+
+    def get_stats(self):
+        return {"replayed_frames": min(self.index + 1, len(self.replay)), "total_frames": len(self.replay)}
@@ -1,4 +1,5 @@
 import math
+import cv2
 import numpy as np
 
 def calculate_distance(p1, p2):
@@ -7,4 +8,71 @@ def calculate_distance(p1, p2):
 
 def get_coords(landmark, width, height):
     """将归一化坐标转换为像素坐标"""
-    return int(landmark.x * width), int(landmark.y * height)
\ No newline at end of file
+    return int(landmark.x * width), int(landmark.y * height)
+
+HAND_LABELS = ("Left", "Right")  # handedness 编码：0-Left, 1-Right, -1-未知
+
+# 21 点手部骨骼连线（与 mp.solutions.hands.HAND_CONNECTIONS 一致）
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+class Landmark:
+    """轻量关键点，接口与 MediaPipe NormalizedLandmark 一致（.x/.y/.z）"""
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __repr__(self):
+        return f"Landmark(x={self.x:.4f}, y={self.y:.4f}, z={self.z:.4f})"
+
+
+class LandmarkList:
+    """
+    基于 (21, 3) 数组的关键点列表，接口与 MediaPipe NormalizedLandmarkList 一致（.landmark[i].x）
+    用于回放、预测等不经过 MediaPipe 的数据源
+    """
+    __slots__ = ("array", "_landmark")
+
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=np.float32)
+        self._landmark = None
+
+    @property
+    def landmark(self):
+        # 按需构造 Landmark 对象，只访问 .array 时没有额外开销
+        if self._landmark is None:
+            self._landmark = [Landmark(x, y, z) for x, y, z in self.array.tolist()]
+        return self._landmark
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """将 MediaPipe NormalizedLandmarkList（或其 .landmark 序列）转换为 (21, 3) float32 数组"""
+    if isinstance(hand_landmarks, LandmarkList):
+        return hand_landmarks.array
+    if isinstance(hand_landmarks, np.ndarray):
+        return hand_landmarks.astype(np.float32, copy=False)
+    points = getattr(hand_landmarks, "landmark", hand_landmarks)
+    coords = [(p.x, p.y, p.z) for p in points]
+    if out is None:
+        return np.array(coords, dtype=np.float32)
+    out[:len(coords)] = coords
+    return out
+
+
+def draw_landmark_array(img, arr):
+    """在图像上绘制 (21, 3) 关键点数组的骨骼连线（不依赖 MediaPipe 绘制工具）"""
+    h, w = img.shape[:2]
+    points = [(int(x * w), int(y * h)) for x, y in arr[:, :2].tolist()]
+    for a, b in HAND_CONNECTIONS:
+        cv2.line(img, points[a], points[b], (224, 224, 224), 2)
+    for p in points:
+        cv2.circle(img, p, 3, (0, 0, 255), cv2.FILLED)